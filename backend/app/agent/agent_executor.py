@@ -1,8 +1,19 @@
 
 from app.agent.llm_client import llm
 from app.agent.langchain_tools import LANGCHAIN_TOOLS
+from app.agent.conversation import conversation_store, resolve_follow_up
+from app.agent.result_summarizer import summarize_tool_result
 from langchain_core.messages import HumanMessage, ToolMessage, SystemMessage
+from app.core.orchestrator import orchestrator
+from app.core.session_manager import session_manager
+from app.core.metrics import metrics, span, record_llm_usage, record_payload
+from app.core.profiler import profile_store
+from app.config import settings
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 import json
+import threading
+import uuid
 
 
 # Bind tools to the LLM
@@ -29,21 +40,130 @@ After you receive tool results, use them to answer the user directly.
 Do not keep calling tools again and again for the same query."""
 
 
-def run_agent(query: str, session_id: str = "titanic_default"):
+def _answer_follow_up(query: str, session_id: str, conversation):
+    """Answer a short edit of the previous question locally; None if it needs the LLM."""
+    resolver = session_manager.get_dataset_manager(session_id).get_column_resolver()
+    intent = resolve_follow_up(query, conversation.last_intent, resolver)
+    if intent is None:
+        return None
+
+    try:
+        with span("agent.follow_up"):
+            result = orchestrator.execute(session_id, intent)
+    except Exception:
+        # Whatever the local guess could not run, the full agent gets to try
+        return None
+
+    metrics.inc("followups_total", resolved="local")
+    conversation_store.record_turn(conversation, query, intent, result["text_response"])
+    payload = json.dumps({
+        "text_response": result["text_response"],
+        "chart": result["chart"],
+        "data": result["data"],
+        "intent": intent,
+    }, default=str)
+    return {
+        "response": result["text_response"],
+        "tool_result": payload,
+        "resolved_locally": True,
+    }
+
+
+def _tool_intent(tool_result):
+    try:
+        parsed = json.loads(tool_result) if isinstance(tool_result, str) else tool_result
+        return parsed.get("intent") if isinstance(parsed, dict) else None
+    except Exception:
+        return None
+
+
+def _run_tool_call(tool_call, session_id: str):
+    """Execute one tool call; returns (raw tool result, ToolMessage content)."""
+    # Find the tool by name
+    tool_name = tool_call["name"]
+    tool_args = tool_call["args"]
+
+    # Always enforce the current session_id on tool calls that accept it.
+    # This ensures that analysis uses the dataset selected in the frontend,
+    # rather than leaving session selection up to the LLM.
+    if isinstance(tool_args, dict):
+        tool_args["session_id"] = session_id
+
+    tool_result = None
+    for tool in LANGCHAIN_TOOLS:
+        if tool.name == tool_name:
+            # On a tool thread, extend a profiled request's profile to it
+            with profile_store.profile_thread(), span("agent.tool"):
+                tool_result = tool.invoke(tool_args)
+            break
+
+    # Fixed-size digest instead of the full chart/data JSON (to avoid huge token usage)
+    return tool_result, summarize_tool_result(tool_result)
+
+
+_tool_executor = None
+_tool_executor_lock = threading.Lock()
+
+
+def _get_tool_executor() -> ThreadPoolExecutor:
+    global _tool_executor
+    with _tool_executor_lock:
+        if _tool_executor is None:
+            _tool_executor = ThreadPoolExecutor(
+                max_workers=settings.AGENT_TOOL_PARALLELISM,
+                thread_name_prefix="agent-tool",
+            )
+        return _tool_executor
+
+
+def _run_tool_calls(tool_calls, session_id: str):
+    """Run a turn's tool calls, concurrently when there are several; results keep call order."""
+    if len(tool_calls) == 1 or settings.AGENT_TOOL_PARALLELISM <= 1:
+        return [_run_tool_call(tool_call, session_id) for tool_call in tool_calls]
+
+    # Worker threads don't inherit context variables, so each call runs in a
+    # copy of ours to keep its spans in this request's timing breakdown
+    executor = _get_tool_executor()
+    futures = [
+        executor.submit(contextvars.copy_context().run, _run_tool_call, tool_call, session_id)
+        for tool_call in tool_calls
+    ]
+    return [future.result() for future in futures]
+
+
+def run_agent(query: str, session_id: str = "titanic_default", conversation_id: str = None):
     """
     Executes the LangChain tool-enabled LLM with tool calling.
 
     The model decides whether to call tools and this function
     handles the tool invocation and returns the final response.
     A safety limit on tool-calling iterations prevents infinite loops.
+
+    Turns are remembered per conversation_id. A request without one starts a
+    new conversation; its id is returned so the client can continue it.
+    Simple edits of the previous question are answered without the LLM, and
+    otherwise recent turns are replayed within CONVERSATION_TOKEN_BUDGET.
     """
 
-    # Initial LLM invocation with system prompt
+    # Never fall back to the session id: clients sharing a dataset would share memory
+    conversation_id = conversation_id or uuid.uuid4().hex
+    conversation = conversation_store.get(conversation_id, session_id)
+
+    local = _answer_follow_up(query, session_id, conversation)
+    if local is not None:
+        return {**local, "conversation_id": conversation_id}
+    if conversation.turns:
+        metrics.inc("followups_total", resolved="llm")
+
+    # Initial LLM invocation with system prompt and trimmed history
     messages = [
         SystemMessage(content=SYSTEM_PROMPT),
+        *conversation_store.history_messages(conversation),
         HumanMessage(content=query),
     ]
-    response = tool_enabled_llm.invoke(messages)
+    with span("agent.llm_initial"):
+        response = tool_enabled_llm.invoke(messages)
+    record_llm_usage("agent", response)
     messages.append(response)
 
     tool_result_data = None
@@ -57,56 +177,15 @@ def run_agent(query: str, session_id: str = "titanic_default"):
         iteration += 1
         tool_calls = response.tool_calls
 
-        for tool_call in tool_calls:
-            # Find the tool by name
-            tool_name = tool_call["name"]
-            tool_args = tool_call["args"]
-
-            # Always enforce the current session_id on tool calls that accept it.
-            # This ensures that analysis uses the dataset selected in the frontend,
-            # rather than leaving session selection up to the LLM.
-            if isinstance(tool_args, dict):
-                tool_args["session_id"] = session_id
-
-            # Execute the tool
-            from app.agent.langchain_tools import LANGCHAIN_TOOLS
-
-            tool_result = None
-            for tool in LANGCHAIN_TOOLS:
-                if tool.name == tool_name:
-                    tool_result = tool.invoke(tool_args)
-                    tool_result_data = tool_result  # Store the tool result
-                    break
-
-            # Add a SMALL summary of the tool result to messages (to avoid huge token usage)
-            tool_message_content = ""
-            try:
-                parsed = tool_result
-                if isinstance(tool_result, str):
-                    parsed = json.loads(tool_result)
-
-                if isinstance(parsed, dict):
-                    text_resp = parsed.get("text_response")
-                    has_chart = bool(parsed.get("chart"))
-                    data = parsed.get("data")
-
-                    # Small preview only
-                    if isinstance(data, list):
-                        data_preview = data[:3]
-                    else:
-                        data_preview = data
-
-                    summary = {
-                        "text_response": text_resp,
-                        "has_chart": has_chart,
-                        "data_preview": data_preview,
-                    }
-                    tool_message_content = json.dumps(summary, default=str)
-                else:
-                    tool_message_content = str(tool_result)
-            except Exception:
-                tool_message_content = str(tool_result)
+        # Independent tool calls of one turn run concurrently (each pays its
+        # own parse_intent LLM call); messages are appended in call order
+        outcomes = _run_tool_calls(tool_calls, session_id)
 
+        for tool_call, (tool_result, tool_message_content) in zip(tool_calls, outcomes):
+            if tool_result is not None:
+                tool_result_data = tool_result  # Store the tool result
+
+            record_payload("tool_message", tool_message_content)
             messages.append(
                 ToolMessage(
                     content=tool_message_content,
@@ -115,11 +194,18 @@ def run_agent(query: str, session_id: str = "titanic_default"):
             )
 
         # Get next response from LLM, now including tool results
-        response = tool_enabled_llm.invoke(messages)
+        with span("agent.llm_final"):
+            response = tool_enabled_llm.invoke(messages)
+        record_llm_usage("agent", response)
         messages.append(response)
 
+    response_content = getattr(response, "content", response)
+    conversation_store.record_turn(conversation, query, _tool_intent(tool_result_data), response_content)
+
     # Return both the final response and tool result data
     return {
-        "response": getattr(response, "content", response),
+        "response": response_content,
         "tool_result": tool_result_data,
+        "resolved_locally": False,
+        "conversation_id": conversation_id,
     }
\ No newline at end of file
@@ -0,0 +1,205 @@
+import re
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+from app.config import settings
+from app.utils.tokens import estimate_tokens
+
+# Longest answer text kept per turn; enough for "The average age is 29.70"
+# style answers and chart descriptions
+MAX_SUMMARY_CHARS = 300
+
+# Phrases that mark a message as an edit of the previous question
+FOLLOW_UP_CUES = (
+    "now", "instead", "what about", "how about", "same", "and for", "and as",
+    "as a", "as an", "make it", "show it", "show that", "plot it", "plot that",
+    "change it", "switch to", "for",
+)
+
+CHART_WORDS = [
+    ("3d scatter", "3d_scatter"),
+    ("3d", "3d_scatter"),
+    ("scatter", "scatter"),
+    ("histogram", "histogram"),
+    ("pie", "pie_chart"),
+    ("bar", "bar_chart"),
+    ("area", "area_chart"),
+    ("line", "line_chart"),
+]
+
+# Charts plotting more than one column; a swap to them needs that many
+CHART_MIN_COLUMNS = {"scatter": 2, "3d_scatter": 3}
+
+MAX_FOLLOW_UP_WORDS = 12
+
+# Words asking for a different computation. A message containing any of
+# them is a new question rather than a column or chart swap, so it goes to
+# the LLM even when it starts with a follow-up cue ("now how many ...").
+OPERATION_WORDS = (
+    "mean", "average", "avg", "median", "mode", "count", "counts", "how many", "number of",
+    "percentage", "percent", "%", "proportion", "ratio", "rate", "share",
+    "sum", "total", "min", "minimum", "max", "maximum", "std", "standard deviation",
+    "deviation", "variance", "spread", "quantile", "quantiles", "percentile", "percentiles",
+    "describe", "summary", "summarize", "statistics", "stats", "correlation", "correlate",
+    "correlated", "crosstab", "missing", "null", "nulls", "nan", "by", "per", "group",
+    "grouped", "where", "filter", "select", "rolling", "moving", "growth", "trend",
+)
+
+
+@dataclass
+class Turn:
+    question: str
+    intent: Optional[Dict[str, Any]]
+    summary: str
+
+
+@dataclass
+class ConversationState:
+    session_id: str
+    turns: Deque[Turn] = field(default_factory=lambda: deque(maxlen=settings.CONVERSATION_MAX_TURNS))
+
+    @property
+    def last_intent(self) -> Optional[Dict[str, Any]]:
+        for turn in reversed(self.turns):
+            if turn.intent:
+                return turn.intent
+        return None
+
+
+class ConversationStore:
+    """
+    Server-side chat memory.
+
+    Each conversation (keyed by conversation_id; run_agent mints one when the
+    client sends none) keeps its last few turns as the question, the intent
+    that answered it and a short summary of the answer; never charts or data.
+    The least recently used conversations are dropped beyond
+    CONVERSATION_MAX_COUNT.
+    """
+
+    def __init__(self):
+        self._conversations: "OrderedDict[str, ConversationState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, conversation_id: str, session_id: str) -> ConversationState:
+        """The conversation's state; a new one if it is unknown or moved to another dataset."""
+        with self._lock:
+            state = self._conversations.get(conversation_id)
+            if state is None or state.session_id != session_id:
+                state = ConversationState(session_id=session_id)
+                self._conversations[conversation_id] = state
+            self._conversations.move_to_end(conversation_id)
+            while len(self._conversations) > settings.CONVERSATION_MAX_COUNT:
+                self._conversations.popitem(last=False)
+            return state
+
+    def record_turn(self, state: ConversationState, question: str, intent: Optional[Dict[str, Any]], answer: str):
+        summary = " ".join(str(answer or "").split())[:MAX_SUMMARY_CHARS]
+        with self._lock:
+            state.turns.append(Turn(question=question, intent=intent, summary=summary))
+
+    def history_messages(self, state: ConversationState, budget: Optional[int] = None) -> List[BaseMessage]:
+        """Most recent turns as chat messages, oldest first, within the token budget."""
+        budget = settings.CONVERSATION_TOKEN_BUDGET if budget is None else budget
+        with self._lock:
+            turns = list(state.turns)
+
+        messages: List[BaseMessage] = []
+        used = 0
+        for turn in reversed(turns):
+            cost = estimate_tokens(turn.question) + estimate_tokens(turn.summary)
+            if used + cost > budget:
+                break
+            used += cost
+            messages[:0] = [HumanMessage(content=turn.question), AIMessage(content=turn.summary)]
+        return messages
+
+    def clear(self, conversation_id: str):
+        with self._lock:
+            self._conversations.pop(conversation_id, None)
+
+
+def _mentions_operation(text: str) -> bool:
+    return any(re.search(rf"(?<![a-z0-9]){re.escape(word)}(?![a-z0-9])", text) for word in OPERATION_WORDS)
+
+
+def _mentioned_chart(text: str) -> Optional[str]:
+    for word, chart_type in CHART_WORDS:
+        if re.search(rf"\b{re.escape(word)}\b", text):
+            return chart_type
+    return None
+
+
+def _mentioned_column(text: str, resolver) -> Optional[str]:
+    # "what about fare", "same for passenger class", "for age instead"
+    match = re.search(r"\b(?:about|for|of|by|on)\s+(?:the\s+)?([a-z0-9_ ]+?)(?:\s+instead)?[?.!]*$", text)
+    if not match or resolver is None:
+        return None
+    try:
+        return resolver.resolve(match.group(1).strip())
+    except ValueError:
+        return None
+
+
+def resolve_follow_up(question: str, last_intent: Optional[Dict[str, Any]], resolver=None) -> Optional[Dict[str, Any]]:
+    """
+    Turn a short edit of the previous question ("now as a pie chart", "what
+    about fare?") into a new intent without calling the LLM. Only pure
+    column or chart swaps are resolved here; messages that name an
+    operation, aggregation or grouping return None, as does anything else
+    that does not look like such an edit, so the caller falls back to the
+    full agent.
+    """
+    if not last_intent:
+        return None
+
+    text = " ".join(question.lower().split())
+    if len(text.split()) > MAX_FOLLOW_UP_WORDS:
+        return None
+    if not any(re.search(rf"^{re.escape(cue)}\b|\b{re.escape(cue)}$", text) for cue in FOLLOW_UP_CUES):
+        return None
+    if _mentions_operation(text):
+        return None
+
+    intent = dict(last_intent)
+    changed = False
+
+    chart_type = _mentioned_chart(text)
+    if chart_type and intent.get("intent") == "timeseries":
+        # Time series stay time series; only their chart style changes
+        if chart_type in ("line_chart", "area_chart"):
+            intent["chart_type"] = chart_type
+            changed = True
+    elif chart_type and chart_type != "line_chart":
+        if intent.get("intent") == "aggregation":
+            # Grouped results are charted on their grouping column
+            columns = [intent.get("group_by") or intent["columns"][0]]
+        else:
+            columns = list(intent.get("columns") or [])
+        if len(columns) < CHART_MIN_COLUMNS.get(chart_type, 1):
+            # "now as a scatter" after a one-column question: the LLM has to pick the other axes
+            return None
+        intent = {"intent": "visualization", "chart_type": chart_type, "columns": columns}
+        changed = True
+
+    column = _mentioned_column(text, resolver)
+    if column and intent.get("value") not in (None, ""):
+        # A compared value ("sex = male") belongs to the old column
+        return None
+    if column:
+        columns = list(intent.get("columns") or [])
+        if intent.get("intent") == "timeseries" and columns:
+            # Keep the time axis, swap the measured column
+            intent["columns"] = [columns[0], column]
+        else:
+            intent["columns"] = [column] + columns[1:]
+        changed = True
+
+    return intent if changed else None
+
+
+conversation_store = ConversationStore()
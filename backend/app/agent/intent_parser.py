@@ -1,6 +1,9 @@
 import json
 from langchain_core.prompts import ChatPromptTemplate
 from app.agent.llm_client import llm
+from app.config import settings
+from app.core.metrics import record_llm_usage, record_prompt_tokens
+from app.utils.tokens import estimate_tokens
 
 
 PROMPT = ChatPromptTemplate.from_template("""
@@ -19,11 +22,20 @@ Allowed intents:
 - analytics
 - aggregation
 - visualization
+- timeseries
+- sql
 
 Allowed analytics operations:
 - mean
 - percentage
 - count
+- median
+- quantile
+- std
+- var
+- describe
+- correlation
+- crosstab
 
 Allowed charts:
 - histogram
@@ -46,6 +58,33 @@ Guidelines for visualization questions:
     - "intent": "visualization", "chart_type": "area_chart", "columns": ["age"]
 - Do NOT use "analytics" + "operation": "mean" for questions that clearly ask to visualize or plot a distribution.
 
+Guidelines for statistics questions:
+- Median, percentile, standard deviation and variance of a column use "operation": "median",
+  "quantile", "std" or "var" with "columns": ["<COLUMN_NAME>"].
+  For "quantile", put the percentile(s) in "value", e.g. "90" or "25,75".
+- "Describe"/"summary statistics" use "operation": "describe"; "columns" lists the columns
+  asked about, or is empty for all numeric columns.
+- Correlations use "operation": "correlation" with the columns asked about (empty for all numeric columns).
+- Counts of one column's values broken down by another ("survival by class as a table",
+  "crosstab of sex and class") use "operation": "crosstab" with "columns": ["<ROW_COLUMN>", "<COLUMN_COLUMN>"].
+
+Guidelines for time series questions:
+- Columns marked (datetime) hold dates. Questions about trends, values over time,
+  per day/week/month/quarter/year, rolling averages or period-over-period change use:
+  - "intent": "timeseries"
+  - "columns": ["<datetime_column>", "<value_column>"] (value column omitted to count rows)
+  - "operation": "resample", "rolling" (moving average) or "pct_change" (period-over-period change)
+  - "period": "hour", "day", "week", "month", "quarter" or "year"
+  - "aggregation": "mean", "sum" or "count"
+  - "window": number of periods, only for "rolling"
+  - "start" / "end": "YYYY-MM-DD", only when the user limits the date range
+  - "chart_type": "line_chart" (or "area_chart" when asked for)
+- Examples:
+  - "Monthly total sales in 2023" →
+    - "intent": "timeseries", "operation": "resample", "columns": ["order_date", "sales"], "period": "month", "aggregation": "sum", "start": "2023-01-01", "end": "2023-12-31"
+  - "3 week rolling average of price" →
+    - "intent": "timeseries", "operation": "rolling", "columns": ["date", "price"], "period": "week", "aggregation": "mean", "window": 3
+
 Guidelines for percentage questions:
 - When the user asks "What percentage of people/rows have X?", use:
   - "operation": "percentage"
@@ -76,6 +115,15 @@ Guidelines for missing-value count questions:
   - Use "columns": ["<COLUMN_NAME>"]
   - Use "value": "non-missing"
 
+Guidelines for SQL questions:
+- Only when the question needs something the other intents cannot express (several filter
+  conditions, top-N/ranking, window functions, computed columns), use:
+  - "intent": "sql"
+  - "query": one DuckDB SELECT over the table data, using only the listed column names
+- Example:
+  - "Which 5 oldest female passengers in first class paid the most?" →
+    - "intent": "sql", "query": "SELECT name, age, fare FROM data WHERE sex = 'female' AND pclass = 1 ORDER BY age DESC, fare DESC LIMIT 5"
+
 JSON FORMAT:
 {{
   "intent": "",
@@ -90,17 +138,38 @@ User Question:
 {question}
 """)
 
-def build_schema_text(schema:dict):
+def build_schema_text(schema:dict, columns=None):
+    cols = columns if columns is not None else [c["name"] for c in schema['columns']]
+    datetime_cols = set(schema.get('datetime_columns') or [])
+    return ", ".join(f"{c} (datetime)" if c in datetime_cols else c for c in cols)
+
+def select_prompt_columns(question: str, schema: dict, column_index=None):
+    """
+    Columns to show the LLM: all of them for narrow datasets, otherwise the
+    PROMPT_MAX_COLUMNS most relevant to the question.
+    """
     cols = [c["name"] for c in schema['columns']]
-    return ", ".join(cols)
+    if column_index is None or len(cols) <= settings.PROMPT_MAX_COLUMNS:
+        return cols
+    return column_index.top_columns(question, settings.PROMPT_MAX_COLUMNS)
 
-def parse_intent(question: str,schema: dict):
+def parse_intent(question: str,schema: dict, column_index=None):
     
-    schema_text = build_schema_text(schema)
+    prompt_columns = select_prompt_columns(question, schema, column_index)
+    schema_text = build_schema_text(schema, prompt_columns)
+
+    prompt_values = {"question": question, "columns": schema_text}
+    sent_tokens = estimate_tokens(PROMPT.format(**prompt_values))
+    if len(prompt_columns) < len(schema['columns']):
+        full_tokens = estimate_tokens(PROMPT.format(question=question, columns=build_schema_text(schema)))
+    else:
+        full_tokens = sent_tokens
+    record_prompt_tokens("intent_parser", full_tokens, sent_tokens)
 
     chain = PROMPT | llm
 
-    response = chain.invoke({"question": question, "columns": schema_text})
+    response = chain.invoke(prompt_values)
+    record_llm_usage("intent_parser", response)
     content = response.content.strip()
 
     # Debug: Print the raw response
@@ -5,6 +5,7 @@ from typing import Optional
 from app.agent.intent_parser import parse_intent
 from app.core.orchestrator import orchestrator
 from app.core.session_manager import session_manager
+from app.core.metrics import span, record_payload
 
 import json
 
@@ -32,16 +33,22 @@ def dataset_analysis_tool(query: str, session_id: str = "titanic_default"):
     schema = dataset_manager.get_schema()
 
     # LLM → structured intent
-    intent = parse_intent(query, schema)
+    with span("tool.parse_intent"):
+        intent = parse_intent(query, schema, dataset_manager.get_column_index())
 
     # Deterministic execution
-    result = orchestrator.execute(session_id, intent)
+    with span("tool.orchestrator"):
+        result = orchestrator.execute(session_id, intent)
 
-    return json.dumps({
+    payload = json.dumps({
         "text_response": result["text_response"],
         "chart": result["chart"],
-        "data": result["data"]
+        "data": result["data"],
+        # Kept by the agent as conversation state for follow-ups
+        "intent": intent,
     }, default=str)
+    record_payload("tool_result", payload)
+    return payload
 
 
 
@@ -1,18 +1,90 @@
-
-from langchain_groq import ChatGroq
-from langchain_google_genai import ChatGoogleGenerativeAI
 from app.config import settings
+from app.agent.llm_gateway import LLMGateway, get_http_client
+
+
+# Provider registry: name → factory returning a LangChain chat model.
+# settings.LLM_PROVIDER picks the one used by the agent and the intent parser,
+# settings.LLM_FALLBACK_PROVIDER the one used for hedging and failover.
+# Provider clients don't retry on their own; LLMGateway owns retries.
+
+def _build_groq():
+    from langchain_groq import ChatGroq
+
+    if not settings.GROQ_API_KEY:
+        raise ValueError("GROQ_API_KEY is required for the 'groq' LLM provider.")
+
+    return ChatGroq(
+        #  model = 'llama-3.3-70b-versatile',
+        model = 'llama-3.1-8b-instant',
+        api_key=settings.GROQ_API_KEY,
+        temperature=0,
+        base_url=settings.GROQ_BASE_URL,
+        http_client=get_http_client(),
+        request_timeout=settings.LLM_TIMEOUT_S,
+        max_retries=0,
+        )
+
+
+def _build_gemini():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    if not settings.GEMINI_API_KEY:
+        raise ValueError("GEMINI_API_KEY is required for the 'gemini' LLM provider.")
+
+    return ChatGoogleGenerativeAI(
+        model = "gemini-2.5-flash",
+        api_key=settings.GEMINI_API_KEY,
+        temperature=0,
+        timeout=settings.LLM_TIMEOUT_S,
+        max_retries=0,
+    )
+
 
+def _build_stub():
+    # Deterministic local model for offline load testing and profiling
+    from app.agent.stub_llm import StubChatModel
 
-llm = ChatGroq(
-    #  model = 'llama-3.3-70b-versatile',
-    model = 'llama-3.1-8b-instant',
-    api_key=settings.GROQ_API_KEY,
-    temperature=0
+    return StubChatModel(
+        latency_ms=settings.STUB_LLM_LATENCY_MS,
+        jitter_ms=settings.STUB_LLM_JITTER_MS,
+        seed=settings.STUB_LLM_SEED,
     )
 
-# llm = ChatGoogleGenerativeAI(
-#     model = "gemini-2.5-flash",
-#     api_key=settings.GEMINI_API_KEY,
-#     temperature=0
-# )
\ No newline at end of file
+
+LLM_PROVIDERS = {
+    "groq": _build_groq,
+    "gemini": _build_gemini,
+    "stub": _build_stub,
+}
+
+
+def register_llm_provider(name: str, factory):
+    LLM_PROVIDERS[name] = factory
+
+
+def create_provider_llm(provider: str):
+    if provider not in LLM_PROVIDERS:
+        raise ValueError(
+            f"Unknown LLM provider '{provider}'. Available: {', '.join(sorted(LLM_PROVIDERS))}"
+        )
+    return LLM_PROVIDERS[provider]()
+
+
+def create_llm(provider: str = None, fallback: str = None):
+    """The configured provider (plus optional fallback) behind an LLMGateway."""
+    provider = provider or settings.LLM_PROVIDER
+    fallback = fallback or settings.LLM_FALLBACK_PROVIDER
+
+    return LLMGateway(
+        primary=create_provider_llm(provider),
+        primary_name=provider,
+        fallback=create_provider_llm(fallback) if fallback else None,
+        fallback_name=fallback,
+        hedge_after_ms=settings.LLM_HEDGE_AFTER_MS,
+        max_retries=settings.LLM_MAX_RETRIES,
+        retry_backoff_ms=settings.LLM_RETRY_BACKOFF_MS,
+        max_retry_delay_s=settings.LLM_TIMEOUT_S,
+    )
+
+
+llm = create_llm()
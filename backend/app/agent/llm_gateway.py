@@ -0,0 +1,151 @@
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, List, Optional
+
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.config import settings
+from app.core.metrics import metrics
+
+_http_client: Optional[httpx.Client] = None
+_http_lock = threading.Lock()
+
+# Per-worker cap on in-flight LLM calls, shared by every gateway instance
+_limiter = threading.BoundedSemaphore(settings.LLM_MAX_CONCURRENCY)
+_hedge_executor = ThreadPoolExecutor(
+    max_workers=max(2, settings.LLM_MAX_CONCURRENCY * 2),
+    thread_name_prefix="llm-hedge",
+)
+
+
+def get_http_client() -> httpx.Client:
+    """One keep-alive connection pool for every provider client in this worker."""
+    global _http_client
+    with _http_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                timeout=httpx.Timeout(settings.LLM_TIMEOUT_S, connect=settings.LLM_CONNECT_TIMEOUT_S),
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_POOL_CONNECTIONS,
+                    max_keepalive_connections=settings.LLM_POOL_CONNECTIONS,
+                ),
+            )
+        return _http_client
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMGateway(BaseChatModel):
+    """
+    Chat model wrapper that every LLM call goes through.
+
+    - 429 responses are retried with exponential backoff (or the server's
+      Retry-After), up to LLM_MAX_RETRIES. A single wait is capped at
+      `max_retry_delay_s` (LLM_TIMEOUT_S), so a large Retry-After cannot
+      park the request.
+    - With a fallback provider configured, a primary call still running after
+      LLM_HEDGE_AFTER_MS is hedged: the fallback is called too and the first
+      successful answer wins. A failed primary call fails over to the fallback.
+    - All calls share one concurrency limiter (LLM_MAX_CONCURRENCY per worker).
+      A hedged request holds two limiter slots and two llm-hedge threads
+      until both calls return, since the losing call is not cancelled.
+
+    Provider clients are built by llm_client with the shared HTTP pool and
+    timeouts. Behaves like any LangChain chat model (invoke, chains, bind_tools).
+    """
+
+    primary: Any
+    primary_name: str
+    fallback: Any = None
+    fallback_name: Optional[str] = None
+    hedge_after_ms: float = 0.0
+    max_retries: int = 0
+    retry_backoff_ms: float = 500.0
+    max_retry_delay_s: float = 30.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "gateway"
+
+    def bind_tools(self, tools, **kwargs):
+        # Tools are bound on each provider, so either can answer a tool turn
+        return self.model_copy(update={
+            "primary": self.primary.bind_tools(tools, **kwargs),
+            "fallback": self.fallback.bind_tools(tools, **kwargs) if self.fallback is not None else None,
+        })
+
+    def _call(self, model, name: str, messages: List[BaseMessage], stop):
+        attempt = 0
+        while True:
+            try:
+                with _limiter:
+                    message = model.invoke(messages, stop=stop)
+                metrics.inc("llm_requests_total", provider=name, outcome="ok")
+                return message
+            except Exception as e:
+                rate_limited = _status_code(e) == 429
+                metrics.inc("llm_requests_total", provider=name, outcome="rate_limited" if rate_limited else "error")
+                if not rate_limited or attempt >= self.max_retries:
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = self.retry_backoff_ms / 1000 * (2 ** attempt) * random.uniform(1.0, 1.5)
+                time.sleep(min(max(delay, 0.0), self.max_retry_delay_s))
+                attempt += 1
+
+    def _submit(self, model, name: str, messages, stop):
+        return _hedge_executor.submit(contextvars.copy_context().run, self._call, model, name, messages, stop)
+
+    def _invoke(self, messages: List[BaseMessage], stop):
+        if self.fallback is None:
+            return self._call(self.primary, self.primary_name, messages, stop)
+
+        if self.hedge_after_ms <= 0:
+            try:
+                return self._call(self.primary, self.primary_name, messages, stop)
+            except Exception:
+                metrics.inc("llm_failovers_total", provider=self.fallback_name)
+                return self._call(self.fallback, self.fallback_name, messages, stop)
+
+        primary = self._submit(self.primary, self.primary_name, messages, stop)
+        done, _ = wait([primary], timeout=self.hedge_after_ms / 1000)
+        if done:
+            if primary.exception() is None:
+                return primary.result()
+            metrics.inc("llm_failovers_total", provider=self.fallback_name)
+            return self._call(self.fallback, self.fallback_name, messages, stop)
+
+        # Primary is slow: race it against the fallback
+        metrics.inc("llm_hedges_total", provider=self.fallback_name)
+        pending = {primary, self._submit(self.fallback, self.fallback_name, messages, stop)}
+        errors = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                errors.append(future.exception())
+        raise errors[0]
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message = self._invoke(messages, stop)
+        return ChatResult(generations=[ChatGeneration(message=message)])
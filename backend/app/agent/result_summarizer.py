@@ -0,0 +1,152 @@
+import json
+import math
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.core.metrics import record_prompt_tokens
+from app.utils.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+# Longest string kept for text answers and individual values
+MAX_TEXT_CHARS = 400
+MAX_VALUE_CHARS = 60
+# Record digests describe at most this many columns
+MAX_RECORD_COLUMNS = 12
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _clip(value):
+    if isinstance(value, str) and len(value) > MAX_VALUE_CHARS:
+        return value[:MAX_VALUE_CHARS] + "…"
+    return value
+
+
+def _numeric_summary(values: List[Any]) -> Optional[Dict[str, float]]:
+    numbers = [v for v in values if _is_number(v)]
+    if not numbers:
+        return None
+    total = sum(numbers)
+    return {
+        "count": len(numbers),
+        "sum": round(total, 6),
+        "min": min(numbers),
+        "max": max(numbers),
+        "mean": round(total / len(numbers), 6),
+    }
+
+
+def _digest_mapping(data: Dict[Any, Any], top_k: int) -> Dict[str, Any]:
+    # value_counts-style output: keep the largest entries
+    items = list(data.items())
+    if items and all(_is_number(v) for _, v in items):
+        items.sort(key=lambda kv: kv[1], reverse=True)
+    digest = {
+        "type": "mapping",
+        "size": len(items),
+        "top": [[_clip(str(k)), _clip(v)] for k, v in items[:top_k]],
+    }
+    summary = _numeric_summary([v for _, v in items])
+    if summary:
+        digest["total"] = summary["sum"]
+        digest["numeric"] = summary
+    return digest
+
+
+def _digest_records(rows: List[Dict[str, Any]], top_k: int) -> Dict[str, Any]:
+    # groupby-style output: a list of row dicts
+    columns = list(rows[0].keys())[:MAX_RECORD_COLUMNS]
+    digest = {
+        "type": "records",
+        "rows": len(rows),
+        "columns": columns,
+        "head": [{c: _clip(row.get(c)) for c in columns} for row in rows[:top_k]],
+    }
+    numeric = {}
+    for column in columns:
+        summary = _numeric_summary([row.get(column) for row in rows])
+        if summary:
+            numeric[column] = summary
+    if numeric:
+        digest["numeric"] = numeric
+    return digest
+
+
+def _digest_list(values: List[Any], top_k: int) -> Dict[str, Any]:
+    digest = {
+        "type": "list",
+        "size": len(values),
+        "head": [_clip(v) for v in values[:top_k]],
+    }
+    try:
+        digest["distinct"] = len(set(values))
+    except TypeError:
+        pass
+    summary = _numeric_summary(values)
+    if summary:
+        digest["numeric"] = summary
+    return digest
+
+
+def digest_data(data: Any, top_k: int) -> Any:
+    """Fixed-size description of tool data, whatever its shape."""
+    if data is None or isinstance(data, bool) or _is_number(data):
+        return data
+    if isinstance(data, str):
+        return data[:MAX_TEXT_CHARS]
+    if isinstance(data, dict):
+        return _digest_mapping(data, top_k)
+    if isinstance(data, list):
+        if data and all(isinstance(row, dict) for row in data):
+            return _digest_records(data, top_k)
+        return _digest_list(data, top_k)
+    return str(data)[:MAX_TEXT_CHARS]
+
+
+def summarize_tool_result(tool_result, budget: Optional[int] = None, top_k: Optional[int] = None) -> str:
+    """
+    Build the ToolMessage content for a tool result: the answer text, a chart
+    flag and a digest of the data (top entries, totals, cardinality, numeric
+    summary). The number of entries shown is halved until the digest fits the
+    token budget, then the answer text is shortened if it still does not, so
+    the follow-up LLM call stays small for any dataset size.
+    Full and digest token estimates are recorded under prompt_tokens.
+    """
+    budget = settings.TOOL_SUMMARY_TOKEN_BUDGET if budget is None else budget
+    top_k = settings.TOOL_SUMMARY_TOP_K if top_k is None else top_k
+
+    raw = tool_result if isinstance(tool_result, str) else json.dumps(tool_result, default=str)
+    try:
+        parsed = json.loads(tool_result) if isinstance(tool_result, str) else tool_result
+    except ValueError:
+        parsed = None
+
+    if not isinstance(parsed, dict):
+        content = str(tool_result)[: budget * 4]
+        record_prompt_tokens("tool_message", estimate_tokens(raw), estimate_tokens(content))
+        return content
+
+    text_response = parsed.get("text_response")
+    if isinstance(text_response, str):
+        text_response = text_response[:MAX_TEXT_CHARS]
+
+    while True:
+        content = json.dumps({
+            "text_response": text_response,
+            "has_chart": bool(parsed.get("chart")),
+            "data": digest_data(parsed.get("data"), top_k),
+        }, default=str)
+        if estimate_tokens(content) <= budget:
+            break
+        if top_k > 0:
+            top_k //= 2
+        elif isinstance(text_response, str) and text_response:
+            # No entries left to drop: give up the excess from the answer text
+            excess = (estimate_tokens(content) - budget) * CHARS_PER_TOKEN
+            text_response = text_response[: max(0, len(text_response) - excess)]
+        else:
+            break
+
+    record_prompt_tokens("tool_message", estimate_tokens(raw), estimate_tokens(content))
+    return content
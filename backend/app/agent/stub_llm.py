@@ -0,0 +1,231 @@
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+
+CHART_KEYWORDS = [
+    ("3d scatter", "3d_scatter"),
+    ("scatter", "scatter"),
+    ("histogram", "histogram"),
+    ("pie", "pie_chart"),
+    ("area", "area_chart"),
+    ("bar", "bar_chart"),
+]
+
+STATS_KEYWORDS = [
+    ("describe", "describe"),
+    ("summary statistics", "describe"),
+    ("correlat", "correlation"),
+    ("crosstab", "crosstab"),
+    ("cross tab", "crosstab"),
+    ("median", "median"),
+    ("percentile", "quantile"),
+    ("quantile", "quantile"),
+    ("standard deviation", "std"),
+    ("std", "std"),
+    ("variance", "var"),
+]
+
+TIME_PERIODS = [
+    ("hourly", "hour"), ("per hour", "hour"),
+    ("daily", "day"), ("per day", "day"),
+    ("weekly", "week"), ("per week", "week"), ("week", "week"),
+    ("monthly", "month"), ("per month", "month"), ("month", "month"),
+    ("quarterly", "quarter"), ("per quarter", "quarter"), ("quarter", "quarter"),
+    ("yearly", "year"), ("per year", "year"), ("annual", "year"), ("year", "year"),
+]
+TIME_WORDS = ("over time", "trend", "rolling", "moving average", "growth", "change")
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _mentioned_columns(question: str, columns: List[str]) -> List[str]:
+    """Columns named in the question, in the order they appear."""
+    question = question.lower()
+    positions = []
+    for col in columns:
+        for form in {col.lower(), col.lower().replace("_", " ")}:
+            match = re.search(rf"\b{re.escape(form)}\b", question)
+            if match:
+                positions.append((match.start(), col))
+                break
+    return [col for _, col in sorted(positions)]
+
+
+def stub_intent(question: str, columns: List[str], datetime_columns: Optional[List[str]] = None) -> dict:
+    """Keyword-based stand-in for the intent the real LLM would produce."""
+    q = question.lower()
+    if re.match(r"^\s*(select|with)\b", q):
+        # Raw SQL typed by the user is passed through as a SQL intent
+        return {"intent": "sql", "query": question.strip()}
+
+    mentioned = _mentioned_columns(q, columns) or columns[:1]
+
+    period = next((period for word, period in TIME_PERIODS if word in q), None)
+    if datetime_columns and (period or any(word in q for word in TIME_WORDS)):
+        time_col = next((col for col in _mentioned_columns(q, columns) if col in datetime_columns), datetime_columns[0])
+        values = [col for col in _mentioned_columns(q, columns) if col not in datetime_columns]
+        operation = "resample"
+        if "rolling" in q or "moving average" in q:
+            operation = "rolling"
+        elif "growth" in q or "change" in q:
+            operation = "pct_change"
+        return {
+            "intent": "timeseries",
+            "operation": operation,
+            "chart_type": "area_chart" if "area" in q else "line_chart",
+            "columns": [time_col] + values[:1],
+            "period": period or "month",
+            "aggregation": "sum" if ("total" in q or "sum" in q) and values else "",
+        }
+
+    intent = {
+        "intent": "analytics",
+        "operation": "count",
+        "chart_type": "",
+        "columns": mentioned[:1],
+        "group_by": "",
+        "value": "",
+    }
+
+    chart = next((chart for word, chart in CHART_KEYWORDS if word in q), None)
+    by_clause = q.split(" by ", 1)[1] if " by " in q else ""
+    group_cols = _mentioned_columns(by_clause, columns)
+    value_cols = [col for col in mentioned if col not in group_cols[:1]]
+    wants_mean = any(word in q for word in ("average", "mean"))
+    stats_operation = next((operation for word, operation in STATS_KEYWORDS if word in q), None)
+
+    if chart:
+        needed = {"scatter": 2, "3d_scatter": 3}.get(chart, 1)
+        intent.update(intent="visualization", operation="", chart_type=chart,
+                      columns=(mentioned + columns)[:needed])
+    elif stats_operation:
+        intent["operation"] = stats_operation
+        if stats_operation in ("describe", "correlation"):
+            intent["columns"] = _mentioned_columns(q, columns)
+        elif stats_operation == "crosstab":
+            intent["columns"] = (mentioned + [c for c in columns if c not in mentioned])[:2]
+        elif stats_operation == "quantile":
+            intent["value"] = ",".join(re.findall(r"\b(\d{1,2})(?:st|nd|rd|th)?\s*(?:percentile|%)", q))
+    elif group_cols and wants_mean and value_cols:
+        intent.update(intent="aggregation", operation="mean",
+                      columns=value_cols[:1], group_by=group_cols[0])
+    elif group_cols:
+        intent.update(intent="aggregation", operation="count",
+                      columns=group_cols[:1], group_by=group_cols[0])
+    elif wants_mean:
+        intent["operation"] = "mean"
+    elif any(word in q for word in ("percentage", "percent", "%")):
+        intent["operation"] = "percentage"
+
+    if intent["intent"] == "analytics" and any(word in q for word in ("missing", "null", "nan")):
+        intent["value"] = "missing"
+
+    return intent
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Deterministic, offline chat model for load testing and profiling.
+
+    It plays every role the real LLM has in this app:
+    - with tools bound and a user message last → one call to the first tool
+    - with a tool result last → a short final answer built from it
+    - given the intent-parser prompt → intent JSON from keyword matching
+    Each call sleeps latency_ms ± jitter_ms (seeded) to stand in for network
+    and inference time, and reports approximate token usage.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    seed: int = 0
+
+    _rng: random.Random = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _call_ids: Any = PrivateAttr(default_factory=itertools.count)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _sleep(self):
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        delay = max(0.0, self.latency_ms + jitter)
+        if delay:
+            time.sleep(delay / 1000)
+
+    def _reply(self, messages: List[BaseMessage], tools: Optional[list]) -> AIMessage:
+        last = messages[-1]
+        text = last.content if isinstance(last.content, str) else str(last.content)
+
+        if isinstance(last, ToolMessage):
+            # Answer from every tool result of the last turn, in order
+            results = []
+            for message in reversed(messages):
+                if not isinstance(message, ToolMessage):
+                    break
+                results.insert(0, message.content if isinstance(message.content, str) else str(message.content))
+            answers = []
+            for result in results:
+                try:
+                    answers.append(json.loads(result).get("text_response") or "Analysis complete.")
+                except (ValueError, AttributeError):
+                    answers.append(result)
+            return AIMessage(content=" ".join(answers))
+
+        if "AVAILABLE DATASET COLUMNS:" in text:
+            columns_block = text.split("AVAILABLE DATASET COLUMNS:", 1)[1].split("\n\n", 1)[0]
+            columns = [c.strip() for c in columns_block.split(",") if c.strip()]
+            datetime_columns = [c[: -len(" (datetime)")] for c in columns if c.endswith(" (datetime)")]
+            columns = [c[: -len(" (datetime)")] if c.endswith(" (datetime)") else c for c in columns]
+            question = text.rsplit("User Question:", 1)[-1].strip()
+            return AIMessage(content=json.dumps(stub_intent(question, columns, datetime_columns)))
+
+        if tools and isinstance(last, HumanMessage):
+            tool_name = tools[0]["function"]["name"]
+            # Several questions in one message ("...? ...?" or "...; ...")
+            # become one tool call each, like a real model's parallel calls
+            questions = [q.strip() for q in re.split(r"(?<=\?)\s+|\s*;\s*", text) if q.strip()]
+            return AIMessage(
+                content="",
+                tool_calls=[{
+                    "name": tool_name,
+                    "args": {"query": question},
+                    "id": f"call_{next(self._call_ids)}",
+                } for question in questions],
+            )
+
+        return AIMessage(content="I can only analyze the current dataset.")
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self._sleep()
+
+        message = self._reply(messages, kwargs.get("tools"))
+
+        input_tokens = sum(_approx_tokens(str(m.content)) for m in messages)
+        output_tokens = _approx_tokens(message.content or json.dumps(message.tool_calls))
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
@@ -0,0 +1,115 @@
+import gzip
+from typing import Optional
+
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config import settings
+from app.core.metrics import metrics
+
+# Encodings we can produce, in order of preference on equal q-values
+ENCODINGS = ("zstd", "gzip")
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """The preferred encoding the client accepts (RFC 9110 q-values), or None."""
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        # Compressor contexts are not thread-safe; one per response is cheap
+        return zstandard.ZstdCompressor(level=settings.COMPRESS_ZSTD_LEVEL).compress(body)
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(body, compresslevel=settings.COMPRESS_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Content-negotiated zstd/gzip compression for JSON and text responses.
+
+    Bodies smaller than `minimum_size` and streamed responses are passed
+    through. A strong ETag on a compressed response gets the encoding
+    appended ("<tag>-zstd"), since the encoded bytes are a different
+    representation; conditional checks strip that suffix again.
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESS_MIN_BYTES if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if "content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streamed or small: not worth buffering or compressing
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            metrics.inc("response_bytes_total", len(body), encoding="identity")
+            metrics.inc("response_bytes_total", len(compressed), encoding=encoding)
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            etag = headers.get("etag")
+            if etag and etag.startswith('"') and etag.endswith('"'):
+                headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,41 @@
+from typing import Optional
+
+import xxhash
+from fastapi.responses import Response
+
+from app.api.compression import ENCODINGS
+from app.core.metrics import metrics
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the values a response is derived from."""
+    return '"' + xxhash.xxh3_128_hexdigest("\x1f".join(str(part) for part in parts)) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check (weak comparison, as RFC 9110 specifies for it).
+    Tags the compression middleware suffixed with an encoding match their
+    identity tag, since the decoded content is the same.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        for encoding in ENCODINGS:
+            suffix = f'-{encoding}"'
+            if candidate.endswith(suffix):
+                candidate = candidate[: -len(suffix)] + '"'
+                break
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str, endpoint: str) -> Response:
+    metrics.inc("not_modified_total", endpoint=endpoint)
+    return Response(status_code=304, headers={"ETag": etag})
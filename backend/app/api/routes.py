@@ -1,69 +1,348 @@
 
-from fastapi import APIRouter , UploadFile, File, HTTPException
+from fastapi import APIRouter , UploadFile, File, Form, HTTPException, Header
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from contextlib import nullcontext
 
 from app.agent.agent_executor import run_agent
+from app.api.etags import etag_matches, make_etag, not_modified
+from app.core.orchestrator import orchestrator
 from app.core.dataset_manager import dataset_manager
 from app.core.session_manager import session_manager
+from app.core.metrics import metrics, span, start_request_timings
+from app.core.profiler import profile_store
+from app.core.job_manager import job_manager
+from app.core.result_cache import result_cache
+from app.core.join_engine import hash_join
+from app.core.sql_engine import DEFAULT_TABLE, run_sql
+from app.core.ingestion import TYPED_FORMATS, detect_format, parse_columns, read_dataset, resolve_dataset_path
+from app.config import settings
+import json
 import os
+import secrets
 import pandas as pd
-from io import StringIO
+import xxhash
+from io import BytesIO
 
 class ChatRequest(BaseModel):
     query: str
     # Session identifier for selecting which uploaded dataset to use.
     # Defaults to the Titanic dataset.
     session_id: str = "titanic_default"
+    # When true, the response carries a per-stage timing breakdown.
+    include_timings: bool = False
+    # Allow querying a session whose background ingestion is still running,
+    # against the rows loaded so far.
+    allow_partial: bool = False
+    # Groups messages into one conversation for follow-up questions.
+    # Defaults to the session_id.
+    conversation_id: Optional[str] = None
+
+class RegisterDatasetRequest(BaseModel):
+    # File path relative to DATA_DIR, or absolute within DATASET_ROOTS
+    path: str
+    # Optional column projection (raw or normalized names)
+    columns: Optional[List[str]] = None
+    # Include per-column missing value counts in the returned schema
+    stats: bool = True
+
+class JoinRequest(BaseModel):
+    left_session_id: str
+    right_session_id: str
+    # Key columns; right_on defaults to the same names as left_on
+    left_on: List[str]
+    right_on: Optional[List[str]] = None
+    # "inner" or "left"
+    how: str = "inner"
+    # Columns to carry over from each side (keys are always kept).
+    # Omitted means all of that side's columns.
+    left_columns: Optional[List[str]] = None
+    right_columns: Optional[List[str]] = None
+
+class SQLRequest(BaseModel):
+    # One SELECT statement; the session's dataset is the table "data"
+    query: str
+    session_id: str = "titanic_default"
+    # Other sessions to expose as tables, as {table_name: session_id}
+    tables: Optional[Dict[str, str]] = None
+    # Lower than SQL_MAX_ROWS to return fewer rows
+    max_rows: Optional[int] = None
+    # "json" or "arrow" (Arrow IPC stream)
+    format: str = "json"
+    allow_partial: bool = False
+
+class QueryRequest(BaseModel):
+    # Structured intent, in the same shape parse_intent produces
+    intent: Dict[str, Any]
+    session_id: str = "titanic_default"
+    include_timings: bool = False
+    allow_partial: bool = False
 
 router = APIRouter()
 
 
+def _require_admin(token: Optional[str]):
+    # Closed unless a token is configured
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN to enable them.")
+    if not secrets.compare_digest((token or "").encode(), settings.ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Admin token required.")
+
+
+def _profiling_requested(flag: bool, header: Optional[str], admin_token: Optional[str]) -> bool:
+    # Either ?profile=1 or an X-Profile header turns profiling on for one request
+    if not flag and (header or "").strip().lower() not in {"1", "true", "yes", "on"}:
+        return False
+    _require_admin(admin_token)
+    return True
+
+
+def _partial_session(session_id: str, allow_partial: bool) -> bool:
+    """Return True if the query will run on a still-ingesting session's partial rows."""
+    try:
+        ingesting = session_manager.is_ingesting(session_id)
+    except ValueError:
+        # Unknown sessions fail later with the usual error
+        return False
+    if not ingesting:
+        return False
+    if not allow_partial:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Session '{session_id}' is still ingesting. Poll /jobs or set allow_partial to query the rows loaded so far.",
+        )
+    if session_manager.get_dataset_manager(session_id).get_dataframe() is None:
+        raise HTTPException(status_code=409, detail=f"Session '{session_id}' has no rows loaded yet.")
+    return True
+
+
 @router.get('/health')
 def health_check():
     return {"status": "ok"}
 
+@router.get('/metrics')
+def metrics_endpoint():
+    # Prometheus text exposition format
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @router.get('/dataset-schema')
-def dataset_schema():
-    schema = dataset_manager.get_schema()
+def dataset_schema(response: Response, stats: bool = True, if_none_match: Optional[str] = Header(None)):
+    # stats=false returns names and dtypes only, without computing column stats.
+    # The schema only changes with the dataset version, so that is the ETag.
+    etag = make_etag("schema", dataset_manager.version, stats)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, "/dataset-schema")
+    schema = dataset_manager.get_schema(include_stats=stats)
+    response.headers["ETag"] = etag
     return schema
 
 @router.post("/upload-dataset")
-async def uplod_dataset(file:UploadFile = File(...)):
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Only CSV files are allowed.")
+async def uplod_dataset(
+    file:UploadFile = File(...),
+    columns: Optional[str] = Form(None),
+    background: bool = Form(False),
+    stats: bool = Form(True),
+):
+    # CSV (optionally .gz/.zst), Parquet, Feather/Arrow and JSON lines;
+    # `columns` is an optional comma-separated projection. With `background`
+    # the response returns at once and parsing runs as an ingestion job.
+    # stats=false leaves missing value counts out of the returned schema.
+    try:
+        fmt, compression = detect_format(file.filename)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    selected_columns = parse_columns(columns)
 
     try:
-        contents = await file.read()
+        # Hash while streaming the upload in, so identical content can be
+        # recognised without parsing it again
+        hasher = xxhash.xxh3_128()
+        buffer = BytesIO()
+        while True:
+            chunk = await file.read(settings.UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            buffer.write(chunk)
+        projection = ",".join(selected_columns or [])
+        content_key = f"{fmt}:{compression or ''}:{projection}:{hasher.hexdigest()}"
 
-        decoded =  contents.decode('utf-8')
-        df = pd.read_csv(StringIO(decoded))
+        if background:
+            buffer.seek(0)
+            job = job_manager.submit_ingestion(buffer, file.filename, buffer.getbuffer().nbytes, selected_columns)
+            return JSONResponse(status_code=202, content=job.to_dict())
 
-        if df.shape[0] == 0:
-            raise HTTPException(status_code=400, detail="Uploaded CSV file is empty.")
-        
-        session_id =  session_manager.create_session_from_dataframe(df)
+        def parse_upload() -> pd.DataFrame:
+            buffer.seek(0)
+            df = read_dataset(buffer, file.filename, columns=selected_columns)
+            if df.shape[0] == 0:
+                raise HTTPException(status_code=400, detail="Uploaded file is empty.")
+            return df
+
+        session_id, deduplicated = session_manager.create_session_for_content(
+            content_key, parse_upload, typed=fmt in TYPED_FORMATS
+        )
         dataset_manager = session_manager.get_dataset_manager(session_id)
+        job_manager.warm_profile(dataset_manager)
 
         return {
             "session_id": session_id,
-            "schema": dataset_manager.get_schema()
+            "schema": dataset_manager.get_schema(include_stats=stats),
+            "deduplicated": deduplicated,
         }
 
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
     
 
+@router.post("/register-dataset")
+def register_dataset(request: RegisterDatasetRequest):
+    # Loads a file already on the server's disk: no body transfer, and the file
+    # is memory-mapped rather than read into a buffer first
+    try:
+        path = resolve_dataset_path(request.path)
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        fmt, _ = detect_format(path.name)
+        stat = path.stat()
+        projection = ",".join(request.columns or [])
+        # Re-registering an unchanged file reuses the loaded dataset
+        content_key = f"path:{path}:{stat.st_mtime_ns}:{stat.st_size}:{projection}"
+
+        def load() -> pd.DataFrame:
+            return read_dataset(path, path.name, columns=request.columns, memory_map=True)
+
+        session_id, cached = session_manager.create_session_for_content(
+            content_key, load, typed=fmt in TYPED_FORMATS
+        )
+        dataset_manager = session_manager.get_dataset_manager(session_id)
+        job_manager.warm_profile(dataset_manager)
+
+        return {
+            "session_id": session_id,
+            "schema": dataset_manager.get_schema(include_stats=request.stats),
+            "cached": cached,
+        }
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading dataset: {str(e)}")
+
+
+@router.post("/join")
+def join_sessions(request: JoinRequest):
+    # Joins two sessions' datasets into a new derived session
+    sides = []
+    for session_id, on, columns in (
+        (request.left_session_id, request.left_on, request.left_columns),
+        (request.right_session_id, request.right_on or request.left_on, request.right_columns),
+    ):
+        _partial_session(session_id, allow_partial=False)
+        try:
+            dataset_manager = session_manager.get_dataset_manager(session_id)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        try:
+            resolver = dataset_manager.get_column_resolver()
+            # Published versions are never mutated, so the frame stays valid
+            # after the lookup even if the session is refreshed meanwhile
+            sides.append((
+                dataset_manager.get_dataframe(),
+                resolver.resolve_many(on),
+                resolver.resolve_many(columns) if columns else None,
+            ))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    (left_df, left_on, left_columns), (right_df, right_on, right_columns) = sides
+    try:
+        with span("join"):
+            result = hash_join(
+                left_df, right_df, left_on, right_on,
+                how=request.how.lower(),
+                left_columns=left_columns,
+                right_columns=right_columns,
+            )
+        session_id = session_manager.create_session_from_dataframe(result.frame, typed=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    dataset_manager = session_manager.get_dataset_manager(session_id)
+    job_manager.warm_profile(dataset_manager)
+
+    return {
+        "session_id": session_id,
+        "rows": len(result.frame),
+        "matched_rows": result.matched_rows,
+        "build_side": result.build_side,
+        "schema": dataset_manager.get_schema(),
+        "memory": {
+            "join_result_bytes": result.result_bytes,
+            "session_bytes": dataset_manager.memory_usage_bytes(),
+        },
+    }
+
+
+@router.get('/jobs/{job_id}')
+def job_status(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return job.to_dict()
+
+
+@router.delete('/sessions/{session_id}')
+def delete_session(session_id: str):
+    if session_id == session_manager.default_session_id:
+        raise HTTPException(status_code=400, detail="The default session cannot be deleted.")
+    try:
+        session_manager.delete_session(session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"deleted": session_id}
+
 @router.get('/dataset-schema/{session_id}')
-def dataset_schema_by_session(session_id:str):
-    schema =  session_manager.get_dataset_manager(session_id).get_schema()
+def dataset_schema_by_session(session_id:str, response: Response, stats: bool = True, if_none_match: Optional[str] = Header(None)):
+    # Published DatasetManagers never change, so schema and version agree
+    session_dm = session_manager.get_dataset_manager(session_id)
+    etag = make_etag("schema", session_dm.version, stats)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, "/dataset-schema")
+    schema = session_dm.get_schema(include_stats=stats)
+    response.headers["ETag"] = etag
     return schema
 
+# A plain def: run_agent blocks on LLM calls, retry backoff and hedge waits,
+# so FastAPI runs it in its threadpool instead of on the event loop
 @router.post("/chat")
-async def chat_endpoint(request: ChatRequest):
+def chat_endpoint(
+    request: ChatRequest,
+    profile: bool = False,
+    x_profile: Optional[str] = Header(None),
+    x_admin_token: Optional[str] = Header(None),
+):
+
+    timings = start_request_timings() if request.include_timings else None
+    profiling = _profiling_requested(profile, x_profile, x_admin_token)
+    partial = _partial_session(request.session_id, request.allow_partial)
 
     try:
         # Pass session_id through so tools operate on the correct dataset
-        result = run_agent(request.query, request.session_id)
+        with profile_store.profile("/chat") if profiling else nullcontext() as profile_entry:
+            with span("request.chat"):
+                result = run_agent(request.query, request.session_id, request.conversation_id)
         
         # Extract LLM response text
         response_text = result["response"].content if hasattr(result["response"], 'content') else str(result["response"])
@@ -76,7 +355,6 @@ async def chat_endpoint(request: ChatRequest):
         data = None
         
         if tool_result:
-            import json
             try:
                 # If tool_result is already a dict, use it directly
                 if isinstance(tool_result, dict):
@@ -90,12 +368,151 @@ async def chat_endpoint(request: ChatRequest):
             except Exception as e:
                 pass
 
-        return {
+        metrics.inc("requests_total", endpoint="/chat", outcome="ok")
+        response = {
             "success": True,
             "response": response_text,
             "chart": chart,
-            "data": data
+            "data": data,
+            "conversation_id": result["conversation_id"],
+            "resolved_locally": result.get("resolved_locally", False),
+        }
+        if partial:
+            response["partial"] = True
+        if timings is not None:
+            response["timings"] = timings
+        if profiling:
+            response["profile_id"] = profile_entry["id"]
+        return response
+
+    except Exception as e:
+        metrics.inc("requests_total", endpoint="/chat", outcome="error")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/sql")
+def sql_endpoint(request: SQLRequest):
+    if request.format not in ("json", "arrow"):
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'arrow'.")
+
+    table_sessions = {DEFAULT_TABLE: request.session_id, **(request.tables or {})}
+    partial = False
+    frames = {}
+    for name, session_id in table_sessions.items():
+        partial = _partial_session(session_id, request.allow_partial) or partial
+        try:
+            # Registered as-is: the engine scans the session's frame in place
+            frames[name] = session_manager.get_dataset_manager(session_id).get_dataframe()
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    max_rows = settings.SQL_MAX_ROWS
+    if request.max_rows is not None:
+        max_rows = max(0, min(request.max_rows, max_rows))
+
+    try:
+        with span("request.sql"):
+            result = run_sql(request.query, frames, max_rows=max_rows)
+    except TimeoutError as e:
+        metrics.inc("requests_total", endpoint="/sql", outcome="error")
+        raise HTTPException(status_code=408, detail=str(e))
+    except ValueError as e:
+        metrics.inc("requests_total", endpoint="/sql", outcome="error")
+        raise HTTPException(status_code=400, detail=str(e))
+    metrics.inc("requests_total", endpoint="/sql", outcome="ok")
+
+    if request.format == "arrow":
+        return Response(
+            content=result.to_ipc(),
+            media_type="application/vnd.apache.arrow.stream",
+            headers={
+                "X-Row-Count": str(result.table.num_rows),
+                "X-Truncated": str(result.truncated).lower(),
+            },
+        )
+
+    response = {
+        "columns": result.table.column_names,
+        "rows": result.to_records(),
+        "row_count": result.table.num_rows,
+        "truncated": result.truncated,
+        "elapsed_ms": result.elapsed_ms,
+    }
+    if partial:
+        response["partial"] = True
+    return response
+
+
+@router.post("/query")
+def query_endpoint(
+    request: QueryRequest,
+    http_response: Response,
+    profile: bool = False,
+    x_profile: Optional[str] = Header(None),
+    x_admin_token: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
+
+    timings = start_request_timings() if request.include_timings else None
+    profiling = _profiling_requested(profile, x_profile, x_admin_token)
+    partial = _partial_session(request.session_id, request.allow_partial)
+
+    # Runs a structured intent directly through the orchestrator, skipping the LLM
+    try:
+        # The response is determined by the result cache key (dataset version
+        # and normalized intent), so a repeat is answered before anything runs
+        etag = None
+        if timings is None and not profiling:
+            version = session_manager.get_dataset_manager(request.session_id).version
+            etag = make_etag("query", *result_cache.key(version, request.intent), partial)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag, "/query")
+
+        with profile_store.profile("/query") if profiling else nullcontext() as profile_entry:
+            with span("request.query"):
+                result = orchestrator.execute(request.session_id, request.intent)
+
+        metrics.inc("requests_total", endpoint="/query", outcome="ok")
+        response = {
+            "success": True,
+            "response": result["text_response"],
+            "chart": result["chart"],
+            "data": result["data"]
         }
+        if partial:
+            response["partial"] = True
+        if timings is not None:
+            response["timings"] = timings
+        if profiling:
+            response["profile_id"] = profile_entry["id"]
+        # Only tag the result if no new version was published while it ran
+        if etag is not None and session_manager.get_dataset_manager(request.session_id).version == version:
+            http_response.headers["ETag"] = etag
+        return response
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        metrics.inc("requests_total", endpoint="/query", outcome="error")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/admin/profiles")
+def list_profiles(x_admin_token: Optional[str] = Header(None)):
+    _require_admin(x_admin_token)
+    return profile_store.list_profiles()
+
+
+@router.get("/admin/profiles/{profile_id}")
+def download_profile(profile_id: str, format: str = "text", x_admin_token: Optional[str] = Header(None)):
+    _require_admin(x_admin_token)
+
+    entry = profile_store.get(profile_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Profile '{profile_id}' not found.")
+
+    if format == "pstats":
+        return Response(
+            content=entry["pstats"],
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.pstats"'},
+        )
+    return PlainTextResponse(entry["report"])
@@ -1,13 +1,119 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import List, Optional
 
 class Settings(BaseSettings):
     APP_NAME: str = "Data Dreamer"
     DATA_DIR: Path = Path(__file__).resolve().parent / "data"
 
     TITANIC_DATASET: str =  "titanic.csv"
-    GROQ_API_KEY: str
-    GEMINI_API_KEY: str
+
+    # LLM provider: "groq", "gemini" or "stub" (deterministic, offline).
+    # Only the selected provider's API key is required.
+    LLM_PROVIDER: str = "groq"
+    GROQ_API_KEY: Optional[str] = None
+    GEMINI_API_KEY: Optional[str] = None
+    # Override for the Groq API endpoint (e.g. a proxy or a local mock server)
+    GROQ_BASE_URL: Optional[str] = None
+
+    # LLM gateway: optional second provider for hedging/failover, hedge delay
+    # (0 = only fail over on errors), 429 retries, timeouts (LLM_TIMEOUT_S also
+    # caps each retry wait), and the per-worker limits on concurrent calls and
+    # pooled keep-alive connections
+    LLM_FALLBACK_PROVIDER: Optional[str] = None
+    LLM_HEDGE_AFTER_MS: float = 4000.0
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BACKOFF_MS: float = 500.0
+    LLM_TIMEOUT_S: float = 30.0
+    LLM_CONNECT_TIMEOUT_S: float = 5.0
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_POOL_CONNECTIONS: int = 20
+
+    # Wider datasets only send the most relevant columns (per question) to
+    # the intent prompt
+    PROMPT_MAX_COLUMNS: int = 40
+
+    # Tool calls returned in one LLM turn run concurrently, at most this many
+    # at a time (1 runs them sequentially)
+    AGENT_TOOL_PARALLELISM: int = 4
+
+    # Tool results are sent back to the LLM as a digest of at most this many
+    # estimated tokens, listing up to TOOL_SUMMARY_TOP_K entries
+    TOOL_SUMMARY_TOKEN_BUDGET: int = 300
+    TOOL_SUMMARY_TOP_K: int = 10
+
+    # Orchestrator results cached per (dataset version, normalized intent)
+    RESULT_CACHE_SIZE: int = 256
+
+    # Pre-warm the result cache for the default Titanic session at startup
+    # with its likely intents (charts per column, common analytics). Results
+    # are saved to RESULT_CACHE_PREWARM_PATH and reloaded on restart while the
+    # dataset file is unchanged.
+    RESULT_CACHE_PREWARM: bool = False
+    RESULT_CACHE_PREWARM_PATH: Path = Path(__file__).resolve().parent / "data" / ".cache" / "titanic_default.json.zst"
+
+    # Server-side chat memory: turns kept per conversation, the token budget
+    # for history replayed to the LLM, and how many conversations are kept
+    CONVERSATION_MAX_TURNS: int = 10
+    CONVERSATION_TOKEN_BUDGET: int = 1000
+    CONVERSATION_MAX_COUNT: int = 1000
+
+    # Simulated per-call latency for the stub provider
+    STUB_LLM_LATENCY_MS: float = 0.0
+    STUB_LLM_JITTER_MS: float = 0.0
+    STUB_LLM_SEED: int = 0
+
+    # Opt-in request profiling (X-Profile header / ?profile=1). Profiling and
+    # the /admin endpoints require ADMIN_TOKEN in the X-Admin-Token header;
+    # while no token is configured they are disabled.
+    ADMIN_TOKEN: Optional[str] = None
+    PROFILE_MAX_STORED: int = 20
+    PROFILE_REPORT_LINES: int = 80
+
+    # Uploads are read (and hashed) in chunks of this size
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024
+
+    # Directories /register-dataset may load files from (JSON list in the
+    # environment). Empty means DATA_DIR only.
+    DATASET_ROOTS: List[Path] = []
+
+    # Background ingestion (/upload-dataset with background=true): worker
+    # threads, rows parsed per chunk, and rows loaded before the first partial
+    # snapshot is published (the threshold doubles after each snapshot).
+    INGEST_WORKERS: int = 2
+    INGEST_CHUNK_ROWS: int = 100_000
+    INGEST_SNAPSHOT_ROWS: int = 100_000
+    INGEST_MAX_JOBS: int = 100
+
+    # Threads for background cache warming (column stats, result pre-warm).
+    # Kept apart from the ingestion pool so warming never delays an upload.
+    WARM_WORKERS: int = 1
+
+    # After a dataset is loaded, compute per-column stats (null counts,
+    # cardinality) on the warming pool instead of waiting for first use
+    SCHEMA_STATS_BACKGROUND: bool = True
+
+    # /join refuses results larger than this many rows (many-to-many keys
+    # can multiply row counts) before materializing anything
+    JOIN_MAX_ROWS: int = 20_000_000
+
+    # Build chart JSON from precompiled Plotly Express templates instead of
+    # building and validating a figure per chart (same JSON either way)
+    CHART_TEMPLATES: bool = True
+
+    # Response compression: JSON and text bodies of at least COMPRESS_MIN_BYTES
+    # are sent zstd- or gzip-encoded, whichever the client prefers
+    COMPRESSION: bool = True
+    COMPRESS_MIN_BYTES: int = 1024
+    COMPRESS_ZSTD_LEVEL: int = 3
+    COMPRESS_GZIP_LEVEL: int = 6
+
+    # SQL mode (/sql and the "sql" intent): rows returned per query, query
+    # time limit, and the embedded engine's threads and memory cap per query
+    SQL_MAX_ROWS: int = 10_000
+    SQL_TIMEOUT_S: float = 10.0
+    SQL_THREADS: int = 2
+    SQL_MEMORY_LIMIT: str = "1GB"
 
     class Config:
         env_file = ".env"
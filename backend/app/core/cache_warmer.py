@@ -0,0 +1,130 @@
+import copy
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import zstandard
+
+from app.config import settings
+from app.core.orchestrator import orchestrator
+from app.core.result_cache import result_cache
+from app.core.session_manager import session_manager
+
+# Bump when the shape of orchestrator results changes, so files written by
+# an older build are recomputed instead of served
+PREWARM_FORMAT = 1
+
+# Single-column charts enumerated for every eligible column
+CHART_TYPES = ("histogram", "bar_chart", "pie_chart", "area_chart")
+
+# Non-numeric columns with more distinct values than this (names, tickets)
+# are not charted or grouped by
+MAX_CATEGORIES = 20
+
+
+def likely_intents(dataset_manager) -> List[Dict[str, Any]]:
+    """
+    The intents most questions on a dataset resolve to, in the shape the
+    intent parser produces them: every chart type per eligible column,
+    counts, percentages and missing-value shares, numeric summaries, and
+    counts/means grouped by each low-cardinality column.
+    """
+    schema = dataset_manager.get_schema()
+    profile = dataset_manager.get_column_profile()
+    columns = [c["name"] for c in schema["columns"]]
+    numeric = [c for c in columns if profile.is_numeric(c)]
+    categories = [c for c in columns if profile.cardinality(c) <= MAX_CATEGORIES]
+    eligible = [c for c in columns if c in numeric or c in categories]
+
+    intents = []
+    for column in eligible:
+        for chart in CHART_TYPES:
+            intents.append({"intent": "visualization", "chart_type": chart, "columns": [column]})
+        intents.append({"intent": "analytics", "operation": "count", "columns": [column]})
+    for column in categories:
+        intents.append({"intent": "analytics", "operation": "percentage", "columns": [column]})
+    for column in columns:
+        intents.append({"intent": "analytics", "operation": "percentage", "columns": [column], "value": "missing"})
+    for column in numeric:
+        for operation in ("mean", "median", "std"):
+            intents.append({"intent": "analytics", "operation": operation, "columns": [column]})
+    intents.append({"intent": "analytics", "operation": "describe"})
+    intents.append({"intent": "analytics", "operation": "correlation"})
+    for group in categories:
+        intents.append({"intent": "aggregation", "operation": "count", "columns": [group], "group_by": group})
+        for column in numeric:
+            if column != group:
+                intents.append({"intent": "aggregation", "operation": "mean", "columns": [column], "group_by": group})
+    return intents
+
+
+def prewarm(session_id: str, path: Optional[Path] = None) -> Dict[str, int]:
+    """
+    Pin results for a session's likely intents in the result cache.
+
+    Results saved at `path` for the same dataset version are loaded as they
+    are; otherwise every intent is run through the orchestrator once and
+    the results are saved for the next start. Intents that fail (e.g. an
+    operation that does not apply to a column) are skipped.
+    """
+    path = Path(path or settings.RESULT_CACHE_PREWARM_PATH)
+    dataset_manager = session_manager.current(session_id)
+    version = dataset_manager.version
+    intents = likely_intents(dataset_manager)
+
+    saved = load_results(path, version)
+    if saved is not None:
+        for intent_key, result in saved.items():
+            result_cache.pin((version, intent_key), result)
+        return {"loaded": len(saved), "computed": 0, "skipped": 0}
+
+    computed, skipped = {}, 0
+    for intent in intents:
+        key = result_cache.key(version, intent)
+        try:
+            # Handlers correct the intent in place; the key is taken first
+            result = orchestrator.execute(session_id, copy.deepcopy(intent))
+        except Exception:
+            skipped += 1
+            continue
+        result_cache.pin(key, result)
+        computed[key[1]] = result
+
+    save_results(path, version, computed)
+    return {"loaded": 0, "computed": len(computed), "skipped": skipped}
+
+
+def load_results(path: Path, version: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Saved results by normalized intent, or None if missing or for another version."""
+    try:
+        with open(path, "rb") as f:
+            payload = json.loads(zstandard.ZstdDecompressor().decompress(f.read()))
+    except (OSError, ValueError, zstandard.ZstdError):
+        return None
+    if payload.get("format") != PREWARM_FORMAT or payload.get("version") != version:
+        return None
+    return payload["results"]
+
+
+def save_results(path: Path, version: str, results: Dict[str, Dict[str, Any]]):
+    payload = json.dumps(
+        {"format": PREWARM_FORMAT, "version": version, "results": results},
+        default=_to_builtin,
+    ).encode()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Written next to the target and renamed, so a reader never sees half a file
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(zstandard.ZstdCompressor(level=10).compress(payload))
+    os.replace(tmp_path, path)
+
+
+def _to_builtin(value):
+    # NumPy scalars and arrays left in results by the tools
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,98 @@
+from typing import Dict, List, Set
+
+import pandas as pd
+from rapidfuzz import fuzz, process
+
+from app.core.column_resolver import _compact, _tokens, normalize_name
+
+# Question words that say nothing about which column is meant
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "by", "chart", "count", "distribution", "for",
+    "how", "in", "is", "many", "me", "mean", "of", "on", "or", "percentage",
+    "plot", "show", "the", "to", "was", "were", "what", "which", "with",
+}
+
+
+class ColumnIndex:
+    """
+    Per-session retrieval index used to keep the intent prompt small.
+
+    Built once per dataset from column names and a sample of each text
+    column's values. `top_columns` scores columns against the question
+    (name tokens, compact names, fuzzy token matches, then values) and
+    returns the k best, so wide datasets send only relevant columns to the
+    LLM.
+    """
+
+    VALUE_SAMPLE_ROWS = 1000
+    MAX_VALUES_PER_COLUMN = 50
+    FUZZY_CUTOFF = 85
+
+    def __init__(self, df: pd.DataFrame):
+        self.columns: List[str] = list(df.columns)
+        self._position = {col: i for i, col in enumerate(self.columns)}
+        self._compact_names: Dict[str, str] = {}
+        self._name_index: Dict[str, Set[str]] = {}
+        self._value_index: Dict[str, Set[str]] = {}
+
+        for col in self.columns:
+            normalized = normalize_name(col)
+            self._compact_names[col] = _compact(normalized)
+            for token in _tokens(normalized):
+                self._name_index.setdefault(token, set()).add(col)
+
+        sample = df.head(self.VALUE_SAMPLE_ROWS)
+        for col in self.columns:
+            if pd.api.types.is_numeric_dtype(sample[col]):
+                continue
+            values = pd.unique(sample[col].dropna())[: self.MAX_VALUES_PER_COLUMN]
+            for value in values:
+                for token in _tokens(str(value).lower()):
+                    if token not in STOPWORDS:
+                        self._value_index.setdefault(token, set()).add(col)
+
+        self._vocabulary = list(self._name_index)
+
+    def score(self, question: str) -> Dict[str, float]:
+        text = question.lower()
+        compact_question = _compact(text)
+        scores: Dict[str, float] = {}
+
+        def add(columns, weight):
+            for col in columns:
+                scores[col] = scores.get(col, 0.0) + weight
+
+        # Whole names, including multi-word ones written without separators
+        add((col for col, name in self._compact_names.items()
+             if len(name) >= 3 and name in compact_question), 3.0)
+
+        for token in _tokens(text):
+            if token in STOPWORDS or len(token) < 2:
+                continue
+            if token in self._name_index:
+                add(self._name_index[token], 2.0)
+            elif len(token) >= 4:
+                # Typos and plurals ("tickets" → ticket, "survivd" → survived)
+                for match, similarity, _ in process.extract(
+                    token, self._vocabulary, scorer=fuzz.ratio,
+                    score_cutoff=self.FUZZY_CUTOFF, limit=3,
+                ):
+                    add(self._name_index[match], similarity / 100)
+            if token in self._value_index:
+                add(self._value_index[token], 1.0)
+
+        return scores
+
+    def top_columns(self, question: str, k: int) -> List[str]:
+        """The k most relevant columns, in dataset order; padded with leading columns when few match."""
+        if len(self.columns) <= k:
+            return list(self.columns)
+
+        scores = self.score(question)
+        ranked = sorted(scores, key=lambda col: (-scores[col], self._position[col]))
+        selected = set(ranked[:k])
+        for col in self.columns:
+            if len(selected) >= k:
+                break
+            selected.add(col)
+        return [col for col in self.columns if col in selected]
@@ -0,0 +1,304 @@
+import threading
+import warnings
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class ColumnStats:
+    dtype_class: str  # "numeric", "datetime" or "categorical"
+    cardinality: int
+    cardinality_exact: bool
+    null_count: int
+
+
+SUMMARY_FIELDS = ["count", "mean", "std", "var", "min", "25%", "50%", "75%", "max"]
+
+
+def _dtype_class(dtype) -> str:
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "numeric"
+    return "categorical"
+
+
+class ColumnProfile:
+    """
+    Per-session column statistics used by the validator and analytics.
+
+    Tiered: dtype classes come straight from the frame's dtypes when the
+    dataset is loaded, while null counts and cardinalities are computed the
+    first time a column is asked about (or by `warm`) and memoized, so wide
+    datasets don't pay for a full profile before the first response.
+    On large frames the cardinality is estimated from a fixed-size sample,
+    which is enough to tell a handful of categories from a high-cardinality
+    column.
+    """
+
+    SAMPLE_ROWS = 100_000
+    DESCRIBE_QUANTILES = (0.25, 0.5, 0.75)
+    # Row chunk size for correlations, in bytes of float64 block
+    CORRELATION_CHUNK_BYTES = 32 << 20
+
+    def __init__(self, df: pd.DataFrame):
+        self._lock = threading.Lock()
+        self.refresh(df)
+
+    def refresh(self, df: pd.DataFrame):
+        # Called whenever the session's dataset changes
+        self._df = df
+        self.dtype_classes: Dict[str, str] = {
+            col: _dtype_class(dtype) for col, dtype in df.dtypes.items()
+        }
+        self._null_counts: Dict[str, int] = {}
+        self._cardinalities: Dict[str, Tuple[int, bool]] = {}
+        self._sample_positions: Optional[np.ndarray] = None
+        # Numeric summaries, computed over the whole numeric block at once
+        # Numeric statistics, cached per column (and per q / column pair)
+        self._summaries: Dict[str, Dict[str, float]] = {}
+        self._quantiles: Dict[Tuple[str, float], float] = {}
+        self._variances: Dict[str, float] = {}
+        self._correlations: Dict[Tuple[str, str], float] = {}
+
+    def _check(self, column: str):
+        if column not in self.dtype_classes:
+            raise ValueError(f"Column '{column}' not found in DataFrame.")
+
+    def _sample(self, column: str) -> Tuple[pd.Series, bool]:
+        series = self._df[column]
+        if len(series) <= self.SAMPLE_ROWS:
+            return series, True
+        # Same rows for every column, drawn once per dataset
+        if self._sample_positions is None:
+            rng = np.random.default_rng(0)
+            self._sample_positions = np.sort(rng.choice(len(series), self.SAMPLE_ROWS, replace=False))
+        return series.iloc[self._sample_positions], False
+
+    def get(self, column: str) -> ColumnStats:
+        self._check(column)
+        cardinality, exact = self._cardinality(column)
+        return ColumnStats(
+            dtype_class=self.dtype_classes[column],
+            cardinality=cardinality,
+            cardinality_exact=exact,
+            null_count=self.null_count(column),
+        )
+
+    def is_numeric(self, column: str) -> bool:
+        self._check(column)
+        return self.dtype_classes[column] == "numeric"
+
+    def is_datetime(self, column: str) -> bool:
+        self._check(column)
+        return self.dtype_classes[column] == "datetime"
+
+    def _cardinality(self, column: str) -> Tuple[int, bool]:
+        cached = self._cardinalities.get(column)
+        if cached is None:
+            sample, exact = self._sample(column)
+            cached = (int(sample.nunique()), exact)
+            with self._lock:
+                self._cardinalities[column] = cached
+        return cached
+
+    def cardinality(self, column: str) -> int:
+        self._check(column)
+        return self._cardinality(column)[0]
+
+    def null_count(self, column: str) -> int:
+        self._check(column)
+        cached = self._null_counts.get(column)
+        if cached is None:
+            cached = int(self._df[column].isna().sum())
+            with self._lock:
+                self._null_counts[column] = cached
+        return cached
+
+    def null_counts(self, columns: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Null counts for several columns; the missing ones are computed in one pass."""
+        columns = list(self.dtype_classes) if columns is None else list(columns)
+        for column in columns:
+            self._check(column)
+        missing = [c for c in columns if c not in self._null_counts]
+        if missing:
+            computed = self._df[missing].isna().sum()
+            with self._lock:
+                for column in missing:
+                    self._null_counts[column] = int(computed[column])
+        return {c: self._null_counts[c] for c in columns}
+
+    def warm(self):
+        """Compute every column's stats up front (run in the background after a load)."""
+        self.null_counts()
+        for column in self.dtype_classes:
+            self._cardinality(column)
+
+    def is_warm(self) -> bool:
+        return len(self._null_counts) == len(self._cardinalities) == len(self.dtype_classes)
+
+    # Numeric statistics. Each is computed per requested column from that
+    # column's own array (converted to float64 only when it is not already)
+    # and cached per column, so asking about one column never materializes
+    # the others. Correlations are accumulated over row chunks.
+
+    def numeric_columns(self) -> List[str]:
+        return [c for c, kind in self.dtype_classes.items() if kind == "numeric"]
+
+    def _values(self, column: str, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        # A view for float64 columns; only the requested rows are converted otherwise
+        series = self._df[column]
+        if start or stop is not None:
+            series = series.iloc[start:stop]
+        if series.dtype == np.float64:
+            return series.to_numpy()
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def _valid_values(self, column: str) -> np.ndarray:
+        values = self._values(column)
+        return values[~np.isnan(values)]
+
+    def _numeric_names(self, columns: Optional[Iterable[str]]) -> List[str]:
+        if columns is None:
+            return self.numeric_columns()
+        columns = list(columns)
+        self._require_numeric(columns)
+        return columns
+
+    def _summarize(self, column: str) -> Dict[str, float]:
+        valid = self._valid_values(column)
+        count = int(valid.size)
+        nan = float("nan")
+        if count:
+            quartiles = np.quantile(valid, self.DESCRIBE_QUANTILES)
+            var = float(valid.var(ddof=1)) if count > 1 else nan
+            stats = {"count": count, "mean": float(valid.mean()), "std": float(np.sqrt(var)), "var": var,
+                     "min": float(valid.min())}
+        else:
+            quartiles = [nan] * len(self.DESCRIBE_QUANTILES)
+            stats = {"count": 0, "mean": nan, "std": nan, "var": nan, "min": nan}
+        for q, value in zip(self.DESCRIBE_QUANTILES, quartiles):
+            stats[f"{q:.0%}"] = float(value)
+        stats["max"] = float(valid.max()) if count else nan
+
+        with self._lock:
+            self._summaries[column] = stats
+            for q, value in zip(self.DESCRIBE_QUANTILES, quartiles):
+                self._quantiles.setdefault((column, q), float(value))
+        return stats
+
+    def numeric_summary(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """count/mean/std/var/min/quartiles/max per numeric column (columns as rows)."""
+        names = self._numeric_names(columns)
+        rows = [self._summaries.get(c) or self._summarize(c) for c in names]
+        summary = pd.DataFrame(rows, index=names, columns=SUMMARY_FIELDS)
+        return summary.astype({"count": "int64"})
+
+    def variance(self, column: str) -> float:
+        """Sample variance of one numeric column."""
+        self._require_numeric([column])
+        cached = self._variances.get(column)
+        if cached is None:
+            summary = self._summaries.get(column)
+            if summary is not None:
+                cached = summary["var"]
+            else:
+                valid = self._valid_values(column)
+                cached = float(valid.var(ddof=1)) if valid.size > 1 else float("nan")
+            with self._lock:
+                self._variances[column] = cached
+        return cached
+
+    def quantiles(self, qs: Sequence[float], columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Quantiles per numeric column (columns as rows, one column per q)."""
+        names = self._numeric_names(columns)
+        for column in names:
+            missing = [q for q in qs if (column, q) not in self._quantiles]
+            if not missing:
+                continue
+            valid = self._valid_values(column)
+            values = np.quantile(valid, missing) if valid.size else [float("nan")] * len(missing)
+            with self._lock:
+                for q, value in zip(missing, values):
+                    self._quantiles[(column, q)] = float(value)
+
+        return pd.DataFrame(
+            [[self._quantiles[(column, q)] for q in qs] for column in names],
+            index=names, columns=list(qs),
+        )
+
+    def _mean(self, column: str) -> float:
+        summary = self._summaries.get(column)
+        if summary is not None:
+            return summary["mean"]
+        values = self._values(column)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return float(np.nanmean(values)) if len(values) else float("nan")
+
+    def correlation(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Pearson correlation matrix across numeric columns, using the rows
+        where both columns are present (like DataFrame.corr). Pairwise sums
+        come from matrix products over row chunks of about
+        CORRELATION_CHUNK_BYTES, so memory does not grow with the row count.
+        Columns are centered on their means first: the sum-of-products
+        formulas cancel catastrophically on values with a large offset
+        (e.g. 1e8 + noise).
+        """
+        names = list(dict.fromkeys(self._numeric_names(columns)))
+        if any((a, b) not in self._correlations for a in names for b in names):
+            corr = self._correlation_matrix(names)
+            with self._lock:
+                for i, a in enumerate(names):
+                    for j, b in enumerate(names):
+                        self._correlations[(a, b)] = float(corr[i, j])
+
+        return pd.DataFrame(
+            [[self._correlations[(a, b)] for b in names] for a in names],
+            index=names, columns=names,
+        )
+
+    def _correlation_matrix(self, names: List[str]) -> np.ndarray:
+        k = len(names)
+        means = np.nan_to_num(np.array([self._mean(c) for c in names]))
+        n = np.zeros((k, k))
+        sum_x = np.zeros((k, k))
+        sum_xx = np.zeros((k, k))
+        sum_xy = np.zeros((k, k))
+
+        rows = len(self._df)
+        step = max(1, self.CORRELATION_CHUNK_BYTES // (8 * max(k, 1)))
+        chunk = np.empty((min(step, rows), k), dtype=np.float64, order="F")
+        for start in range(0, rows, step):
+            stop = min(start + step, rows)
+            block = chunk[: stop - start]
+            for i, column in enumerate(names):
+                block[:, i] = self._values(column, start, stop)
+            present = ~np.isnan(block)
+            values = np.where(present, block - means, 0.0)
+            present = present.astype(np.float64)
+
+            # Pairwise sums over the rows where both columns are present
+            n += present.T @ present
+            sum_x += values.T @ present
+            sum_xx += (values * values).T @ present
+            sum_xy += values.T @ values
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = sum_xy - sum_x * sum_x.T / n
+            var_x = sum_xx - sum_x * sum_x / n
+            corr = cov / np.sqrt(var_x * var_x.T)
+        # Only absorbs rounding (|r| a few ulps above 1) on centered data
+        corr = np.clip(corr, -1.0, 1.0)
+        corr[n < 2] = np.nan
+        return corr
+
+    def _require_numeric(self, columns: Iterable[str]):
+        for column in columns:
+            if not self.is_numeric(column):
+                raise ValueError(f"Column '{column}' is not numeric.")
+
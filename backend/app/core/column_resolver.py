@@ -0,0 +1,83 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+from rapidfuzz import process
+
+
+def normalize_name(name) -> str:
+    # Mirrors preprocessing.normalize_columns so user input lines up with stored names
+    return str(name).strip().lower().replace(" ", "_")
+
+
+def _compact(name: str) -> str:
+    return re.sub(r"[^0-9a-z]", "", name)
+
+
+def _tokens(name: str) -> List[str]:
+    return [t for t in re.split(r"[^0-9a-z]+", name) if t]
+
+
+class ColumnResolver:
+    """
+    Per-session index used to map column references from the LLM or the user
+    onto the dataset's real column names.
+
+    Built once when a dataset is loaded. Lookups go exact name → compact alias
+    (separators stripped, so "Passenger ID" finds "passengerid") → fuzzy match
+    among columns sharing a token → fuzzy match over all columns. Every answer,
+    including misses, is memoized.
+    """
+
+    SCORE_CUTOFF = 70
+    MAX_MEMO_SIZE = 4096
+
+    def __init__(self, columns: Iterable):
+        self.columns: List[str] = list(columns)
+        self._exact: Dict[str, str] = {}
+        self._aliases: Dict[str, str] = {}
+        self._token_index: Dict[str, Set[str]] = {}
+        self._memo: Dict[str, Optional[str]] = {}
+
+        for col in self.columns:
+            normalized = normalize_name(col)
+            self._exact.setdefault(normalized, col)
+            self._aliases.setdefault(_compact(normalized), col)
+            for token in _tokens(normalized):
+                self._token_index.setdefault(token, set()).add(col)
+
+    def _lookup(self, name: str) -> Optional[str]:
+        if name in self._exact:
+            return self._exact[name]
+
+        alias = _compact(name)
+        if alias and alias in self._aliases:
+            return self._aliases[alias]
+
+        # Narrow the fuzzy search to columns that share a word with the query
+        candidates = set()
+        for token in _tokens(name):
+            candidates |= self._token_index.get(token, set())
+        if candidates:
+            match = process.extractOne(name, sorted(candidates), score_cutoff=self.SCORE_CUTOFF)
+            if match:
+                return match[0]
+
+        match = process.extractOne(name, self.columns, score_cutoff=self.SCORE_CUTOFF)
+        return match[0] if match else None
+
+    def resolve(self, column: str) -> str:
+        name = normalize_name(column)
+
+        if name not in self._memo:
+            if len(self._memo) >= self.MAX_MEMO_SIZE:
+                self._memo.clear()
+            self._memo[name] = self._lookup(name)
+
+        match = self._memo[name]
+        if match is None:
+            raise ValueError(f"Column '{name}' not found in DataFrame.")
+        return match
+
+    def resolve_many(self, columns: Iterable[str]) -> List[str]:
+        """Resolve every column referenced by an intent in one call."""
+        return [self.resolve(col) for col in columns]
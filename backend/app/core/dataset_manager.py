@@ -1,9 +1,16 @@
+import uuid
+from io import BytesIO
 import pandas as pd
+import xxhash
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
 from app.config import settings
 from app.utils.preprocessing import preprocess_data
+from app.core.column_resolver import ColumnResolver
+from app.core.column_profile import ColumnProfile
+from app.core.column_index import ColumnIndex
+from app.core.time_index import TimeIndex
 
 class DatasetManager:
 
@@ -11,46 +18,104 @@ class DatasetManager:
         self.raw_df = None
         self.analysis_df = None
         self.schema = None
+        self.column_resolver = None
+        self.column_profile = None
+        self.column_index = None
+        self._time_indexes = {}
+        self._memory_bytes = None
+        # Identifies this loaded dataset; changes publish a new DatasetManager
+        self.version = None
     
     def load_titanic_dataset(self):
         dataset_path =  Path(settings.DATA_DIR) / settings.TITANIC_DATASET
-        df = pd.read_csv(dataset_path)
-        self.raw_df = df.copy() 
+        # Versioned by file content, so the version (and results cached under
+        # it, including the pre-warmed ones on disk) survives restarts
+        content = dataset_path.read_bytes()
+        df = pd.read_csv(BytesIO(content))
+        self.load_dataframe(df, version=f"titanic:{xxhash.xxh3_128_hexdigest(content)}")
 
-        self.analysis_df = preprocess_data(df)
+    def load_dataframe(self, df: pd.DataFrame, version: Optional[str] = None, typed: bool = False):
+        """
+        Preprocess a raw DataFrame and build everything derived from it:
+        schema, plus the column resolver and column profile used by the
+        validator. Once published through SessionManager an instance is
+        treated as read-only; dataset changes publish a freshly loaded one.
+        `version` lets content-addressed loads use their content hash.
+        `typed` marks sources whose columns already carry real dtypes, so the
+        string-to-number conversion pass is skipped.
+        """
+        self.raw_df = df.copy()
+
+        self.analysis_df = preprocess_data(df.copy(), enforce=not typed)
         self.schema = self._generate_schema(self.analysis_df)
+        self.column_resolver = ColumnResolver(self.analysis_df.columns)
+        self.column_profile = ColumnProfile(self.analysis_df)
+        self.column_index = None
+        self._time_indexes = {}
+        self._memory_bytes = None
+        self.version = version or uuid.uuid4().hex
 
     def _generate_schema(self, df: pd.DataFrame) -> Dict[str, Any]:
-        
+        # Names and dtypes only, read from df.dtypes without touching the data.
+        # Per-column stats come from the column profile on demand.
         schema = {
             "columns": [],
             "numeric_columns":[],
             "categorical_columns":[],
-            "missing_values": {}
+            "datetime_columns":[],
         }
 
-        for col in df.columns:
-
-            dtype =  str(df[col].dtype)
+        for col, dtype in df.dtypes.items():
 
             schema['columns'].append({
                 "name": col,
-                "dtype": dtype
+                "dtype": str(dtype)
             })
 
-            if pd.api.types.is_numeric_dtype(df[col]):
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                schema['datetime_columns'].append(col)
+            elif pd.api.types.is_numeric_dtype(dtype):
                 schema['numeric_columns'].append(col)
             else:
                 schema['categorical_columns'].append(col)
-            
-            schema['missing_values'][col] = int(df[col].isna().sum())
         
         return schema
     
     def get_dataframe(self):
         return self.analysis_df
-    def get_schema(self):
-        return self.schema
+    def get_schema(self, include_stats: bool = False):
+        """
+        Names and dtypes are always available. `include_stats` adds per-column
+        missing value counts, computed once in the column profile.
+        """
+        if not include_stats or self.schema is None:
+            return self.schema
+        return {**self.schema, "missing_values": self.column_profile.null_counts()}
+    def get_column_resolver(self):
+        return self.column_resolver
+    def get_column_profile(self):
+        return self.column_profile
+    def get_column_index(self):
+        # Only needed for prompts, so built on the first question
+        if self.column_index is None and self.analysis_df is not None:
+            self.column_index = ColumnIndex(self.analysis_df)
+        return self.column_index
+    def get_time_index(self, column: str) -> TimeIndex:
+        # Sorted once per datetime column and reused by every time-series query
+        index = self._time_indexes.get(column)
+        if index is None:
+            index = self._time_indexes.setdefault(column, TimeIndex(self.analysis_df[column]))
+        return index
+
+    def memory_usage_bytes(self) -> int:
+        # Deep usage walks every string, so it is computed once per loaded dataset
+        if self._memory_bytes is None:
+            self._memory_bytes = int(sum(
+                frame.memory_usage(index=True, deep=True).sum()
+                for frame in (self.raw_df, self.analysis_df)
+                if frame is not None
+            ))
+        return self._memory_bytes
     
 dataset_manager = DatasetManager()
         
\ No newline at end of file
@@ -0,0 +1,227 @@
+import gzip
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from app.config import settings
+from app.core.column_resolver import normalize_name
+
+# Filename suffix → (format, compression). Longest suffixes are matched first.
+SUPPORTED_SUFFIXES = {
+    ".csv": ("csv", None),
+    ".csv.gz": ("csv", "gzip"),
+    ".csv.zst": ("csv", "zstd"),
+    ".parquet": ("parquet", None),
+    ".pq": ("parquet", None),
+    ".feather": ("feather", None),
+    ".arrow": ("feather", None),
+    ".jsonl": ("jsonl", None),
+    ".ndjson": ("jsonl", None),
+    ".jsonl.gz": ("jsonl", "gzip"),
+    ".jsonl.zst": ("jsonl", "zstd"),
+}
+
+# Formats that carry their own column types, so preprocessing can skip the
+# string-to-number conversion pass
+TYPED_FORMATS = {"parquet", "feather", "jsonl"}
+
+
+def detect_format(filename: str) -> Tuple[str, Optional[str]]:
+    """Return (format, compression) for a filename, or raise ValueError if unsupported."""
+    name = (filename or "").lower()
+    for suffix in sorted(SUPPORTED_SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix):
+            return SUPPORTED_SUFFIXES[suffix]
+    allowed = ", ".join(sorted(SUPPORTED_SUFFIXES))
+    raise ValueError(f"Unsupported file type '{filename}'. Allowed: {allowed}.")
+
+
+def allowed_roots() -> List[Path]:
+    roots = settings.DATASET_ROOTS or [settings.DATA_DIR]
+    return [Path(root).resolve() for root in roots]
+
+
+def resolve_dataset_path(path: str) -> Path:
+    """
+    Resolve a server-side dataset path. Relative paths are taken from the
+    first allowed root. Symlinks and '..' are resolved before the check, so
+    the result always lies inside one of the allowed roots.
+    """
+    roots = allowed_roots()
+    candidate = Path(path)
+    if not candidate.is_absolute():
+        candidate = roots[0] / candidate
+    resolved = candidate.resolve()
+
+    if not any(resolved.is_relative_to(root) for root in roots):
+        raise PermissionError(f"Path '{path}' is outside the allowed data directories.")
+    if not resolved.is_file():
+        raise FileNotFoundError(f"Dataset '{path}' does not exist.")
+    detect_format(resolved.name)
+    return resolved
+
+
+def parse_columns(columns: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated column list from a form field; empty means all columns."""
+    if not columns:
+        return None
+    names = [c.strip() for c in columns.split(",") if c.strip()]
+    return names or None
+
+
+def _project(available: List[str], columns: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    Map requested columns onto the file's own column names. A request may use
+    either the raw name or its normalized form (as shown in the schema).
+    """
+    if columns is None:
+        return None
+    by_normalized = {normalize_name(name): name for name in available}
+    selected = []
+    for column in columns:
+        if column in available:
+            selected.append(column)
+        elif normalize_name(column) in by_normalized:
+            selected.append(by_normalized[normalize_name(column)])
+        else:
+            raise ValueError(f"Column '{column}' not found in uploaded file.")
+    return list(dict.fromkeys(selected))
+
+
+def _is_path(source) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+@contextmanager
+def _decompressed(source: BinaryIO, compression: Optional[str]):
+    # Stream readers: the decompressed file is never held in memory as a whole
+    if _is_path(source):
+        with open(source, "rb") as raw, _decompressed(raw, compression) as stream:
+            yield stream
+    elif compression == "gzip":
+        with gzip.GzipFile(fileobj=source, mode="rb") as stream:
+            yield stream
+    elif compression == "zstd":
+        import zstandard
+        with zstandard.ZstdDecompressor().stream_reader(source, closefd=False) as stream:
+            yield stream
+    else:
+        yield source
+
+
+def _arrow_to_pandas(table) -> pd.DataFrame:
+    # split_blocks/self_destruct release Arrow buffers column by column as
+    # they are converted instead of holding both copies at once
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _read_parquet(source, columns: Optional[List[str]], memory_map: bool) -> pd.DataFrame:
+    import pyarrow.parquet as pq
+
+    if _is_path(source):
+        source = str(source)
+    parquet_file = pq.ParquetFile(source, memory_map=memory_map)
+    selected = _project(parquet_file.schema_arrow.names, columns)
+    return _arrow_to_pandas(parquet_file.read(columns=selected))
+
+
+def _read_feather(source, columns: Optional[List[str]], memory_map: bool) -> pd.DataFrame:
+    import pyarrow.feather as feather
+
+    if _is_path(source):
+        source = str(source)
+
+    # Uncompressed Feather V2 / Arrow IPC buffers are used without copying;
+    # selecting columns afterwards only drops references
+    table = feather.read_table(source, memory_map=memory_map)
+    selected = _project(table.column_names, columns)
+    if selected is not None:
+        table = table.select(selected)
+    return _arrow_to_pandas(table)
+
+
+def _usecols(columns: Optional[List[str]]):
+    # pandas usecols callable accepting raw or normalized names
+    if columns is None:
+        return None
+    wanted = set(columns) | {normalize_name(c) for c in columns}
+    return lambda name: name in wanted or normalize_name(name) in wanted
+
+
+def _read_csv(source, compression: Optional[str], columns: Optional[List[str]], memory_map: bool) -> pd.DataFrame:
+    usecols = _usecols(columns)
+
+    if _is_path(source) and compression is None:
+        df = pd.read_csv(source, encoding="utf-8", usecols=usecols, memory_map=memory_map)
+    else:
+        with _decompressed(source, compression) as stream:
+            df = pd.read_csv(stream, encoding="utf-8", usecols=usecols)
+
+    if columns is not None:
+        _project(list(df.columns), columns)
+    return df
+
+
+def _read_jsonl(source, compression: Optional[str], columns: Optional[List[str]]) -> pd.DataFrame:
+    with _decompressed(source, compression) as stream:
+        df = pd.read_json(stream, lines=True)
+    selected = _project(list(df.columns), columns)
+    return df[selected] if selected is not None else df
+
+
+def read_dataset(source, filename: str, columns: Optional[List[str]] = None, memory_map: bool = False) -> pd.DataFrame:
+    """
+    Read an uploaded or on-disk dataset into a DataFrame.
+
+    `source` is a binary file object or a path; the format comes from
+    `filename`. `columns` restricts the load to those columns (pushed down into
+    the Parquet/Feather/CSV readers). `memory_map` maps path sources instead of
+    reading them into memory first.
+    """
+    fmt, compression = detect_format(filename)
+
+    if fmt == "parquet":
+        return _read_parquet(source, columns, memory_map)
+    if fmt == "feather":
+        return _read_feather(source, columns, memory_map)
+    if fmt == "jsonl":
+        return _read_jsonl(source, compression, columns)
+    return _read_csv(source, compression, columns, memory_map)
+
+
+def iter_dataset(source, filename: str, columns: Optional[List[str]] = None, chunk_rows: int = 100_000) -> Iterator[pd.DataFrame]:
+    """
+    Like read_dataset, but yields the rows in chunks of about `chunk_rows` so
+    callers can report progress and publish partial results while parsing.
+    Feather files are read in one piece.
+    """
+    fmt, compression = detect_format(filename)
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(str(source) if _is_path(source) else source)
+        selected = _project(parquet_file.schema_arrow.names, columns)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=selected):
+            yield batch.to_pandas(split_blocks=True)
+
+    elif fmt == "feather":
+        yield _read_feather(source, columns, memory_map=False)
+
+    elif fmt == "jsonl":
+        with _decompressed(source, compression) as stream:
+            with pd.read_json(stream, lines=True, chunksize=chunk_rows) as reader:
+                for chunk in reader:
+                    selected = _project(list(chunk.columns), columns)
+                    yield chunk[selected] if selected is not None else chunk
+
+    else:
+        with _decompressed(source, compression) as stream:
+            with pd.read_csv(stream, encoding="utf-8", usecols=_usecols(columns), chunksize=chunk_rows) as reader:
+                for chunk in reader:
+                    if columns is not None:
+                        _project(list(chunk.columns), columns)
+                    yield chunk
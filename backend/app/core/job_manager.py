@@ -0,0 +1,170 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from app.config import settings
+from app.core.cache_warmer import prewarm
+from app.core.ingestion import TYPED_FORMATS, detect_format, iter_dataset
+from app.core.session_manager import session_manager
+
+
+class IngestionJob:
+    """Progress of one background ingestion, updated by the worker and polled via /jobs/{id}."""
+
+    def __init__(self, session_id: str, filename: str, total_bytes: int):
+        self.id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.filename = filename
+        self.status = "queued"  # queued → running → done | failed
+        self.stage = "queued"   # parsing → finalizing
+        self.total_bytes = total_bytes
+        self.bytes_read = 0
+        self.rows_parsed = 0
+        self.rows_published = 0
+        self.snapshots = 0
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "session_id": self.session_id,
+            "filename": self.filename,
+            "status": self.status,
+            "stage": self.stage,
+            "bytes_read": self.bytes_read,
+            "total_bytes": self.total_bytes,
+            "rows_parsed": self.rows_parsed,
+            "rows_published": self.rows_published,
+            "snapshots": self.snapshots,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    Runs dataset ingestion off the request path.
+
+    The upload request reserves a session and returns immediately; a worker
+    parses the file in chunks and publishes partial snapshots to the session
+    as it goes. Snapshot thresholds double each time, so re-building the
+    partial DatasetManager costs at most as much again as the final build.
+    Cache warming runs on its own smaller pool, so it never queues ahead of
+    an ingestion.
+    """
+
+    def __init__(self):
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_executor(self, pool: str = "ingest") -> ThreadPoolExecutor:
+        with self._lock:
+            executor = self._executors.get(pool)
+            if executor is None:
+                workers = settings.INGEST_WORKERS if pool == "ingest" else settings.WARM_WORKERS
+                executor = self._executors[pool] = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix=pool,
+                )
+            return executor
+
+    def submit_ingestion(self, source, filename: str, total_bytes: int, columns: Optional[List[str]] = None) -> IngestionJob:
+        """Reserve a session for `source` and ingest it in the background."""
+        detect_format(filename)
+        session_id = session_manager.reserve_session()
+        job = IngestionJob(session_id, filename, total_bytes)
+
+        with self._lock:
+            self._jobs[job.id] = job
+            # Forget the oldest finished jobs beyond the limit
+            for job_id in list(self._jobs):
+                if len(self._jobs) <= settings.INGEST_MAX_JOBS:
+                    break
+                if self._jobs[job_id].finished_at is not None:
+                    del self._jobs[job_id]
+
+        self._get_executor().submit(self._run, job, source, columns)
+        return job
+
+    def _run(self, job: IngestionJob, source, columns: Optional[List[str]]):
+        job.status = "running"
+        job.stage = "parsing"
+        fmt, _ = detect_format(job.filename)
+        typed = fmt in TYPED_FORMATS
+
+        try:
+            chunks = []
+            next_snapshot = settings.INGEST_SNAPSHOT_ROWS
+            for chunk in iter_dataset(source, job.filename, columns, settings.INGEST_CHUNK_ROWS):
+                chunks.append(chunk)
+                job.rows_parsed += len(chunk)
+                if hasattr(source, "tell"):
+                    job.bytes_read = min(source.tell(), job.total_bytes)
+
+                if job.rows_parsed >= next_snapshot:
+                    # Partial snapshot so allow_partial queries can start early
+                    session_manager.replace_session_data(job.session_id, pd.concat(chunks, ignore_index=True), typed=typed)
+                    job.rows_published = job.rows_parsed
+                    job.snapshots += 1
+                    next_snapshot = job.rows_parsed * 2
+
+            if job.rows_parsed == 0:
+                raise ValueError("Uploaded file is empty.")
+
+            job.stage = "finalizing"
+            job.bytes_read = job.total_bytes
+            df = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+            chunks = None
+            dataset_manager = session_manager.replace_session_data(job.session_id, df, typed=typed)
+            session_manager.finish_ingestion(job.session_id)
+            self.warm_profile(dataset_manager)
+            job.rows_published = job.rows_parsed
+            job.status = "done"
+            job.stage = "done"
+
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            # A half-ingested session is never left behind
+            try:
+                session_manager.delete_session(job.session_id)
+            except ValueError:
+                pass
+
+        finally:
+            job.finished_at = time.time()
+            if hasattr(source, "close"):
+                source.close()
+
+    def warm_profile(self, dataset_manager):
+        """Fill a freshly loaded dataset's column stats in the background."""
+        profile = dataset_manager.get_column_profile()
+        if settings.SCHEMA_STATS_BACKGROUND and profile is not None and not profile.is_warm():
+            self._get_executor("warm").submit(profile.warm)
+
+    def warm_results(self, session_id: str):
+        """Pre-warm a session's result cache in the background, when enabled."""
+        if settings.RESULT_CACHE_PREWARM:
+            self._get_executor("warm").submit(prewarm, session_id)
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self):
+        with self._lock:
+            executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+job_manager = JobManager()
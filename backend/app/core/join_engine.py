@@ -0,0 +1,157 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.core.metrics import span
+
+JOIN_TYPES = ("inner", "left")
+
+
+@dataclass
+class JoinResult:
+    frame: pd.DataFrame
+    build_side: str  # "left" or "right"
+    matched_rows: int
+    result_bytes: int
+
+
+def _factorize_keys(build: pd.DataFrame, probe: pd.DataFrame, build_on, probe_on) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Dense integer codes for the build side's key tuples, and the code of each
+    probe row's key (-1 when the key is not on the build side). Key columns
+    are factorized one at a time and folded into a single code, which is
+    re-factorized after each column so it never outgrows the build table.
+    Rows with a missing key never match, as in SQL.
+    """
+    build_codes = np.zeros(len(build), dtype=np.int64)
+    probe_codes = np.zeros(len(probe), dtype=np.int64)
+    size = 1
+    for build_col, probe_col in zip(build_on, probe_on):
+        codes, uniques = pd.factorize(build[build_col])
+        lookup = pd.Index(uniques).get_indexer(probe[probe_col])
+        build_codes = np.where((codes < 0) | (build_codes < 0), -1, build_codes * len(uniques) + codes)
+        probe_codes = np.where((lookup < 0) | (probe_codes < 0), -1, probe_codes * len(uniques) + lookup)
+
+        # Fold back to dense codes over the key tuples seen so far
+        codes, uniques = pd.factorize(build_codes)
+        folded = pd.Index(uniques).get_indexer(probe_codes)
+        build_codes = np.where(build_codes < 0, -1, codes)
+        probe_codes = np.where(probe_codes < 0, -1, folded)
+        size = len(uniques)
+    return build_codes, probe_codes, size
+
+
+def _check_key_types(left: pd.DataFrame, right: pd.DataFrame, left_on: Sequence[str], right_on: Sequence[str]):
+    for l, r in zip(left_on, right_on):
+        if pd.api.types.is_numeric_dtype(left[l]) != pd.api.types.is_numeric_dtype(right[r]):
+            raise ValueError(f"Join keys '{l}' and '{r}' have incompatible types ({left[l].dtype} vs {right[r].dtype}).")
+
+
+def _match(build: pd.DataFrame, probe: pd.DataFrame, build_on, probe_on) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Matching (build row, probe row) position pairs.
+
+    The build side's keys are factorized into dense codes and its rows are
+    grouped per code with a counting sort, giving each key a contiguous slot
+    range. Probe keys are looked up in the factorized uniques (a hash
+    lookup), and every match is expanded with vectorized repeats.
+    """
+    with span("join.factorize"):
+        codes, probe_codes, size = _factorize_keys(build, probe, build_on, probe_on)
+
+    with span("join.build"):
+        counts = np.bincount(codes[codes >= 0], minlength=size)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        order = np.argsort(codes, kind="stable")[len(codes) - int((codes >= 0).sum()):]
+
+    with span("join.probe"):
+        found = probe_codes >= 0
+        matches = np.zeros(len(probe_codes), dtype=np.int64)
+        matches[found] = counts[probe_codes[found]]
+
+        total = int(matches.sum())
+        if total > settings.JOIN_MAX_ROWS:
+            raise ValueError(f"Join would produce {total} rows (limit {settings.JOIN_MAX_ROWS}); check the key columns.")
+
+        probe_rows = np.repeat(np.arange(len(probe_codes)), matches)
+        # Offset of each output row within its key's slot range
+        group_offsets = np.arange(total) - np.repeat(np.cumsum(matches) - matches, matches)
+        build_rows = order[np.repeat(starts[probe_codes[found]], matches[found]) + group_offsets]
+
+    return build_rows, probe_rows
+
+
+def _take(series: pd.Series, positions: np.ndarray):
+    # -1 positions become missing values (unmatched rows of a left join)
+    values = series.array if isinstance(series.dtype, pd.api.extensions.ExtensionDtype) else series.to_numpy()
+    return pd.api.extensions.take(values, positions, allow_fill=True)
+
+
+def hash_join(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_on: List[str],
+    right_on: Optional[List[str]] = None,
+    how: str = "inner",
+    left_columns: Optional[List[str]] = None,
+    right_columns: Optional[List[str]] = None,
+) -> JoinResult:
+    """
+    Inner or left equi-join of two frames on key columns.
+
+    The smaller side is the build table. Only keys and the requested
+    columns are read from each side (all columns when none are given), so
+    unused columns are never copied. Output rows follow the left frame's
+    order. Right-hand columns whose names clash with left ones get a
+    "_right" suffix; a key with the same name on both sides appears once.
+    """
+    right_on = right_on or left_on
+    if how not in JOIN_TYPES:
+        raise ValueError(f"Unsupported join type '{how}'. Use one of: {', '.join(JOIN_TYPES)}.")
+    if not left_on or len(left_on) != len(right_on):
+        raise ValueError("Join needs the same number of key columns on both sides.")
+    _check_key_types(left, right, left_on, right_on)
+
+    # Projection pushdown: the join only ever touches these columns
+    left_keep = list(dict.fromkeys(list(left_columns or left.columns) + list(left_on)))
+    right_keep = [c for c in dict.fromkeys(list(right_columns or right.columns) + list(right_on))
+                  if not (c in right_on and c in left_on and left_on.index(c) == right_on.index(c))]
+    left_side = left[left_keep + [c for c in left_on if c not in left_keep]]
+    right_side = right[list(dict.fromkeys(right_keep + list(right_on)))]
+
+    build_side = "left" if len(left) < len(right) else "right"
+    if build_side == "right":
+        right_rows, left_rows = _match(right_side, left_side, right_on, left_on)
+    else:
+        left_rows, right_rows = _match(left_side, right_side, left_on, right_on)
+    matched_rows = len(left_rows)
+
+    with span("join.materialize"):
+        if how == "left":
+            unmatched = np.ones(len(left), dtype=bool)
+            unmatched[left_rows] = False
+            extra = np.flatnonzero(unmatched)
+            left_rows = np.concatenate((left_rows, extra))
+            right_rows = np.concatenate((right_rows, np.full(len(extra), -1, dtype=np.int64)))
+
+        # Keep the left frame's row order
+        order = np.argsort(left_rows, kind="stable")
+        left_rows, right_rows = left_rows[order], right_rows[order]
+
+        columns = {}
+        for column in left_keep:
+            columns[column] = _take(left_side[column], left_rows)
+        for column in right_keep:
+            name = f"{column}_right" if column in columns else column
+            columns[name] = _take(right_side[column], right_rows)
+        frame = pd.DataFrame(columns)
+
+    return JoinResult(
+        frame=frame,
+        build_side=build_side,
+        matched_rows=matched_rows,
+        result_bytes=int(frame.memory_usage(index=True, deep=True).sum()),
+    )
@@ -0,0 +1,182 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Latency buckets in seconds: pandas work sits at the low end, LLM calls at the top
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+TOKEN_BUCKETS = (100, 250, 500, 1_000, 2_000, 4_000, 8_000, 16_000, 32_000)
+
+METRIC_PREFIX = "data_analyser_"
+
+# Stage timings of the request currently being served, when it asked for them
+_request_timings: ContextVar[Optional[List[Dict]]] = ContextVar("request_timings", default=None)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: LabelKey = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process metrics store rendered in Prometheus text format.
+
+    Counters and histograms are updated on the hot path under one lock;
+    gauges are callbacks evaluated only when /metrics is scraped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._histogram_buckets: Dict[str, tuple] = {}
+        self._gauges: Dict[str, Callable[[], List[Tuple[Dict, float]]]] = {}
+
+    def counter(self, name: str, help_text: str):
+        self._help[name] = ("counter", help_text)
+        self._counters.setdefault(name, {})
+
+    def histogram(self, name: str, help_text: str, buckets=DURATION_BUCKETS):
+        self._help[name] = ("histogram", help_text)
+        self._histograms.setdefault(name, {})
+        self._histogram_buckets[name] = buckets
+
+    def gauge(self, name: str, help_text: str, callback: Callable[[], List[Tuple[Dict, float]]]):
+        """callback returns [(labels, value), ...] and is evaluated at scrape time."""
+        self._help[name] = ("gauge", help_text)
+        self._gauges[name] = callback
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms[name]
+            if key not in series:
+                series[key] = _Histogram(self._histogram_buckets[name])
+            series[key].observe(value)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in self._help.items():
+                if kind == "gauge":
+                    continue
+                full = METRIC_PREFIX + name
+                lines.append(f"# HELP {full} {help_text}")
+                lines.append(f"# TYPE {full} {kind}")
+
+                if kind == "counter":
+                    for key, value in self._counters[name].items():
+                        lines.append(f"{full}{_format_labels(key)} {value}")
+
+                elif kind == "histogram":
+                    for key, hist in self._histograms[name].items():
+                        cumulative = 0
+                        for bound, count in zip(hist.buckets, hist.counts):
+                            cumulative += count
+                            lines.append(f"{full}_bucket{_format_labels(key, (('le', str(bound)),))} {cumulative}")
+                        lines.append(f"{full}_bucket{_format_labels(key, (('le', '+Inf'),))} {hist.count}")
+                        lines.append(f"{full}_sum{_format_labels(key)} {hist.sum}")
+                        lines.append(f"{full}_count{_format_labels(key)} {hist.count}")
+
+        # Gauge callbacks may touch other locks, so run them outside ours
+        for name, callback in self._gauges.items():
+            full = METRIC_PREFIX + name
+            kind, help_text = self._help[name]
+            lines.append(f"# HELP {full} {help_text}")
+            lines.append(f"# TYPE {full} {kind}")
+            for labels, value in callback():
+                lines.append(f"{full}{_format_labels(_label_key(labels))} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+metrics.histogram("stage_duration_seconds", "Time spent in each request stage.")
+metrics.counter("llm_tokens_total", "LLM tokens reported by the provider, by call site and direction.")
+metrics.histogram("payload_bytes", "Size of payloads produced per request, by kind.", buckets=SIZE_BUCKETS)
+metrics.counter("requests_total", "Requests served, by endpoint and outcome.")
+metrics.counter("llm_requests_total", "LLM provider calls, by provider and outcome (ok, rate_limited, error).")
+metrics.counter("llm_hedges_total", "Slow LLM calls hedged to the fallback provider.")
+metrics.counter("llm_failovers_total", "Failed LLM calls retried on the fallback provider.")
+metrics.counter("result_cache_requests_total", "Orchestrator result cache lookups, by outcome.")
+metrics.counter("response_bytes_total", "Compressed response body bytes before (identity) and after encoding, by encoding.")
+metrics.counter("not_modified_total", "Conditional requests answered with 304 Not Modified, by endpoint.")
+metrics.counter("followups_total", "Chat follow-ups, by how they were resolved (local or llm).")
+metrics.histogram("prompt_tokens", "Estimated prompt tokens, before (full) and after (sent) pruning.", buckets=TOKEN_BUCKETS)
+
+
+@contextmanager
+def span(stage: str):
+    """Time a stage: always recorded in the histogram, and in the per-request breakdown if enabled."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe("stage_duration_seconds", elapsed, stage=stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append({"stage": stage, "ms": round(elapsed * 1000, 3)})
+
+
+def start_request_timings() -> List[Dict]:
+    """Begin collecting the span breakdown for the current request (returned list fills in place)."""
+    timings: List[Dict] = []
+    _request_timings.set(timings)
+    return timings
+
+
+def record_llm_usage(call: str, response):
+    usage = getattr(response, "usage_metadata", None) or {}
+    for direction in ("input", "output"):
+        tokens = usage.get(f"{direction}_tokens")
+        if tokens:
+            metrics.inc("llm_tokens_total", tokens, call=call, direction=direction)
+
+
+def record_prompt_tokens(call: str, full: int, sent: int):
+    metrics.observe("prompt_tokens", full, call=call, variant="full")
+    metrics.observe("prompt_tokens", sent, call=call, variant="sent")
+
+
+def record_payload(kind: str, payload) -> int:
+    size = len(payload.encode("utf-8")) if isinstance(payload, str) else len(payload or b"")
+    metrics.observe("payload_bytes", size, kind=kind)
+    return size
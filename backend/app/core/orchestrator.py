@@ -1,13 +1,25 @@
 from typing import Dict, Any
 
+import numpy as np
+
 from app.core.session_manager import session_manager
 from app.core.tool_validator import validator
+from app.core.metrics import span, record_payload
+from app.core.result_cache import result_cache
+from app.core.sql_engine import DEFAULT_TABLE, run_sql
 
 # tools
 from app.tools.analytics_tool import (
     calculate_mean,
     calculate_percentage,
     value_counts,
+    parse_quantiles,
+    describe,
+    calculate_quantiles,
+    calculate_spread,
+    correlation_matrix,
+    crosstab,
+    frame_to_dict,
 )
 
 from app.tools.aggregation_tool import (
@@ -22,6 +34,14 @@ from app.tools.visualization_tool import (
     create_area_chart,
     create_scatter,
     create_3d_scatter,
+    create_timeseries_chart,
+    create_heatmap,
+)
+
+from app.tools.timeseries_tool import (
+    resample_series,
+    rolling_series,
+    period_change,
 )
 
 
@@ -32,221 +52,309 @@ class QueryOrchestrator:
     
     def execute(self, session_id: str, intent: Dict[str, Any]):
 
-        dataset_manager = session_manager.get_dataset_manager(session_id)
-        df = dataset_manager.get_dataframe()
-
         intent_type = intent.get("intent")
 
+        # Published versions are never mutated, so the reference stays valid
+        # for the whole execution without holding the session's lock; a
+        # concurrent append or refresh publishes a new version instead.
+        dataset_manager = session_manager.current(session_id)
+
+        # Same intent on the same dataset version → same result
+        cache_key = result_cache.key(dataset_manager.version, intent)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Handlers receive the whole DatasetManager so they can reuse
+        # per-session metadata (schema, column resolver, column profile)
+        # next to the frame.
         if intent_type == "analytics":
-            # Pass both the DataFrame and its schema so analytics logic can
-            # reuse precomputed metadata (like missing value counts).
-            schema = dataset_manager.get_schema()
-            return self._handle_analytics(df, schema, intent)
+            result = self._handle_analytics(dataset_manager, intent)
 
         elif intent_type == "aggregation":
-            return self._handle_aggregation(df, intent)
+            result = self._handle_aggregation(dataset_manager, intent)
 
         elif intent_type == "visualization":
-            return self._handle_visualization(df, intent)
+            result = self._handle_visualization(dataset_manager, intent)
+
+        elif intent_type == "timeseries":
+            result = self._handle_timeseries(dataset_manager, intent)
+
+        elif intent_type == "sql":
+            result = self._handle_sql(dataset_manager, intent)
 
         else:
             raise ValueError("Unsupported intent")
 
+        result_cache.put(cache_key, result)
+        return result
+
     
     # ANALYTICS
     
-    def _handle_analytics(self, df, schema, intent):
+    def _handle_analytics(self, dataset_manager, intent):
 
-        validation = validator.validate_analytics(df, intent)
+        df = dataset_manager.get_dataframe()
+        # Column profile computes per-column stats (like missing value counts)
+        # on first use and memoizes them for the session
+        profile = dataset_manager.get_column_profile()
+
+        with span("orchestrator.validate"):
+            validation = validator.validate_analytics(
+                df,
+                intent,
+                dataset_manager.get_column_resolver(),
+                profile,
+            )
         intent = validation.corrected_intent
 
-        column = intent["columns"][0]
+        columns = intent["columns"]
+        column = columns[0] if columns else None
         operation = intent.get("operation")
-
-        if operation == "mean":
-            result = calculate_mean(df, column)
-            text = f"The average {column} is {result:.2f}"
-
-        elif operation == "percentage":
-            value = intent.get("value")
-
-            # Normalize value for special percentage queries like:
-            # - "not 0"          → values != 0
-            # - "non-missing"    → values that are not NaN
-            # - "nan"/"missing"  → values that are NaN
-            normalized = (
-                str(value).strip().lower()
-                if value is not None
-                else ""
-            )
-
-            # Prefer precomputed missing-value stats from the schema when available
-            missing_values_map = (schema or {}).get("missing_values", {})
-            missing_count_from_schema = missing_values_map.get(column)
-            total_rows = len(df[column])
-
-            # 1) Special handling for inequality / missingness style questions
-            if normalized in {"not 0", "nonzero", "!=0", "not_zero"}:
-                total = total_rows
-                if total == 0:
-                    result = 0.0
-                else:
-                    mask = df[column] != 0
-                    pct = (mask.sum() / total) * 100
-                    result = float(round(pct, 2))
-                text = f"{result}% of values in {column} are not 0."
-
-            elif normalized in {
-                "non-missing",
-                "not missing",
-                "non missing",
-                "not null",
-                "non-null",
-                "non null",
-                "not nan",
-                "non-nan",
-                "non nan",
-            }:
-                # Percentage of non-missing values, prefer schema counts
-                total = total_rows
-                if total == 0:
-                    result = 0.0
-                else:
-                    if missing_count_from_schema is not None:
-                        non_missing = total - missing_count_from_schema
+        chart_json = None
+
+        with span("orchestrator.compute"):
+            if operation == "mean":
+                result = calculate_mean(df, column)
+                text = f"The average {column} is {result:.2f}"
+
+            elif operation == "percentage":
+                value = intent.get("value")
+
+                # Normalize value for special percentage queries like:
+                # - "not 0"          → values != 0
+                # - "non-missing"    → values that are not NaN
+                # - "nan"/"missing"  → values that are NaN
+                normalized = (
+                    str(value).strip().lower()
+                    if value is not None
+                    else ""
+                )
+
+                # Prefer memoized missing-value stats from the column profile
+                missing_count_from_profile = profile.null_count(column)
+                total_rows = len(df[column])
+
+                # 1) Special handling for inequality / missingness style questions
+                if normalized in {"not 0", "nonzero", "!=0", "not_zero"}:
+                    total = total_rows
+                    if total == 0:
+                        result = 0.0
                     else:
-                        non_missing = df[column].notna().sum()
-                    pct = (non_missing / total) * 100
-                    result = float(round(pct, 2))
-                text = f"{result}% of values in {column} are non-missing."
-
-            elif normalized in {"nan", "missing", "null"}:
-                # Percentage of missing/NaN values, prefer schema counts
-                total = total_rows
-                if total == 0:
-                    result = 0.0
-                else:
-                    if missing_count_from_schema is not None:
-                        missing = missing_count_from_schema
+                        mask = df[column] != 0
+                        pct = (mask.sum() / total) * 100
+                        result = float(round(pct, 2))
+                    text = f"{result}% of values in {column} are not 0."
+
+                elif normalized in {
+                    "non-missing",
+                    "not missing",
+                    "non missing",
+                    "not null",
+                    "non-null",
+                    "non null",
+                    "not nan",
+                    "non-nan",
+                    "non nan",
+                }:
+                    # Percentage of non-missing values, prefer profile counts
+                    total = total_rows
+                    if total == 0:
+                        result = 0.0
                     else:
-                        missing = df[column].isna().sum()
-                    pct = (missing / total) * 100
-                    result = float(round(pct, 2))
-                text = f"{result}% of values in {column} are NaN or missing."
-
-            # 2) Default: equality percentage (possibly inferring a sensible default value)
-            else:
-                # If the LLM didn't specify a value explicitly, try to infer a sensible default.
-                # This is important for questions like "What percentage of people survived?"
-                # where the user clearly refers to the "positive" class of a binary column.
-                if value in (None, "", " "):
-                    non_null = df[column].dropna()
-                    unique_vals = non_null.unique()
-
-                    inferred_value = None
-
-                    # Binary / boolean-like columns: choose the "positive" class
-                    if len(unique_vals) == 2:
-                        try:
-                            # If values are numeric-like (e.g. 0/1), pick the larger one
-                            numeric_vals = sorted(unique_vals)
-                            inferred_value = numeric_vals[-1]
-                        except Exception:
-                            # Fallback: pick the most frequent non-null value
-                            inferred_value = non_null.mode(dropna=True).iloc[0]
+                        if missing_count_from_profile is not None:
+                            non_missing = total - missing_count_from_profile
+                        else:
+                            non_missing = df[column].notna().sum()
+                        pct = (non_missing / total) * 100
+                        result = float(round(pct, 2))
+                    text = f"{result}% of values in {column} are non-missing."
+
+                elif normalized in {"nan", "missing", "null"}:
+                    # Percentage of missing/NaN values, prefer profile counts
+                    total = total_rows
+                    if total == 0:
+                        result = 0.0
                     else:
-                        # General case: use the most frequent non-null value
-                        inferred_value = non_null.mode(dropna=True).iloc[0]
+                        if missing_count_from_profile is not None:
+                            missing = missing_count_from_profile
+                        else:
+                            missing = df[column].isna().sum()
+                        pct = (missing / total) * 100
+                        result = float(round(pct, 2))
+                    text = f"{result}% of values in {column} are NaN or missing."
+
+                # 2) Default: equality percentage (possibly inferring a sensible default value)
+                else:
+                    # If the LLM didn't specify a value explicitly, try to infer a sensible default.
+                    # This is important for questions like "What percentage of people survived?"
+                    # where the user clearly refers to the "positive" class of a binary column.
+                    if value in (None, "", " "):
+                        non_null = df[column].dropna()
+                        unique_vals = non_null.unique()
+
+                        inferred_value = None
+
+                        # Binary / boolean-like columns: choose the "positive" class
+                        if len(unique_vals) == 2:
+                            try:
+                                # If values are numeric-like (e.g. 0/1), pick the larger one
+                                numeric_vals = sorted(unique_vals)
+                                inferred_value = numeric_vals[-1]
+                            except Exception:
+                                # Fallback: pick the most frequent non-null value
+                                inferred_value = non_null.mode(dropna=True).iloc[0]
+                        else:
+                            # General case: use the most frequent non-null value
+                            inferred_value = non_null.mode(dropna=True).iloc[0]
 
-                    value = inferred_value
-                    intent["value"] = value
+                        value = inferred_value
+                        intent["value"] = value
 
-                result = calculate_percentage(df, column, value)
-                text = f"{result}% of passengers have {column} = {value}"
+                    result = calculate_percentage(df, column, value)
+                    text = f"{result}% of passengers have {column} = {value}"
 
-        elif operation == "count":
-            value = intent.get("value")
-            normalized = (
-                str(value).strip().lower()
-                if value is not None
-                else ""
-            )
+            elif operation == "count":
+                value = intent.get("value")
+                normalized = (
+                    str(value).strip().lower()
+                    if value is not None
+                    else ""
+                )
+
+                # Prefer memoized missing-value stats from the column profile
+                missing_count_from_profile = profile.null_count(column)
+                total_rows = len(df[column])
 
-            # Prefer precomputed missing-value stats from the schema when available
-            missing_values_map = (schema or {}).get("missing_values", {})
-            missing_count_from_schema = missing_values_map.get(column)
-            total_rows = len(df[column])
+                # Special handling for missing / non-missing count questions
+                if normalized in {"nan", "missing", "null"}:
+                    if missing_count_from_profile is not None:
+                        result = int(missing_count_from_profile)
+                    else:
+                        result = int(df[column].isna().sum())
+                    text = f"There are {result} missing values in {column}."
+                    chart_json = None
+
+                elif normalized in {
+                    "non-missing",
+                    "not missing",
+                    "non missing",
+                    "not null",
+                    "non-null",
+                    "non null",
+                    "not nan",
+                    "non-nan",
+                    "non nan",
+                }:
+                    if missing_count_from_profile is not None and total_rows is not None:
+                        result = int(total_rows - missing_count_from_profile)
+                    else:
+                        result = int(df[column].notna().sum())
+                    text = f"There are {result} non-missing values in {column}."
+                    chart_json = None
 
-            # Special handling for missing / non-missing count questions
-            if normalized in {"nan", "missing", "null"}:
-                if missing_count_from_schema is not None:
-                    result = int(missing_count_from_schema)
                 else:
-                    result = int(df[column].isna().sum())
-                text = f"There are {result} missing values in {column}."
-                chart_json = None
-
-            elif normalized in {
-                "non-missing",
-                "not missing",
-                "non missing",
-                "not null",
-                "non-null",
-                "non null",
-                "not nan",
-                "non-nan",
-                "non nan",
-            }:
-                if missing_count_from_schema is not None and total_rows is not None:
-                    result = int(total_rows - missing_count_from_schema)
+                    # Default: value counts distribution
+                    result = value_counts(df, column)
+                    text = f"Value counts for {column} calculated."
+
+                    # Additionally generate a bar chart for count distributions,
+                    # so queries like "number of passengers by class" produce a chart.
+                    try:
+                        fig = create_bar_chart(df, column)
+                        with span("orchestrator.serialize"):
+                            chart_json = fig.to_json()
+                        record_payload("chart", chart_json)
+                    except Exception:
+                        chart_json = None
+
+            # Numeric summaries below read the session's stats cache: the
+            # first one computes every numeric column in one pass
+
+            elif operation == "describe":
+                result = frame_to_dict(describe(profile, columns))
+                text = f"Summary statistics for {len(result)} numeric columns."
+
+            elif operation in ("median", "quantile"):
+                quantiles = [0.5] if operation == "median" else parse_quantiles(intent.get("value"))
+                values = calculate_quantiles(profile, [column], quantiles).loc[column]
+                result = {f"{q:g}": None if np.isnan(values[q]) else float(values[q]) for q in quantiles}
+
+                if operation == "median":
+                    result = result["0.5"]
+                    text = f"The median {column} is {result:.2f}" if result is not None else f"{column} has no values."
+                elif all(v is None for v in result.values()):
+                    text = f"{column} has no values."
                 else:
-                    result = int(df[column].notna().sum())
-                text = f"There are {result} non-missing values in {column}."
-                chart_json = None
-
-            else:
-                # Default: value counts distribution
-                result = value_counts(df, column)
-                text = f"Value counts for {column} calculated."
-
-                # Additionally generate a bar chart for count distributions,
-                # so queries like "number of passengers by class" produce a chart.
-                try:
-                    fig = create_bar_chart(df, column)
+                    parts = [f"{float(q) * 100:g}th percentile: {v:.2f}" for q, v in result.items() if v is not None]
+                    text = f"{column} " + ", ".join(parts)
+
+            elif operation in ("std", "var"):
+                result = calculate_spread(profile, column, operation)
+                name = "standard deviation" if operation == "std" else "variance"
+                if np.isnan(result):
+                    result = None
+                    text = f"The {name} of {column} is undefined (fewer than two values)."
+                else:
+                    text = f"The {name} of {column} is {result:.2f}"
+
+            elif operation == "correlation":
+                matrix = correlation_matrix(profile, columns)
+                result = frame_to_dict(matrix)
+                text = f"Correlation matrix across {len(matrix)} numeric columns."
+                strongest = matrix.where(~np.eye(len(matrix), dtype=bool)).abs().stack()
+                if not strongest.empty:
+                    a, b = strongest.idxmax()
+                    text += f" Strongest: {a} and {b} ({matrix.loc[a, b]:.2f})."
+                fig = create_heatmap(matrix, "Correlation matrix")
+                with span("orchestrator.serialize"):
                     chart_json = fig.to_json()
-                except Exception:
-                    chart_json = None
+                record_payload("chart", chart_json)
+
+            elif operation == "crosstab":
+                table = crosstab(df, columns[0], columns[1])
+                result = frame_to_dict(table)
+                text = f"Crosstab of {columns[0]} by {columns[1]}."
+                fig = create_heatmap(table, f"{columns[0]} by {columns[1]}")
+                with span("orchestrator.serialize"):
+                    chart_json = fig.to_json()
+                record_payload("chart", chart_json)
 
-        else:
-            raise ValueError("Unsupported analytics operation")
+            else:
+                raise ValueError("Unsupported analytics operation")
 
         return {
             "text_response": text,
-            "chart": chart_json if operation == "count" else None,
+            "chart": chart_json,
             "data": result,
         }
 
     # AGGREGATION
     
-    def _handle_aggregation(self, df, intent):
+    def _handle_aggregation(self, dataset_manager, intent):
+
+        df = dataset_manager.get_dataframe()
 
         group_col = intent.get("group_by")
         value_col = intent["columns"][0]
         operation = intent.get("operation")
 
-        group_col = validator.validate_column(df, group_col)
-        value_col = validator.validate_column(df, value_col)
+        with span("orchestrator.validate"):
+            group_col, value_col = validator.validate_columns(
+                df, [group_col, value_col], dataset_manager.get_column_resolver()
+            )
 
-        if operation == "mean":
-            result_df = groupby_mean(df, group_col, value_col)
-            text = f"Average {value_col} grouped by {group_col}"
+        with span("orchestrator.compute"):
+            if operation == "mean":
+                result_df = groupby_mean(df, group_col, value_col)
+                text = f"Average {value_col} grouped by {group_col}"
 
-        elif operation == "count":
-            result_df = groupby_count(df, group_col)
-            text = f"Counts grouped by {group_col}"
+            elif operation == "count":
+                result_df = groupby_count(df, group_col)
+                text = f"Counts grouped by {group_col}"
 
-        else:
-            raise ValueError("Unsupported aggregation")
+            else:
+                raise ValueError("Unsupported aggregation")
 
         return {
             "text_response": text,
@@ -257,40 +365,135 @@ class QueryOrchestrator:
    
     # VISUALIZATION
     
-    def _handle_visualization(self, df, intent):
+    def _handle_visualization(self, dataset_manager, intent):
+
+        df = dataset_manager.get_dataframe()
 
-        validation = validator.validate_chart(df, intent)
+        with span("orchestrator.validate"):
+            validation = validator.validate_chart(
+                df,
+                intent,
+                dataset_manager.get_column_resolver(),
+                dataset_manager.get_column_profile(),
+            )
         intent = validation.corrected_intent
 
         chart_type = intent["chart_type"]
         cols = intent["columns"]
 
-        if chart_type == "histogram":
-            fig = create_histogram(df, cols[0])
+        with span("orchestrator.compute"):
+            if chart_type == "histogram":
+                fig = create_histogram(df, cols[0])
 
-        elif chart_type == "bar_chart":
-            fig = create_bar_chart(df, cols[0])
+            elif chart_type == "bar_chart":
+                fig = create_bar_chart(df, cols[0])
 
-        elif chart_type == "pie_chart":
-            fig = create_pie_chart(df, cols[0])
+            elif chart_type == "pie_chart":
+                fig = create_pie_chart(df, cols[0])
 
-        elif chart_type == "area_chart":
-            fig = create_area_chart(df, cols[0])
+            elif chart_type == "area_chart":
+                fig = create_area_chart(df, cols[0])
 
-        elif chart_type == "scatter":
-            fig = create_scatter(df, cols[0], cols[1])
+            elif chart_type == "scatter":
+                fig = create_scatter(df, cols[0], cols[1])
 
-        elif chart_type == "3d_scatter":
-            fig = create_3d_scatter(df, cols[0], cols[1], cols[2])
+            elif chart_type == "3d_scatter":
+                fig = create_3d_scatter(df, cols[0], cols[1], cols[2])
 
-        else:
-            raise ValueError("Unsupported chart")
+            else:
+                raise ValueError("Unsupported chart")
+
+        with span("orchestrator.serialize"):
+            chart_json = fig.to_json()
+        record_payload("chart", chart_json)
 
         return {
             "text_response": f"Generated {chart_type} visualization.",
-            "chart": fig.to_json(),
+            "chart": chart_json,
             "data": None,
         }
 
 
+    # TIME SERIES
+
+    def _handle_timeseries(self, dataset_manager, intent):
+
+        df = dataset_manager.get_dataframe()
+
+        with span("orchestrator.validate"):
+            validation = validator.validate_timeseries(
+                df,
+                intent,
+                dataset_manager.get_column_resolver(),
+                dataset_manager.get_column_profile(),
+            )
+        intent = validation.corrected_intent
+
+        time_col = intent["columns"][0]
+        value_col = intent["columns"][1] if len(intent["columns"]) > 1 else None
+        operation = intent["operation"]
+        period = intent["period"]
+
+        with span("orchestrator.compute"):
+            # Sorted once per session; ranges and period edges are binary searches
+            time_index = dataset_manager.get_time_index(time_col)
+            points = resample_series(
+                df, time_index, value_col, period, intent["aggregation"],
+                intent.get("start"), intent.get("end"),
+            )
+            label = points.columns[1]
+
+            if operation == "resample":
+                text = f"{label} per {period} of {time_col}"
+
+            elif operation == "rolling":
+                points = rolling_series(points, intent["window"])
+                text = f"{intent['window']}-{period} rolling average of {label} by {time_col}"
+
+            elif operation == "pct_change":
+                points = period_change(points)
+                text = f"{period.capitalize()}-over-{period} change in {label} by {time_col}"
+
+            else:
+                raise ValueError("Unsupported time series operation")
+
+            fig = create_timeseries_chart(points, time_col, points.columns[1], intent["chart_type"])
+
+        with span("orchestrator.serialize"):
+            chart_json = fig.to_json()
+        record_payload("chart", chart_json)
+
+        data = points.astype({time_col: str}).astype(object).where(points.notna(), None)
+
+        return {
+            "text_response": text,
+            "chart": chart_json,
+            "data": data.to_dict(orient="records"),
+        }
+
+
+    # SQL
+
+    def _handle_sql(self, dataset_manager, intent):
+
+        query = (intent.get("query") or "").strip()
+        if not query:
+            raise ValueError("SQL intent requires a query.")
+
+        with span("orchestrator.compute"):
+            # The session's frame is registered in place as the table "data"
+            result = run_sql(query, {DEFAULT_TABLE: dataset_manager.get_dataframe()})
+
+        rows = result.table.num_rows
+        text = f"Query returned {rows} rows."
+        if result.truncated:
+            text = f"Query returned more than {rows} rows; showing the first {rows}."
+
+        return {
+            "text_response": text,
+            "chart": None,
+            "data": result.to_records(),
+        }
+
+
 orchestrator = QueryOrchestrator()
\ No newline at end of file
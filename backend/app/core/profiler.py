@@ -0,0 +1,120 @@
+import contextvars
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+# The profiled request's (owning thread id, extra per-thread profilers), if
+# the current context belongs to one
+_active: contextvars.ContextVar[Optional[Tuple[int, List[cProfile.Profile]]]] = contextvars.ContextVar(
+    "request_profile", default=None
+)
+
+
+class ProfileStore:
+    """
+    Opt-in per-request profiling.
+
+    A flagged request runs under cProfile, so every pandas and Plotly call made
+    inside QueryOrchestrator shows up with its full call stack. The result is
+    kept in memory (oldest evicted first) and served by the admin endpoints,
+    either as a text report or as a .pstats file for snakeviz/pstats.
+    Requests without the flag never touch this module.
+
+    cProfile (before Python 3.12) only sees the thread that enabled it, so
+    work handed to other threads (concurrent agent tool calls) is profiled
+    with `profile_thread` and merged into the request's report.
+    """
+
+    def __init__(self):
+        self._profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def profile(self, label: str):
+        """Profile the enclosed block; yields a dict whose "id" is set once stored."""
+        entry: Dict[str, Any] = {"id": None}
+        profiler = cProfile.Profile()
+        thread_profilers: List[cProfile.Profile] = []
+        token = _active.set((threading.get_ident(), thread_profilers))
+        started = time.time()
+        profiler.enable()
+        try:
+            yield entry
+        finally:
+            profiler.disable()
+            _active.reset(token)
+            with self._lock:
+                profilers = [profiler] + thread_profilers
+            entry["id"] = self._store(label, started, time.time() - started, profilers)
+
+    @contextmanager
+    def profile_thread(self):
+        """
+        Profile the enclosed block into the current request's profile when
+        it runs on another thread (the context must be copied over).
+        A no-op outside profiled requests and on the request's own thread.
+        """
+        active = _active.get()
+        if active is None or active[0] == threading.get_ident():
+            yield
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler per process, and it
+            # already covers every thread
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            with self._lock:
+                active[1].append(profiler)
+
+    def _store(self, label: str, started: float, duration: float, profilers: List[cProfile.Profile]) -> str:
+        report = io.StringIO()
+        stats = pstats.Stats(profilers[0], stream=report)
+        for extra in profilers[1:]:
+            stats.add(extra)
+        # Same format pstats.Stats.dump_stats writes
+        raw_stats = marshal.dumps(stats.stats)
+        stats.sort_stats("cumulative").print_stats(settings.PROFILE_REPORT_LINES)
+
+        profile_id = uuid.uuid4().hex
+        with self._lock:
+            self._profiles[profile_id] = {
+                "id": profile_id,
+                "label": label,
+                "started_at": started,
+                "duration_ms": round(duration * 1000, 3),
+                "report": report.getvalue(),
+                "pstats": raw_stats,
+            }
+            while len(self._profiles) > settings.PROFILE_MAX_STORED:
+                self._profiles.popitem(last=False)
+        return profile_id
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {k: v for k, v in entry.items() if k not in ("report", "pstats")}
+                for entry in reversed(self._profiles.values())
+            ]
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+
+profile_store = ProfileStore()
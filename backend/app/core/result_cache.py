@@ -0,0 +1,93 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+from app.core.metrics import metrics
+
+CacheKey = Tuple[str, str]
+
+
+# Fields naming intents, operations or columns; matched case-insensitively
+# downstream, so they are lowercased for the key. Values are kept as given.
+CASE_INSENSITIVE_FIELDS = {"intent", "operation", "chart_type", "columns", "group_by", "period", "aggregation"}
+
+
+def normalize_intent(intent: Dict[str, Any]) -> str:
+    """
+    Canonical form of an intent for cache lookups: empty fields dropped,
+    names lowercased, keys sorted. Intents that differ only in formatting
+    (e.g. "Age" vs "age", a missing vs empty "value") share one entry.
+    """
+    normalized = {}
+    for key, value in intent.items():
+        if value in (None, "", []):
+            continue
+        lower = key in CASE_INSENSITIVE_FIELDS
+        if isinstance(value, str):
+            value = value.strip().lower() if lower else value.strip()
+        elif isinstance(value, list):
+            value = [v.strip().lower() if lower and isinstance(v, str) else v for v in value]
+        normalized[key] = value
+    return json.dumps(normalized, sort_keys=True, default=str)
+
+
+class ResultCache:
+    """
+    LRU cache of orchestrator results keyed by (dataset version, normalized
+    intent). A dataset change publishes a new version, so stale entries are
+    never hit and simply age out.
+
+    Pinned entries (pre-warmed results) sit outside the LRU and are never
+    evicted.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self._entries: "OrderedDict[CacheKey, Dict[str, Any]]" = OrderedDict()
+        self._pinned: Dict[CacheKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.max_size = settings.RESULT_CACHE_SIZE if max_size is None else max_size
+
+    def key(self, version: str, intent: Dict[str, Any]) -> CacheKey:
+        return (version, normalize_intent(intent))
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._pinned.get(key)
+            if result is None:
+                result = self._entries.get(key)
+                if result is not None:
+                    self._entries.move_to_end(key)
+        metrics.inc("result_cache_requests_total", outcome="hit" if result is not None else "miss")
+        return result
+
+    def put(self, key: CacheKey, result: Dict[str, Any]):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pin(self, key: CacheKey, result: Dict[str, Any]):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._pinned[key] = result
+
+    def pinned(self, version: str) -> Dict[str, Dict[str, Any]]:
+        """Pinned results for one dataset version, by normalized intent."""
+        with self._lock:
+            return {intent: result for (v, intent), result in self._pinned.items() if v == version}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pinned.clear()
+
+    def __len__(self):
+        return len(self._entries) + len(self._pinned)
+
+
+result_cache = ResultCache()
@@ -1,37 +1,222 @@
-import uuid 
+import threading
+import uuid
 import pandas as pd
-from typing import Dict, Any
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Tuple
 
-from app.utils.preprocessing import preprocess_data
 from app.core.dataset_manager import DatasetManager
+from app.core.locks import ReadWriteLock
+from app.core.metrics import metrics
+
+
+class SessionEntry:
+    """
+    One session: the currently published DatasetManager plus its locks.
+
+    Readers take `lock` for reading to fetch the reference (or hold it for a
+    block via `read_session` when a swap must wait). Writers build
+    the next DatasetManager without blocking anyone (serialized among
+    themselves by `writer_lock`) and only take the write side to swap the
+    reference, so a reader always sees either the old or the new version in
+    full, never a half-built one.
+    """
+
+    def __init__(self, dataset_manager: DatasetManager):
+        self.dataset_manager = dataset_manager
+        self.lock = ReadWriteLock()
+        self.writer_lock = threading.Lock()
+        # True while a background ingestion job is still publishing snapshots
+        self.ingesting = False
+
+
+class SharedDataset:
+    """A read-only dataset shared by every session created from identical content."""
+
+    def __init__(self, dataset_manager: DatasetManager):
+        self.dataset_manager = dataset_manager
+        self.refcount = 0
+
 
 class SessionManager:
 
     def __init__(self):
-        self.sessions:Dict[str, DatasetManager] ={}
+        self._sessions: Dict[str, SessionEntry] = {}
+        # Guards the registry itself (adding/removing sessions)
+        self._registry_lock = threading.Lock()
+
+        # Content-addressed datasets: content key → shared dataset, and
+        # session_id → content key for sessions still using the shared copy
+        self._shared: Dict[str, SharedDataset] = {}
+        self._session_content: Dict[str, str] = {}
+        # One lock per content key so identical concurrent uploads parse once
+        self._content_locks: Dict[str, threading.Lock] = {}
 
         self.default_session_id = 'titanic_default'
 
+    @property
+    def sessions(self) -> Dict[str, DatasetManager]:
+        # Point-in-time snapshot of session_id → published DatasetManager
+        with self._registry_lock:
+            return {sid: entry.dataset_manager for sid, entry in self._sessions.items()}
+
+    def _get_entry(self, session_id: str) -> SessionEntry:
+        with self._registry_lock:
+            entry = self._sessions.get(session_id)
+        if entry is None:
+            raise ValueError(f"Session with ID '{session_id}' does not exist.")
+        return entry
+
+    def _register(self, session_id: str, dataset_manager: DatasetManager):
+        with self._registry_lock:
+            self._sessions[session_id] = SessionEntry(dataset_manager)
+
     def initialize_default_session(self, base_dataset_manager: DatasetManager):
-        
-        self.sessions[self.default_session_id] = base_dataset_manager
 
-    def create_session_from_dataframe(self, df: pd.DataFrame) -> str:
+        self._register(self.default_session_id, base_dataset_manager)
+
+    def create_session_from_dataframe(self, df: pd.DataFrame, typed: bool = False) -> str:
         session_id = str(uuid.uuid4())
+        # Built entirely before it becomes visible in the registry
         dataset_manager = DatasetManager()
-        dataset_manager.raw_df = df.copy()
-        dataset_manager.analysis_df = preprocess_data(df.copy())
-        dataset_manager.schema = dataset_manager._generate_schema(dataset_manager.analysis_df)
+        dataset_manager.load_dataframe(df, typed=typed)
+
+        self._register(session_id, dataset_manager)
+        return session_id
+
+    def create_session_for_content(self, content_key: str, load_df: Callable[[], pd.DataFrame], typed: bool = False) -> Tuple[str, bool]:
+        """
+        Create a session for content identified by `content_key` (e.g. a hash of
+        the uploaded bytes). If that content is already loaded, the new session
+        shares its DatasetManager (frame, schema and caches) and `load_df` is
+        never called. `typed` is passed through to DatasetManager.load_dataframe.
+        Returns (session_id, reused).
+        """
+        with self._registry_lock:
+            content_lock = self._content_locks.setdefault(content_key, threading.Lock())
+
+        with content_lock:
+            with self._registry_lock:
+                shared = self._shared.get(content_key)
+
+            reused = shared is not None
+            if not reused:
+                try:
+                    dataset_manager = DatasetManager()
+                    dataset_manager.load_dataframe(load_df(), version=content_key, typed=typed)
+                except Exception:
+                    # Nothing was published for this content, so its lock would
+                    # otherwise never be released by _release_content
+                    with self._registry_lock:
+                        if content_key not in self._shared and self._content_locks.get(content_key) is content_lock:
+                            del self._content_locks[content_key]
+                    raise
+                shared = SharedDataset(dataset_manager)
 
-        self.sessions[session_id] = dataset_manager
+            session_id = str(uuid.uuid4())
+            with self._registry_lock:
+                shared = self._shared.setdefault(content_key, shared)
+                shared.refcount += 1
+                self._session_content[session_id] = content_key
+                self._sessions[session_id] = SessionEntry(shared.dataset_manager)
+
+        return session_id, reused
+
+    def reserve_session(self) -> str:
+        """
+        Register a session whose data arrives later from a background ingestion
+        job. It holds an unloaded DatasetManager until the first snapshot is
+        published and stays marked as ingesting until finish_ingestion.
+        """
+        session_id = str(uuid.uuid4())
+        entry = SessionEntry(DatasetManager())
+        entry.ingesting = True
+        with self._registry_lock:
+            self._sessions[session_id] = entry
         return session_id
-    
+
+    def finish_ingestion(self, session_id: str):
+        self._get_entry(session_id).ingesting = False
+
+    def is_ingesting(self, session_id: str) -> bool:
+        return self._get_entry(session_id).ingesting
+
+    def _release_content(self, session_id: str):
+        # Called with the registry lock held, when a session stops using its shared copy
+        content_key = self._session_content.pop(session_id, None)
+        if content_key is None:
+            return
+        shared = self._shared.get(content_key)
+        if shared is not None:
+            shared.refcount -= 1
+            if shared.refcount <= 0:
+                del self._shared[content_key]
+                self._content_locks.pop(content_key, None)
+
     def get_dataset_manager(self, session_id:str) ->DatasetManager:
-        if session_id not in self.sessions:
-            raise ValueError(f"Session with ID '{session_id}' does not exist.")
-        return self.sessions[session_id]
-    
+        return self._get_entry(session_id).dataset_manager
+
+    def current(self, session_id: str) -> DatasetManager:
+        """
+        The published version, read under the lock only for the reference.
+        Published DatasetManagers are immutable, so callers may keep using it
+        after a newer version is swapped in; nothing waits on them.
+        """
+        entry = self._get_entry(session_id)
+        with entry.lock.read_locked():
+            return entry.dataset_manager
+
+    @contextmanager
+    def read_session(self, session_id: str):
+        """Use a session's dataset with a guarantee it is not swapped out mid-use."""
+        entry = self._get_entry(session_id)
+        with entry.lock.read_locked():
+            yield entry.dataset_manager
+
+    def _publish(self, session_id: str, entry: SessionEntry, dataset_manager: DatasetManager):
+        # Waits for in-flight readers, then swaps in the fully built version.
+        # A session sharing deduplicated content gets its own copy from here on.
+        with entry.lock.write_locked():
+            entry.dataset_manager = dataset_manager
+            with self._registry_lock:
+                self._release_content(session_id)
+
+    def replace_session_data(self, session_id: str, df: pd.DataFrame, typed: bool = False) -> DatasetManager:
+        """Refresh a session with a new raw DataFrame."""
+        entry = self._get_entry(session_id)
+        with entry.writer_lock:
+            dataset_manager = DatasetManager()
+            dataset_manager.load_dataframe(df, typed=typed)
+            self._publish(session_id, entry, dataset_manager)
+        return dataset_manager
+
+    def append_to_session(self, session_id: str, df: pd.DataFrame) -> DatasetManager:
+        """Append raw rows to a session and publish the result as a new version."""
+        entry = self._get_entry(session_id)
+        with entry.writer_lock:
+            current = entry.dataset_manager
+            dataset_manager = DatasetManager()
+            dataset_manager.load_dataframe(pd.concat([current.raw_df, df], ignore_index=True))
+            self._publish(session_id, entry, dataset_manager)
+        return dataset_manager
+
+    def delete_session(self, session_id: str):
+        entry = self._get_entry(session_id)
+        with entry.writer_lock, entry.lock.write_locked():
+            with self._registry_lock:
+                self._sessions.pop(session_id, None)
+                self._release_content(session_id)
+
     def list_sessions(self):
-        return list(self.sessions.keys())
-    
-session_manager = SessionManager()
\ No newline at end of file
+        with self._registry_lock:
+            return list(self._sessions.keys())
+
+session_manager = SessionManager()
+
+
+def _session_memory():
+    return [
+        ({"session": session_id}, dataset_manager.memory_usage_bytes())
+        for session_id, dataset_manager in session_manager.sessions.items()
+    ]
+
+metrics.gauge("session_memory_bytes", "Memory held by each session's raw and analysis DataFrames.", _session_memory)
@@ -0,0 +1,101 @@
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import duckdb
+import pyarrow as pa
+
+from app.config import settings
+from app.core.metrics import span
+
+# Name the querying session's dataset is registered under
+DEFAULT_TABLE = "data"
+
+_TABLE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,63}$")
+
+
+@dataclass
+class SQLResult:
+    table: pa.Table
+    truncated: bool
+    elapsed_ms: float
+
+    def to_records(self) -> List[dict]:
+        return self.table.to_pylist()
+
+    def to_ipc(self) -> bytes:
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, self.table.schema) as writer:
+            writer.write_table(self.table)
+        return sink.getvalue().to_pybytes()
+
+
+def _check_statement(sql: str) -> str:
+    # A single read-only SELECT (WITH ... SELECT included)
+    try:
+        statements = duckdb.extract_statements(sql)
+    except duckdb.Error as e:
+        raise ValueError(f"Invalid SQL: {e}")
+    if len(statements) != 1:
+        raise ValueError("Exactly one SQL statement is allowed.")
+    if statements[0].type != duckdb.StatementType.SELECT:
+        raise ValueError("Only SELECT queries are allowed.")
+    return sql.strip().rstrip(";")
+
+
+def run_sql(sql: str, tables: Dict[str, object], max_rows: Optional[int] = None,
+            timeout_s: Optional[float] = None) -> SQLResult:
+    """
+    Run one SELECT against DataFrames registered as tables in an embedded,
+    in-memory DuckDB connection.
+
+    Frames are registered as views over the pandas data rather than
+    copied. File, network and extension access is disabled and locked for
+    the connection, so a query only sees the given tables. Rows are
+    streamed in batches and reading stops after `max_rows`; a query still
+    running after `timeout_s` is interrupted.
+    """
+    max_rows = settings.SQL_MAX_ROWS if max_rows is None else max_rows
+    timeout_s = settings.SQL_TIMEOUT_S if timeout_s is None else timeout_s
+    sql = _check_statement(sql)
+
+    for name in tables:
+        if not _TABLE_NAME.match(name):
+            raise ValueError(f"Invalid table name '{name}'.")
+
+    started = time.perf_counter()
+    con = duckdb.connect(":memory:")
+    timer = threading.Timer(timeout_s, con.interrupt)
+    try:
+        con.execute(f"SET threads = {int(settings.SQL_THREADS)}")
+        con.execute("SET memory_limit = ?", [settings.SQL_MEMORY_LIMIT])
+        for name, frame in tables.items():
+            con.register(name, frame)
+        con.execute("SET enable_external_access = false")
+        con.execute("SET lock_configuration = true")
+
+        timer.start()
+        with span("sql.execute"):
+            try:
+                reader = con.execute(sql).to_arrow_reader(min(max(max_rows, 1), 100_000))
+                batches, rows = [], 0
+                for batch in reader:
+                    batches.append(batch)
+                    rows += batch.num_rows
+                    if rows > max_rows:
+                        break
+                table = pa.Table.from_batches(batches, schema=reader.schema)
+            except duckdb.InterruptException:
+                raise TimeoutError(f"SQL query exceeded the {timeout_s:g}s time limit.")
+            except duckdb.Error as e:
+                raise ValueError(f"SQL error: {e}")
+    finally:
+        timer.cancel()
+        con.close()
+
+    truncated = table.num_rows > max_rows
+    if truncated:
+        table = table.slice(0, max_rows)
+    return SQLResult(table=table, truncated=truncated, elapsed_ms=round((time.perf_counter() - started) * 1000, 3))
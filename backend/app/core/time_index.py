@@ -0,0 +1,155 @@
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Period names accepted by time-series intents → pandas period frequencies
+PERIODS = {
+    "hour": "h",
+    "day": "D",
+    "week": "W",
+    "month": "M",
+    "quarter": "Q",
+    "year": "Y",
+}
+
+# Periods beyond this many bins are rejected rather than materialized
+MAX_BINS = 100_000
+
+
+class TimeIndex:
+    """
+    Sorted view of one datetime column.
+
+    Built once per loaded dataset (see DatasetManager.get_time_index): the
+    row positions are argsorted by timestamp a single time, after which range
+    filters and period boundaries are found with binary search and period
+    aggregates are differences of prefix sums, so no query rescans or
+    re-sorts the column. Missing timestamps are left out of the index.
+    Timezone-aware columns are indexed in UTC.
+    """
+
+    def __init__(self, series: pd.Series):
+        if not pd.api.types.is_datetime64_any_dtype(series):
+            raise ValueError(f"Column '{series.name}' is not a datetime column.")
+        if getattr(series.dt, "tz", None) is not None:
+            series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+
+        values = series.to_numpy(dtype="datetime64[ns]")
+        valid = np.flatnonzero(~np.isnat(values))
+        order = np.argsort(values[valid], kind="stable")
+
+        self.column = series.name
+        # Row positions in time order, and their timestamps
+        self.positions = valid[order]
+        self.times = values[self.positions]
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def start(self) -> Optional[pd.Timestamp]:
+        return pd.Timestamp(self.times[0]) if len(self) else None
+
+    @property
+    def end(self) -> Optional[pd.Timestamp]:
+        return pd.Timestamp(self.times[-1]) if len(self) else None
+
+    def bounds(self, start=None, end=None) -> Tuple[int, int]:
+        """
+        Slice [lo, hi) of the sorted index with start <= time <= end. A
+        date-only end ("2024-03-31") includes that whole day.
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.times, _timestamp(start), side="left"))
+        if end is None:
+            hi = len(self)
+        elif isinstance(end, str) and ":" not in end:
+            next_day = _timestamp(end) + np.timedelta64(1, "D")
+            hi = int(np.searchsorted(self.times, next_day, side="left"))
+        else:
+            hi = int(np.searchsorted(self.times, _timestamp(end), side="right"))
+        return lo, max(lo, hi)
+
+    def range_positions(self, start=None, end=None) -> np.ndarray:
+        """Row positions (in time order) whose timestamp falls in the range."""
+        lo, hi = self.bounds(start, end)
+        return self.positions[lo:hi]
+
+    def bins(self, period: str, start=None, end=None) -> Tuple[pd.PeriodIndex, np.ndarray, int]:
+        """
+        Periods covering the range and the sorted-index offsets where each
+        one starts (one more offset than periods), plus the range's lo.
+        """
+        freq = PERIODS.get(period)
+        if freq is None:
+            raise ValueError(f"Unsupported period '{period}'. Use one of: {', '.join(PERIODS)}.")
+
+        lo, hi = self.bounds(start, end)
+        if lo == hi:
+            return pd.PeriodIndex([], freq=freq), np.array([lo], dtype=np.int64), lo
+
+        first = pd.Period(self.times[lo], freq=freq)
+        last = pd.Period(self.times[hi - 1], freq=freq)
+        if last.ordinal - first.ordinal + 1 > MAX_BINS:
+            raise ValueError(f"Too many {period} periods in range; use a coarser period or a narrower range.")
+
+        periods = pd.period_range(first, last, freq=freq)
+        edges = np.append(
+            periods.start_time.to_numpy(dtype="datetime64[ns]"),
+            (last + 1).start_time.to_datetime64(),
+        )
+        offsets = np.searchsorted(self.times[lo:hi], edges, side="left") + lo
+        return periods, offsets, lo
+
+    def resample(self, period: str, values: Optional[np.ndarray] = None, aggregation: str = "count",
+                 start=None, end=None) -> pd.Series:
+        """
+        Aggregate `values` (aligned with the frame's rows) per period.
+
+        "count" without values counts rows; with values it counts non-missing
+        ones. "sum" and "mean" skip missing values; a period with nothing to
+        average is NaN. Empty periods inside the range are kept, so the result
+        is a regular series.
+        """
+        periods, offsets, lo = self.bins(period, start, end)
+        hi = offsets[-1]
+
+        if values is None:
+            if aggregation != "count":
+                raise ValueError(f"'{aggregation}' needs a value column.")
+            result = np.diff(offsets).astype(np.int64)
+        else:
+            ordered = np.asarray(values, dtype="float64")[self.positions[lo:hi]]
+            present = ~np.isnan(ordered)
+            counts = _bin_totals(present.astype(np.int64), offsets - lo)
+            if aggregation == "count":
+                result = counts
+            elif aggregation in ("sum", "mean"):
+                sums = _bin_totals(np.where(present, ordered, 0.0), offsets - lo)
+                if aggregation == "sum":
+                    result = sums
+                else:
+                    with np.errstate(invalid="ignore", divide="ignore"):
+                        result = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+            else:
+                raise ValueError(f"Unsupported aggregation '{aggregation}'. Use mean, sum or count.")
+
+        return pd.Series(result, index=periods.start_time, name=aggregation)
+
+
+def _bin_totals(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    # Per-bin totals as differences of one prefix sum
+    cumulative = np.concatenate(([0], np.cumsum(values)))
+    return cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+
+
+def _timestamp(value) -> np.datetime64:
+    try:
+        stamp = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid date '{value}'.")
+    if stamp is pd.NaT:
+        raise ValueError(f"Invalid date '{value}'.")
+    if stamp.tzinfo is not None:
+        stamp = stamp.tz_convert("UTC").tz_localize(None)
+    return stamp.to_datetime64().astype("datetime64[ns]")
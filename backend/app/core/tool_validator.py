@@ -23,7 +23,11 @@ class ValidationResult:
 class HybridValidator:
     # Column Validations
 
-    def validate_column(self, df:pd.DataFrame, column:str)-> str:        
+    def validate_column(self, df:pd.DataFrame, column:str, resolver=None)-> str:
+        # Sessions carry a prebuilt, memoized ColumnResolver; use it when available
+        if resolver is not None:
+            return resolver.resolve(column)
+
         column = column.lower().strip()
 
         if column in df.columns:
@@ -57,21 +61,36 @@ class HybridValidator:
             return match
 
         raise ValueError(f"Column '{column}' not found in DataFrame.")
+
+    def validate_columns(self, df:pd.DataFrame, columns, resolver=None):
+        # Batch form used to resolve every column of an intent at once
+        if resolver is not None:
+            return resolver.resolve_many(columns)
+        return [self.validate_column(df, col) for col in columns]
     
 
     #### Type Helper ##########
-    def is_numeric(self, df, column):
+    # With a session ColumnProfile these are O(1) lookups; without one they
+    # fall back to inspecting the live frame.
+    def is_numeric(self, df, column, profile=None):
+        if profile is not None:
+            return profile.is_numeric(column)
         return pd.api.types.is_numeric_dtype(df[column])
 
-    def is_categorical(self, df, column):
-        return not self.is_numeric(df, column)
+    def is_categorical(self, df, column, profile=None):
+        return not self.is_numeric(df, column, profile)
+
+    def cardinality(self, df, column, profile=None):
+        if profile is not None:
+            return profile.cardinality(column)
+        return df[column].nunique()
 
 
     ##########################
     # Chart Type Validation
     ############################
 
-    def validate_chart(self, df, intent: Dict[str,Any]) -> ValidationResult:
+    def validate_chart(self, df, intent: Dict[str,Any], resolver=None, profile=None) -> ValidationResult:
         
         chart =  intent.get("chart_type")
         columns = intent.get("columns", [])
@@ -79,10 +98,11 @@ class HybridValidator:
         if not columns: 
             return ValidationResult(False, intent, "No columns specified for chart.")
         
-        column =  self.validate_column(df, columns[0])
+        intent["columns"] = self.validate_columns(df, columns, resolver)
+        column = intent["columns"][0]
 
         if chart == "histogram":
-            if not self.is_numeric(df, column):
+            if not self.is_numeric(df, column, profile):
                 intent['chart_type'] = "bar_chart"
                 return ValidationResult(True, intent, "Histogram invalid switched to bar chart")
         
@@ -91,7 +111,8 @@ class HybridValidator:
             # Allow pie charts for low-cardinality columns (even if stored as numeric),
             # e.g. binary indicators like "survived" (0/1). Only downgrade when the
             # numeric column has many unique values where a pie chart is not useful.
-            if self.is_numeric(df, column) and df[column].nunique() > 6:
+            cardinality = self.cardinality(df, column, profile)
+            if self.is_numeric(df, column, profile) and cardinality > 6:
                 intent["chart_type"] = "histogram"
                 return ValidationResult(
                     True,
@@ -99,38 +120,106 @@ class HybridValidator:
                     "Pie invalid for high-cardinality numeric → histogram used",
                 )
 
-            if df[column].nunique() > 8:
+            if cardinality > 8:
                 intent["chart_type"] = "bar_chart"
                 return ValidationResult(True, intent,
                                         "Too many categories → bar chart used")
 
         # AREA CHART
         if chart == "area_chart":
-            if not self.is_numeric(df, column):
+            if not self.is_numeric(df, column, profile):
                 intent["chart_type"] = "bar_chart"
                 return ValidationResult(True, intent,
                                         "Area requires numeric → bar chart used")
 
         return ValidationResult(True, intent)
     
-    def validate_analytics(self, df, intent):
+    def validate_analytics(self, df, intent, resolver=None, profile=None):
 
-        # Ensure at least one target column is provided
+        operation = intent.get("operation")
         columns = intent.get("columns") or []
+
+        # Whole-table operations: no columns means every numeric column
+        if operation in ("describe", "correlation"):
+            columns = self.validate_columns(df, columns, resolver)
+            numeric = [c for c in columns if self.is_numeric(df, c, profile)]
+            intent["columns"] = numeric
+            if columns and not numeric:
+                raise ValueError(f"{operation.capitalize()} requires numeric columns")
+            if len(numeric) < len(columns):
+                return ValidationResult(True, intent, "Non-numeric columns skipped")
+            return ValidationResult(True, intent)
+
+        # Ensure at least one target column is provided
         if not columns:
             raise ValueError("Analytics operations require at least one column.")
 
-        column = self.validate_column(df, columns[0])
-        intent["columns"][0] = column
+        if operation == "crosstab":
+            if len(columns) < 2:
+                raise ValueError("Crosstab requires two columns.")
+            intent["columns"] = self.validate_columns(df, columns[:2], resolver)
+            return ValidationResult(True, intent)
 
-        operation = intent.get("operation")
+        column = self.validate_column(df, columns[0], resolver)
+        intent["columns"][0] = column
 
-        if operation == "mean":
-            if not self.is_numeric(df, column):
-                raise ValueError("Mean requires numeric column")
+        if operation in ("mean", "median", "quantile", "std", "var"):
+            if not self.is_numeric(df, column, profile):
+                raise ValueError(f"{operation.capitalize()} requires numeric column")
 
         return ValidationResult(True, intent)
 
+    def is_datetime(self, df, column, profile=None):
+        if profile is not None:
+            return profile.is_datetime(column)
+        return pd.api.types.is_datetime64_any_dtype(df[column])
+
+    def validate_timeseries(self, df, intent, resolver=None, profile=None):
+
+        columns = intent.get("columns") or []
+        if not columns:
+            raise ValueError("Time series operations require a datetime column.")
+
+        columns = self.validate_columns(df, columns[:2], resolver)
+        message = ""
+
+        # The time column comes first; recover when the LLM swapped them
+        if not self.is_datetime(df, columns[0], profile):
+            if len(columns) > 1 and self.is_datetime(df, columns[1], profile):
+                columns = [columns[1], columns[0]]
+                message = "Time and value columns swapped"
+            else:
+                raise ValueError(f"Column '{columns[0]}' is not a datetime column.")
+
+        operation = intent.get("operation") or "resample"
+        if operation not in ("resample", "rolling", "pct_change"):
+            raise ValueError("Unsupported time series operation")
+
+        value_col = columns[1] if len(columns) > 1 else None
+        aggregation = intent.get("aggregation") or ("mean" if value_col else "count")
+        if aggregation in ("mean", "sum"):
+            if value_col is None:
+                raise ValueError(f"'{aggregation}' over time needs a value column.")
+            if not self.is_numeric(df, value_col, profile):
+                raise ValueError(f"'{aggregation}' over time requires a numeric column.")
+
+        chart_type = intent.get("chart_type") or "line_chart"
+        if chart_type not in ("line_chart", "area_chart"):
+            chart_type = "line_chart"
+            message = message or "Time series are charted as line charts"
+
+        intent.update(
+            columns=columns,
+            operation=operation,
+            aggregation=aggregation,
+            period=(intent.get("period") or "month").lower(),
+            chart_type=chart_type,
+        )
+        if operation == "rolling":
+            intent["window"] = int(intent.get("window") or 3)
+
+        return ValidationResult(True, intent, message)
+
 validator = HybridValidator()
 
 
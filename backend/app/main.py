@@ -3,8 +3,10 @@ from app.config import settings
 
 from app.core.dataset_manager import dataset_manager
 from app.core.session_manager import session_manager
+from app.core.job_manager import job_manager
 
 from app.api.routes import router
+from app.api.compression import CompressionMiddleware
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -18,13 +20,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+if settings.COMPRESSION:
+    app.add_middleware(CompressionMiddleware)
+
 @app.on_event('startup')
 def startup_event():
     dataset_manager.load_titanic_dataset()
     session_manager.initialize_default_session(dataset_manager)
+    job_manager.warm_profile(dataset_manager)
+    job_manager.warm_results(session_manager.default_session_id)
 
+@app.on_event('shutdown')
+def shutdown_event():
+    job_manager.shutdown()
 
     
 
@@ -0,0 +1,203 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+from langchain_core.messages import AIMessage, ToolMessage
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+os.environ.setdefault("LLM_PROVIDER", "stub")
+
+from app.agent import agent_executor
+from app.agent.conversation import ConversationState, conversation_store
+from app.config import settings
+from app.core.metrics import start_request_timings
+from app.core.session_manager import session_manager
+
+# Later calls finish first, so completion order is the reverse of call order
+DELAYS = [0.3, 0.2, 0.1, 0.0]
+
+
+class SlowTool:
+    name = "dataset_analyst"
+
+    def __init__(self):
+        self.finished = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def invoke(self, args):
+        time.sleep(DELAYS[args["n"]])
+        with self._lock:
+            self.finished.append(args["n"])
+            self.threads.add(threading.current_thread().name)
+        return {"text_response": f"result {args['n']}", "session": args["session_id"]}
+
+
+class ScriptedLLM:
+    """Asks for every tool call in one turn, then answers."""
+
+    def __init__(self):
+        self.seen = []
+
+    def invoke(self, messages):
+        self.seen.append(list(messages))
+        if len(self.seen) == 1:
+            return AIMessage(content="", tool_calls=[
+                {"name": "dataset_analyst", "args": {"n": n}, "id": f"call_{n}"} for n in range(len(DELAYS))
+            ])
+        return AIMessage(content="done")
+
+
+def patched(tool, llm):
+    saved = (agent_executor.LANGCHAIN_TOOLS, agent_executor.tool_enabled_llm, settings.AGENT_TOOL_PARALLELISM)
+    agent_executor.LANGCHAIN_TOOLS = [tool]
+    agent_executor.tool_enabled_llm = llm
+    settings.AGENT_TOOL_PARALLELISM = len(DELAYS)
+    return saved
+
+
+def restore(saved):
+    agent_executor.LANGCHAIN_TOOLS, agent_executor.tool_enabled_llm, settings.AGENT_TOOL_PARALLELISM = saved
+
+
+def test_tool_results_keep_call_order():
+    tool = SlowTool()
+    saved = patched(tool, ScriptedLLM())
+    try:
+        calls = [{"name": "dataset_analyst", "args": {"n": n}, "id": f"call_{n}"} for n in range(len(DELAYS))]
+        timings = start_request_timings()
+        outcomes = agent_executor._run_tool_calls(calls, "session-a")
+
+        assert tool.finished == [3, 2, 1, 0]
+        assert [result["text_response"] for result, _ in outcomes] == ["result 0", "result 1", "result 2", "result 3"]
+        assert all(result["session"] == "session-a" for result, _ in outcomes)
+        assert all(name.startswith("agent-tool") for name in tool.threads)
+        # Spans from the tool threads land in this request's breakdown
+        assert [t["stage"] for t in timings].count("agent.tool") == len(DELAYS)
+    finally:
+        restore(saved)
+
+
+def test_tool_messages_follow_call_order():
+    tool = SlowTool()
+    llm = ScriptedLLM()
+    saved = patched(tool, llm)
+    session_id = session_manager.create_session_from_dataframe(pd.DataFrame({"age": [1.0, 2.0]}), typed=True)
+    try:
+        result = agent_executor.run_agent("run every tool", session_id, conversation_id=f"order-{session_id}")
+        assert result["response"] == "done"
+
+        tool_messages = [m for m in llm.seen[1] if isinstance(m, ToolMessage)]
+        assert [m.tool_call_id for m in tool_messages] == ["call_0", "call_1", "call_2", "call_3"]
+        assert all(f"result {n}" in m.content for n, m in enumerate(tool_messages))
+        # The last call's result is the one returned, as with serial execution
+        assert result["tool_result"]["text_response"] == "result 3"
+    finally:
+        restore(saved)
+        session_manager.delete_session(session_id)
+
+
+class PlainLLM:
+    """Answers without tools and keeps the messages it was sent."""
+
+    def __init__(self):
+        self.seen = []
+
+    def invoke(self, messages):
+        self.seen.append(list(messages))
+        return AIMessage(content="ok")
+
+
+def test_requests_without_a_conversation_id_do_not_share_memory():
+    llm = PlainLLM()
+    saved = patched(SlowTool(), llm)
+    session_id = session_manager.create_session_from_dataframe(pd.DataFrame({"age": [1.0, 2.0]}), typed=True)
+    try:
+        first = agent_executor.run_agent("tell me about the first client", session_id)
+        second = agent_executor.run_agent("tell me about the second client", session_id)
+        assert first["conversation_id"] != second["conversation_id"]
+        assert first["conversation_id"] != session_id
+        assert not any("first client" in str(m.content) for m in llm.seen[1])
+
+        # Sending the returned id back continues that conversation
+        agent_executor.run_agent("and again", session_id, first["conversation_id"])
+        assert any("first client" in str(m.content) for m in llm.seen[2])
+    finally:
+        restore(saved)
+        session_manager.delete_session(session_id)
+
+
+class FailingOrchestrator:
+    def execute(self, session_id, intent):
+        raise IndexError("list index out of range")
+
+
+def test_follow_ups_the_orchestrator_cannot_run_go_to_the_llm():
+    session_id = session_manager.create_session_from_dataframe(
+        pd.DataFrame({"age": [1.0, 2.0], "fare": [3.0, 4.0]}), typed=True
+    )
+    conversation = ConversationState(session_id=session_id)
+    conversation_store.record_turn(
+        conversation, "What is the average age?",
+        {"intent": "analytics", "operation": "mean", "columns": ["age"]}, "The average age is 1.5",
+    )
+    saved = agent_executor.orchestrator
+    try:
+        # A scatter needs two columns, so it is not guessed locally
+        assert agent_executor._answer_follow_up("now as a scatter", session_id, conversation) is None
+        assert agent_executor._answer_follow_up("now as a bar chart", session_id, conversation)["resolved_locally"]
+
+        agent_executor.orchestrator = FailingOrchestrator()
+        assert agent_executor._answer_follow_up("what about fare?", session_id, conversation) is None
+    finally:
+        agent_executor.orchestrator = saved
+        session_manager.delete_session(session_id)
+
+
+def test_chat_does_not_block_the_event_loop():
+    from fastapi import FastAPI
+    import httpx
+    from app.api import routes
+
+    def slow_agent(query, session_id, conversation_id=None):
+        # Stands in for a blocking LLM retry or hedge wait
+        time.sleep(0.5)
+        return {"response": "done", "conversation_id": conversation_id or "new"}
+
+    app = FastAPI()
+    app.include_router(routes.router)
+
+    async def race():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            started = time.perf_counter()
+            chat = asyncio.create_task(client.post("/chat", json={"query": "slow"}))
+            await asyncio.sleep(0.05)
+            health = await client.get("/health")
+            waited = time.perf_counter() - started
+            return (await chat), health, waited
+
+    saved = routes.run_agent
+    routes.run_agent = slow_agent
+    try:
+        chat, health, waited = asyncio.run(race())
+    finally:
+        routes.run_agent = saved
+
+    assert chat.json()["response"] == "done"
+    assert health.status_code == 200
+    assert waited < 0.3
+
+
+if __name__ == "__main__":
+    test_tool_results_keep_call_order()
+    test_tool_messages_follow_call_order()
+    test_requests_without_a_conversation_id_do_not_share_memory()
+    test_follow_ups_the_orchestrator_cannot_run_go_to_the_llm()
+    test_chat_does_not_block_the_event_loop()
+    print("agent executor tests passed")
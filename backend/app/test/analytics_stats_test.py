@@ -0,0 +1,124 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.column_profile import ColumnProfile
+from app.tools.analytics_tool import calculate_spread, parse_quantiles
+from app.utils.preprocessing import preprocess_data
+
+DATASET = Path(__file__).parent.parent / "data" / "titanic.csv"
+
+
+def titanic() -> pd.DataFrame:
+    return preprocess_data(pd.read_csv(DATASET))
+
+
+def test_numeric_summary_matches_describe():
+    df = titanic()
+    profile = ColumnProfile(df)
+    expected = df.describe().T
+    summary = profile.numeric_summary()[expected.columns]
+    assert np.allclose(summary.to_numpy(float), expected.to_numpy(float), equal_nan=True)
+    assert np.isclose(summary.loc["age", "std"] ** 2, profile.numeric_summary(["age"]).loc["age", "var"])
+
+
+def test_correlation_uses_pairwise_complete_rows():
+    df = titanic()
+    profile = ColumnProfile(df)
+    expected = df[profile.numeric_columns()].corr()
+    assert np.allclose(profile.correlation().to_numpy(), expected.to_numpy(), equal_nan=True)
+    assert list(profile.correlation(["age", "fare"]).columns) == ["age", "fare"]
+
+
+def test_correlation_is_stable_for_large_offsets():
+    rng = np.random.default_rng(0)
+    rows = 100_000
+    a = rng.normal(size=rows)
+    df = pd.DataFrame({
+        "a": 1e8 + a,
+        "b": 1e8 + 0.5 * a + rng.normal(size=rows),
+        "c": 1e8 + rng.normal(size=rows),
+    })
+    df.loc[::7, "b"] = np.nan
+    result = ColumnProfile(df).correlation()
+    assert np.allclose(result.to_numpy(), df.corr().to_numpy(), atol=1e-6)
+    assert np.allclose(np.diag(result.to_numpy()), 1.0)
+
+
+def test_statistics_are_computed_per_requested_column():
+    df = titanic()
+    profile = ColumnProfile(df)
+    summary = profile.numeric_summary(["fare"])
+    assert list(summary.index) == ["fare"]
+    assert list(profile._summaries) == ["fare"]
+    assert summary.loc["fare", "count"] == df["fare"].count()
+
+    matrix = profile.correlation(["age", "fare"])
+    assert np.isclose(matrix.loc["age", "fare"], df["age"].corr(df["fare"]))
+    assert {a for a, _ in profile._correlations} == {"age", "fare"}
+
+
+def test_correlation_is_accumulated_over_row_chunks():
+    rng = np.random.default_rng(1)
+    rows = 10_001
+    df = pd.DataFrame({
+        "x": rng.normal(size=rows),
+        "y": rng.integers(0, 100, rows),
+        "z": pd.array(rng.integers(0, 5, rows), dtype="Int64"),
+    })
+    df["w"] = 1e9 + df["x"] * 3 + rng.normal(size=rows)
+    df.loc[::5, "x"] = np.nan
+    df.loc[::11, "z"] = pd.NA
+
+    profile = ColumnProfile(df)
+    # About 100 rows per chunk
+    profile.CORRELATION_CHUNK_BYTES = 8 * 4 * 100
+    result = profile.correlation()
+    expected = df.astype("float64").corr()
+    assert np.allclose(result.to_numpy(), expected.to_numpy(), atol=1e-9)
+
+
+def test_spread_reads_one_column():
+    df = titanic()
+    profile = ColumnProfile(df)
+    assert np.isclose(calculate_spread(profile, "fare", "std"), df["fare"].std())
+    assert np.isclose(calculate_spread(profile, "age", "var"), df["age"].var())
+    # A std/var request reads only its own column
+    assert set(profile._variances) == {"fare", "age"}
+    assert profile._summaries == {}
+
+
+def test_quantiles_are_cached_per_q():
+    df = titanic()
+    profile = ColumnProfile(df)
+    result = profile.quantiles([0.1, 0.9], ["fare"])
+    assert np.allclose(result.loc["fare"].to_numpy(), df["fare"].quantile([0.1, 0.9]).to_numpy())
+    assert ("fare", 0.9) in profile._quantiles
+    assert not any(column != "fare" for column, _ in profile._quantiles)
+
+    median = profile.quantiles([0.5], ["age"]).loc["age", 0.5]
+    assert np.isclose(median, df["age"].median())
+
+
+def test_parse_quantiles():
+    assert parse_quantiles("90%") == [0.9]
+    assert parse_quantiles("25, 75") == [0.25, 0.75]
+    assert parse_quantiles(["0.5"]) == [0.5]
+    assert parse_quantiles("") == [0.25, 0.5, 0.75]
+
+
+if __name__ == "__main__":
+    test_numeric_summary_matches_describe()
+    test_correlation_uses_pairwise_complete_rows()
+    test_correlation_is_stable_for_large_offsets()
+    test_statistics_are_computed_per_requested_column()
+    test_correlation_is_accumulated_over_row_chunks()
+    test_spread_reads_one_column()
+    test_quantiles_are_cached_per_q()
+    test_parse_quantiles()
+    print("analytics stats tests passed")
@@ -0,0 +1,65 @@
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.cache_warmer import load_results, prewarm
+from app.core.dataset_manager import DatasetManager
+from app.core.result_cache import ResultCache, result_cache
+from app.core.session_manager import session_manager
+
+
+def default_session() -> str:
+    dm = DatasetManager()
+    dm.load_titanic_dataset()
+    session_manager.initialize_default_session(dm)
+    return session_manager.default_session_id
+
+
+def test_titanic_version_follows_file_content():
+    first, second = DatasetManager(), DatasetManager()
+    first.load_titanic_dataset()
+    second.load_titanic_dataset()
+    assert first.version == second.version
+
+
+def test_prewarm_saves_and_reloads_results():
+    session_id = default_session()
+    version = session_manager.get_dataset_manager(session_id).version
+    path = Path(tempfile.mkdtemp()) / "prewarm.json.zst"
+    result_cache.clear()
+
+    computed = prewarm(session_id, path)
+    assert computed["computed"] > 50 and computed["loaded"] == 0
+    pinned = result_cache.pinned(version)
+    assert len(pinned) == computed["computed"]
+
+    key = result_cache.key(version, {"intent": "visualization", "chart_type": "histogram", "columns": ["Age"]})
+    assert result_cache.get(key)["chart"]
+
+    result_cache.clear()
+    loaded = prewarm(session_id, path)
+    assert loaded == {"loaded": computed["computed"], "computed": 0, "skipped": 0}
+    assert result_cache.get(key)["chart"] == pinned[key[1]]["chart"]
+
+    # Saved results only apply to the dataset content they were computed on
+    assert load_results(path, "another-version") is None
+    result_cache.clear()
+
+
+def test_pinned_entries_are_not_evicted():
+    cache = ResultCache(max_size=2)
+    cache.pin(("v", "pinned"), {"text_response": "kept"})
+    for i in range(5):
+        cache.put(("v", str(i)), {"text_response": str(i)})
+    assert cache.get(("v", "pinned")) == {"text_response": "kept"}
+    assert len(cache) == 3
+
+
+if __name__ == "__main__":
+    test_titanic_version_follows_file_content()
+    test_prewarm_saves_and_reloads_results()
+    test_pinned_entries_are_not_evicted()
+    print("cache warmer tests passed")
@@ -0,0 +1,115 @@
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.tools.chart_templates import template_figure
+from app.utils.preprocessing import preprocess_data
+
+DATASET = Path(__file__).parent.parent / "data" / "titanic.csv"
+
+
+def titanic() -> pd.DataFrame:
+    return preprocess_data(pd.read_csv(DATASET))
+
+
+def assert_same_json(fast: str, expected: str):
+    assert json.loads(fast) == json.loads(expected)
+    pio.from_json(fast)
+
+
+def test_count_charts_match_plotly_express():
+    df = titanic()
+    for column in ("sex", "pclass", "embarked"):
+        counts = df[column].value_counts().reset_index()
+        counts.columns = [column, "count"]
+        arrays = {"x": counts[column], "y": counts["count"]}
+        names = {"x": column, "y": "count"}
+        assert_same_json(
+            template_figure("bar", arrays, names, "Bar").to_json(),
+            px.bar(counts, x=column, y="count", title="Bar").to_json(),
+        )
+        assert_same_json(
+            template_figure("pie", arrays, names, "Pie").to_json(),
+            px.pie(counts, names=column, values="count", title="Pie").to_json(),
+        )
+        assert_same_json(
+            template_figure("area", arrays, names, "Area").to_json(),
+            px.area(counts, x=column, y="count", title="Area").to_json(),
+        )
+
+
+def test_row_level_charts_match_plotly_express():
+    df = titanic()
+    # More than 1000 rows switches scatter traces to WebGL
+    for frame in (df, pd.concat([df, df], ignore_index=True)):
+        assert_same_json(
+            template_figure("histogram", {"x": frame["age"]}, {"x": "age"}, "Hist").to_json(),
+            px.histogram(frame, x="age", title="Hist").to_json(),
+        )
+        assert_same_json(
+            template_figure("scatter", {"x": frame["sex"], "y": frame["fare"]}, {"x": "sex", "y": "fare"}, "S").to_json(),
+            px.scatter(frame, x="sex", y="fare", title="S").to_json(),
+        )
+        assert_same_json(
+            template_figure(
+                "scatter_3d",
+                {"x": frame["age"], "y": frame["fare"], "z": frame["pclass"]},
+                {"x": "age", "y": "fare", "z": "pclass"},
+                "3D",
+            ).to_json(),
+            px.scatter_3d(frame, x="age", y="fare", z="pclass", title="3D").to_json(),
+        )
+
+
+def test_orientation_and_missing_strings_match_plotly_express():
+    df = titanic()
+    # A numeric x against a categorical y is horizontal in Plotly Express;
+    # cabin is mostly missing
+    for x, y in (("age", "cabin"), ("cabin", "age"), ("fare", "embarked")):
+        assert_same_json(
+            template_figure("scatter", {"x": df[x], "y": df[y]}, {"x": x, "y": y}, "S").to_json(),
+            px.scatter(df, x=x, y=y, title="S").to_json(),
+        )
+    counts = df["fare"].round().value_counts().reset_index()
+    counts.columns = ["fare", "label"]
+    counts["label"] = counts["label"].astype(str)
+    assert_same_json(
+        template_figure("bar", {"x": counts["fare"], "y": counts["label"]}, {"x": "fare", "y": "label"}, "B").to_json(),
+        px.bar(counts, x="fare", y="label", title="B").to_json(),
+    )
+
+
+def test_datetime_and_boolean_columns_match_plotly_express():
+    df = titanic()
+    df["boarded"] = pd.Timestamp("1912-04-10") + pd.to_timedelta(df.index, unit="h")
+    df["adult"] = df["age"] >= 18
+    assert_same_json(
+        template_figure("histogram", {"x": df["boarded"]}, {"x": "boarded"}, "H").to_json(),
+        px.histogram(df, x="boarded", title="H").to_json(),
+    )
+    for x, y in (("boarded", "fare"), ("adult", "fare")):
+        assert_same_json(
+            template_figure("scatter", {"x": df[x], "y": df[y]}, {"x": x, "y": y}, "S").to_json(),
+            px.scatter(df, x=x, y=y, title="S").to_json(),
+        )
+    counts = df["boarded"].dt.floor("D").value_counts().reset_index()
+    counts.columns = ["boarded", "count"]
+    assert_same_json(
+        template_figure("bar", {"x": counts["boarded"], "y": counts["count"]}, {"x": "boarded", "y": "count"}, "B").to_json(),
+        px.bar(counts, x="boarded", y="count", title="B").to_json(),
+    )
+
+
+if __name__ == "__main__":
+    test_count_charts_match_plotly_express()
+    test_row_level_charts_match_plotly_express()
+    test_orientation_and_missing_strings_match_plotly_express()
+    test_datetime_and_boolean_columns_match_plotly_express()
+    print("chart template tests passed")
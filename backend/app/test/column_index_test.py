@@ -0,0 +1,83 @@
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+os.environ.setdefault("LLM_PROVIDER", "stub")
+
+from app.agent.intent_parser import build_schema_text, select_prompt_columns
+from app.config import settings
+from app.core.column_index import ColumnIndex
+from app.core.dataset_manager import DatasetManager
+
+ROWS = 20
+
+
+def wide_frame() -> pd.DataFrame:
+    columns = {f"metric_{i:03d}": range(ROWS) for i in range(100)}
+    columns.update({
+        "order_total": [float(i) for i in range(ROWS)],
+        "customer_region": ["north", "south", "east", "west"] * (ROWS // 4),
+        "survived": [i % 2 for i in range(ROWS)],
+        "shipping_mode": ["air", "ground"] * (ROWS // 2),
+    })
+    return pd.DataFrame(columns)
+
+
+def test_top_columns_match_names_typos_and_values():
+    index = ColumnIndex(wide_frame())
+
+    # Name token, compact multi-word name, typo and a categorical value
+    assert "order_total" in index.top_columns("average order total", 5)
+    assert "order_total" in index.top_columns("mean ordertotal", 5)
+    assert "survived" in index.top_columns("how many survivd", 5)
+    assert "shipping_mode" in index.top_columns("list the shipping modes", 5)
+    assert "customer_region" in index.top_columns("sales in the north", 5)
+
+    selected = index.top_columns("order total by shipping mode for the south", 5)
+    assert len(selected) == 5
+    assert {"order_total", "shipping_mode", "customer_region"} <= set(selected)
+    # Dataset order is kept, and the rest is padded with the leading columns
+    assert selected == [c for c in index.columns if c in selected]
+    assert selected[:2] == ["metric_000", "metric_001"]
+
+
+def test_narrow_datasets_are_not_pruned():
+    frame = wide_frame()[["order_total", "survived"]]
+    assert ColumnIndex(frame).top_columns("anything", 5) == ["order_total", "survived"]
+
+
+def test_prompt_only_lists_selected_columns():
+    manager = DatasetManager()
+    manager.load_dataframe(wide_frame(), typed=True)
+    schema = manager.get_schema()
+    all_columns = [c["name"] for c in schema["columns"]]
+
+    limit = settings.PROMPT_MAX_COLUMNS
+    settings.PROMPT_MAX_COLUMNS = 10
+    try:
+        question = "average order total per customer region"
+        columns = select_prompt_columns(question, schema, manager.get_column_index())
+        assert len(columns) == 10
+        assert {"order_total", "customer_region"} <= set(columns)
+
+        text = build_schema_text(schema, columns)
+        assert "order_total" in text and "metric_099" not in text
+        assert len(text) < len(build_schema_text(schema)) / 5
+
+        # Without an index, or under the limit, every column is sent
+        assert select_prompt_columns(question, schema) == all_columns
+        settings.PROMPT_MAX_COLUMNS = len(all_columns)
+        assert select_prompt_columns(question, schema, manager.get_column_index()) == all_columns
+    finally:
+        settings.PROMPT_MAX_COLUMNS = limit
+
+
+if __name__ == "__main__":
+    test_top_columns_match_names_typos_and_values()
+    test_narrow_datasets_are_not_pruned()
+    test_prompt_only_lists_selected_columns()
+    print("column index tests passed")
@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.column_resolver import ColumnResolver
+
+COLUMNS = ["passengerid", "survived", "pclass", "name", "sex", "age", "sibsp", "parch", "ticket", "fare", "cabin", "embarked"]
+
+
+def test_exact_and_alias_lookups():
+    resolver = ColumnResolver(COLUMNS)
+    assert resolver.resolve("fare") == "fare"
+    # Names are normalized like the stored columns
+    assert resolver.resolve("  Age ") == "age"
+    # Separators are stripped for the compact alias
+    assert resolver.resolve("Passenger ID") == "passengerid"
+    assert resolver.resolve("p-class") == "pclass"
+    assert resolver.resolve_many(["Sex", "embarked"]) == ["sex", "embarked"]
+
+
+def test_fuzzy_lookups():
+    resolver = ColumnResolver(COLUMNS)
+    assert resolver.resolve("survivd") == "survived"
+    assert resolver.resolve("embark") == "embarked"
+
+    # Token narrowing prefers a column sharing a word with the query
+    shared = ColumnResolver(["order_date", "order_total", "ship_date"])
+    assert shared.resolve("order totl") == "order_total"
+
+
+def test_misses_raise_and_are_memoized():
+    resolver = ColumnResolver(COLUMNS)
+    for _ in range(2):
+        try:
+            resolver.resolve("zzzz")
+            assert False, "expected a miss"
+        except ValueError as exc:
+            assert "zzzz" in str(exc)
+    assert resolver._memo["zzzz"] is None
+
+    resolver.resolve("Age")
+    assert resolver._memo["age"] == "age"
+
+
+def test_memo_is_bounded():
+    resolver = ColumnResolver(COLUMNS)
+    resolver.MAX_MEMO_SIZE = 4
+    for name in ("age", "fare", "sex", "name", "cabin"):
+        resolver.resolve(name)
+    assert len(resolver._memo) <= 4
+    assert resolver.resolve("age") == "age"
+
+
+if __name__ == "__main__":
+    test_exact_and_alias_lookups()
+    test_fuzzy_lookups()
+    test_misses_raise_and_are_memoized()
+    test_memo_is_bounded()
+    print("column resolver tests passed")
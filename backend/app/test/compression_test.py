@@ -0,0 +1,80 @@
+import gzip
+import sys
+from pathlib import Path
+from typing import Optional
+
+import zstandard
+from fastapi import FastAPI, Header, Response
+from fastapi.testclient import TestClient
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.api.compression import CompressionMiddleware, choose_encoding
+from app.api.etags import etag_matches, make_etag, not_modified
+
+PAYLOAD = {"chart": "x" * 5000, "rows": list(range(500))}
+ETAG = make_etag("test", "v1")
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/payload")
+    def payload(response: Response, if_none_match: Optional[str] = Header(None)):
+        if etag_matches(if_none_match, ETAG):
+            return not_modified(ETAG, "/payload")
+        response.headers["ETag"] = ETAG
+        return PAYLOAD
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_choose_encoding_honours_q_values():
+    assert choose_encoding("gzip, deflate, br, zstd") == "zstd"
+    assert choose_encoding("gzip;q=1.0, zstd;q=0.5") == "gzip"
+    assert choose_encoding("zstd;q=0, gzip") == "gzip"
+    assert choose_encoding("*") == "zstd"
+    assert choose_encoding("br, identity") is None
+    assert choose_encoding("") is None
+
+
+def test_responses_are_compressed_per_accept_encoding():
+    client = make_client()
+    plain = client.get("/payload", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == ETAG
+
+    for encoding, decode in (("gzip", gzip.decompress), ("zstd", zstandard.ZstdDecompressor().decompress)):
+        # Streaming keeps the raw, still-encoded bytes
+        with client.stream("GET", "/payload", headers={"Accept-Encoding": encoding}) as response:
+            raw = b"".join(response.iter_raw())
+            assert response.headers["content-encoding"] == encoding
+            assert response.headers["vary"] == "Accept-Encoding"
+            assert response.headers["etag"] == f'{ETAG[:-1]}-{encoding}"'
+            assert int(response.headers["content-length"]) == len(raw) < len(plain.content)
+        assert decode(raw) == plain.content
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_if_none_match_returns_304():
+    client = make_client()
+    tagged = client.get("/payload", headers={"Accept-Encoding": "zstd"}).headers["etag"]
+    for tag in (ETAG, tagged, f"W/{ETAG}", f'"other", {ETAG}', "*"):
+        response = client.get("/payload", headers={"If-None-Match": tag})
+        assert response.status_code == 304 and response.content == b""
+    assert client.get("/payload", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+if __name__ == "__main__":
+    test_choose_encoding_honours_q_values()
+    test_responses_are_compressed_per_accept_encoding()
+    test_if_none_match_returns_304()
+    print("compression tests passed")
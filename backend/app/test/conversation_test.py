@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.agent.conversation import resolve_follow_up
+from app.core.column_resolver import ColumnResolver
+
+COLUMNS = ["passengerid", "survived", "pclass", "name", "sex", "age", "sibsp", "parch", "ticket", "fare", "cabin", "embarked"]
+RESOLVER = ColumnResolver(COLUMNS)
+
+MEAN_AGE = {"intent": "analytics", "operation": "mean", "columns": ["age"]}
+MEAN_FARE_BY_CLASS = {"intent": "aggregation", "operation": "mean", "columns": ["fare"], "group_by": "pclass"}
+MALE_SHARE = {"intent": "analytics", "operation": "percentage", "columns": ["sex"], "value": "male"}
+MONTHLY_SALES = {"intent": "timeseries", "operation": "resample", "chart_type": "line_chart",
+                 "columns": ["order_date", "sales"], "period": "month"}
+
+
+def test_column_and_chart_swaps_are_resolved_locally():
+    assert resolve_follow_up("what about fare?", MEAN_AGE, RESOLVER) == {**MEAN_AGE, "columns": ["fare"]}
+    assert resolve_follow_up("same for sibsp", MEAN_AGE, RESOLVER)["columns"] == ["sibsp"]
+
+    pie = resolve_follow_up("now as a pie chart", MEAN_FARE_BY_CLASS, RESOLVER)
+    assert pie == {"intent": "visualization", "chart_type": "pie_chart", "columns": ["pclass"]}
+
+    area = resolve_follow_up("now as an area chart", MONTHLY_SALES, RESOLVER)
+    assert area == {**MONTHLY_SALES, "chart_type": "area_chart"}
+
+
+def test_new_questions_go_to_the_llm():
+    cases = [
+        ("now how many passengers survived by class", MEAN_AGE),
+        ("now what is the median of age", MEAN_FARE_BY_CLASS),
+        ("now what is the correlation of age and fare", MEAN_AGE),
+        ("Now count missing values for cabin", MEAN_AGE),
+        ("what about for pclass", MALE_SHARE),
+        ("now by sex", MEAN_FARE_BY_CLASS),
+        ("what percentage survived for fare", MEAN_AGE),
+    ]
+    for question, last_intent in cases:
+        assert resolve_follow_up(question, last_intent, RESOLVER) is None, question
+
+
+def test_multi_column_charts_need_enough_columns():
+    for question in ("now as a scatter", "now as a 3d scatter"):
+        assert resolve_follow_up(question, MEAN_AGE, RESOLVER) is None, question
+    assert resolve_follow_up("now as a 3d scatter", MEAN_FARE_BY_CLASS, RESOLVER) is None
+
+    two_columns = {"intent": "visualization", "chart_type": "bar_chart", "columns": ["age", "fare"]}
+    assert resolve_follow_up("now as a scatter", two_columns, RESOLVER) == {**two_columns, "chart_type": "scatter"}
+    assert resolve_follow_up("now as a 3d scatter", two_columns, RESOLVER) is None
+
+
+def test_no_previous_intent_or_no_cue():
+    assert resolve_follow_up("what about fare?", None, RESOLVER) is None
+    assert resolve_follow_up("fare", MEAN_AGE, RESOLVER) is None
+
+
+if __name__ == "__main__":
+    test_column_and_chart_swaps_are_resolved_locally()
+    test_new_questions_go_to_the_llm()
+    test_multi_column_charts_need_enough_columns()
+    test_no_previous_intent_or_no_cue()
+    print("conversation tests passed")
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.api.routes import router
+from app.config import settings
+
+FRAME = pd.DataFrame({
+    "Age": [22.0, None, 35.0, None],
+    "Name": ["a", "b", None, "d"],
+    "Fare": [7.25, 71.3, 8.05, 53.1],
+})
+MISSING = {"age": 2, "name": 1, "fare": 0}
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_upload_and_register_return_missing_values(tmp_path):
+    client = make_client()
+    body = FRAME.to_csv(index=False).encode()
+
+    uploaded = client.post("/upload-dataset", files={"file": ("people.csv", body)})
+    assert uploaded.status_code == 200
+    assert uploaded.json()["schema"]["missing_values"] == MISSING
+
+    lean = client.post("/upload-dataset", files={"file": ("people.csv", body)}, data={"stats": "false"})
+    assert "missing_values" not in lean.json()["schema"]
+    assert [c["name"] for c in lean.json()["schema"]["columns"]] == list(MISSING)
+
+    (tmp_path / "people.csv").write_bytes(body)
+    roots = settings.DATASET_ROOTS
+    settings.DATASET_ROOTS = [Path(tmp_path)]
+    try:
+        registered = client.post("/register-dataset", json={"path": str(tmp_path / "people.csv")})
+        assert registered.status_code == 200
+        assert registered.json()["schema"]["missing_values"] == MISSING
+
+        lean = client.post("/register-dataset", json={"path": str(tmp_path / "people.csv"), "stats": False})
+        assert "missing_values" not in lean.json()["schema"]
+    finally:
+        settings.DATASET_ROOTS = roots
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_upload_and_register_return_missing_values(Path(directory))
+    print("dataset route tests passed")
@@ -0,0 +1,149 @@
+import gzip
+import io
+import sys
+from pathlib import Path
+
+import pandas as pd
+import zstandard
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.api.routes import router
+from app.config import settings
+from app.core.ingestion import detect_format, iter_dataset, read_dataset, resolve_dataset_path
+
+FRAME = pd.DataFrame({
+    "Passenger Id": range(1, 7),
+    "Age": [22.0, 38.0, None, 35.0, 54.0, 2.0],
+    "Sex": ["male", "female", "female", "male", "male", "female"],
+})
+
+
+def encode(filename: str) -> bytes:
+    """FRAME written in the format the filename asks for."""
+    fmt, compression = detect_format(filename)
+    buffer = io.BytesIO()
+    if fmt == "parquet":
+        FRAME.to_parquet(buffer, index=False)
+    elif fmt == "feather":
+        FRAME.to_feather(buffer)
+    elif fmt == "jsonl":
+        FRAME.to_json(buffer, orient="records", lines=True)
+    else:
+        FRAME.to_csv(buffer, index=False)
+    data = buffer.getvalue()
+    if compression == "gzip":
+        return gzip.compress(data)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    return data
+
+
+FILENAMES = [
+    "people.csv", "people.csv.gz", "people.csv.zst",
+    "people.parquet", "people.pq", "people.feather", "people.arrow",
+    "people.jsonl", "people.ndjson", "people.jsonl.gz", "people.jsonl.zst",
+]
+
+
+def test_every_format_reads_back(tmp_path):
+    for filename in FILENAMES:
+        data = encode(filename)
+        from_buffer = read_dataset(io.BytesIO(data), filename)
+        pd.testing.assert_frame_equal(from_buffer, FRAME, check_dtype=False, obj=filename)
+
+        path = tmp_path / filename
+        path.write_bytes(data)
+        from_path = read_dataset(path, filename, memory_map=True)
+        pd.testing.assert_frame_equal(from_path, FRAME, check_dtype=False, obj=filename)
+
+        # Raw and normalized names both select a column
+        projected = read_dataset(io.BytesIO(data), filename, columns=["passenger_id", "Sex"])
+        assert list(projected.columns) == ["Passenger Id", "Sex"], filename
+
+        chunks = list(iter_dataset(io.BytesIO(data), filename, chunk_rows=4))
+        pd.testing.assert_frame_equal(
+            pd.concat(chunks, ignore_index=True), FRAME, check_dtype=False, obj=filename
+        )
+
+
+def test_unsupported_files_and_unknown_columns_are_rejected():
+    for filename in ("people.xlsx", "people.csv.bz2", "people", ""):
+        try:
+            detect_format(filename)
+            assert False, f"{filename!r} was accepted"
+        except ValueError:
+            pass
+    try:
+        read_dataset(io.BytesIO(encode("people.parquet")), "people.parquet", columns=["fare"])
+        assert False, "unknown column was accepted"
+    except ValueError as exc:
+        assert "fare" in str(exc)
+
+
+def test_upload_endpoint_accepts_every_format():
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    for filename in FILENAMES:
+        response = client.post("/upload-dataset", files={"file": (filename, encode(filename))})
+        assert response.status_code == 200, (filename, response.text)
+        schema = response.json()["schema"]
+        assert [c["name"] for c in schema["columns"]] == ["passenger_id", "age", "sex"], filename
+
+    assert client.post("/upload-dataset", files={"file": ("people.xlsx", b"x")}).status_code == 400
+    response = client.post(
+        "/upload-dataset", files={"file": ("people.csv", encode("people.csv"))}, data={"columns": "fare"}
+    )
+    assert response.status_code == 400
+
+
+def test_register_rejects_paths_outside_the_roots(tmp_path):
+    root = tmp_path / "data"
+    (root / "nested").mkdir(parents=True)
+    (root / "nested" / "people.csv").write_bytes(encode("people.csv"))
+    (root / "notes.txt").write_text("x")
+    outside = tmp_path / "secret.csv"
+    outside.write_bytes(encode("people.csv"))
+    (root / "link.csv").symlink_to(outside)
+
+    roots = settings.DATASET_ROOTS
+    settings.DATASET_ROOTS = [root]
+    try:
+        assert resolve_dataset_path("nested/people.csv") == (root / "nested" / "people.csv").resolve()
+        assert resolve_dataset_path("nested/../nested/people.csv") == (root / "nested" / "people.csv").resolve()
+
+        escapes = ["../secret.csv", "nested/../../secret.csv", str(outside), "link.csv", "/etc/passwd"]
+        for path in escapes:
+            try:
+                resolve_dataset_path(path)
+                assert False, f"{path} escaped the dataset root"
+            except PermissionError:
+                pass
+
+        app = FastAPI()
+        app.include_router(router)
+        client = TestClient(app)
+        for path in escapes:
+            assert client.post("/register-dataset", json={"path": path}).status_code == 403, path
+        assert client.post("/register-dataset", json={"path": "missing.csv"}).status_code == 404
+        assert client.post("/register-dataset", json={"path": "notes.txt"}).status_code == 400
+        assert client.post("/register-dataset", json={"path": "nested/people.csv"}).status_code == 200
+    finally:
+        settings.DATASET_ROOTS = roots
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_every_format_reads_back(Path(directory))
+    with tempfile.TemporaryDirectory() as directory:
+        test_register_rejects_paths_outside_the_roots(Path(directory))
+    test_unsupported_files_and_unknown_columns_are_rejected()
+    test_upload_endpoint_accepts_every_format()
+    print("ingestion tests passed")
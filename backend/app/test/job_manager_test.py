@@ -0,0 +1,161 @@
+import io
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import settings
+from app.core.job_manager import JobManager
+from app.core.session_manager import session_manager
+
+ROWS = 100
+CSV = pd.DataFrame({"id": range(ROWS), "fare": [i * 1.5 for i in range(ROWS)]}).to_csv(index=False).encode()
+
+
+class GatedSource(io.RawIOBase):
+    """Upload stream whose first read blocks until the test opens the gate."""
+
+    def __init__(self, data: bytes):
+        self.data = io.BytesIO(data)
+        self.gate = threading.Event()
+        self.reading = threading.Event()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        self.reading.set()
+        self.gate.wait(5)
+        return self.data.readinto(buffer)
+
+    def tell(self):
+        return self.data.tell()
+
+
+def wait_finished(job, timeout: float = 10.0):
+    deadline = time.time() + timeout
+    while job.finished_at is None:
+        assert time.time() < deadline, "job did not finish"
+        time.sleep(0.01)
+
+
+def with_settings(**values):
+    saved = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    return saved
+
+
+def test_job_goes_from_queued_through_running_to_done():
+    saved = with_settings(INGEST_CHUNK_ROWS=10, INGEST_SNAPSHOT_ROWS=10, SCHEMA_STATS_BACKGROUND=False)
+    manager = JobManager()
+    try:
+        source = GatedSource(CSV)
+        job = manager.submit_ingestion(source, "rows.csv", len(CSV))
+        assert job.status in ("queued", "running")
+        assert manager.get(job.id) is job
+
+        assert source.reading.wait(5)
+        assert (job.status, job.stage) == ("running", "parsing")
+        assert job.finished_at is None
+        assert session_manager.is_ingesting(job.session_id)
+
+        source.gate.set()
+        wait_finished(job)
+        assert (job.status, job.stage, job.error) == ("done", "done", None)
+        assert job.rows_parsed == job.rows_published == ROWS
+        assert job.bytes_read == job.total_bytes
+        # Snapshot thresholds double: 10, 20, 40 and 80 rows
+        assert job.snapshots == 4
+        assert not session_manager.is_ingesting(job.session_id)
+        assert len(session_manager.get_dataset_manager(job.session_id).get_dataframe()) == ROWS
+        assert source.closed
+        assert job.to_dict()["status"] == "done"
+    finally:
+        manager.shutdown()
+        with_settings(**saved)
+
+
+def test_failed_job_removes_its_session():
+    saved = with_settings(SCHEMA_STATS_BACKGROUND=False)
+    manager = JobManager()
+    try:
+        job = manager.submit_ingestion(io.BytesIO(b"id,fare\n"), "empty.csv", 8)
+        wait_finished(job)
+        assert job.status == "failed"
+        assert "empty" in job.error
+        assert job.session_id not in session_manager.list_sessions()
+
+        try:
+            manager.submit_ingestion(io.BytesIO(b""), "rows.xlsx", 0)
+            assert False, "unsupported format was accepted"
+        except ValueError:
+            pass
+    finally:
+        manager.shutdown()
+        with_settings(**saved)
+
+
+def test_finished_jobs_beyond_the_limit_are_forgotten():
+    saved = with_settings(INGEST_MAX_JOBS=2, SCHEMA_STATS_BACKGROUND=False)
+    manager = JobManager()
+    try:
+        jobs = []
+        for _ in range(4):
+            job = manager.submit_ingestion(io.BytesIO(CSV), "rows.csv", len(CSV))
+            wait_finished(job)
+            jobs.append(job)
+        assert manager.get(jobs[0].id) is None
+        assert manager.get(jobs[-1].id) is jobs[-1]
+    finally:
+        manager.shutdown()
+        with_settings(**saved)
+
+
+class BlockedProfile:
+    """Column profile whose warm() holds its worker until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def is_warm(self):
+        return False
+
+    def warm(self):
+        self.started.set()
+        self.release.wait(5)
+
+    def get_column_profile(self):
+        return self
+
+
+def test_warming_does_not_delay_ingestion():
+    saved = with_settings(INGEST_WORKERS=1, WARM_WORKERS=1, SCHEMA_STATS_BACKGROUND=True)
+    manager = JobManager()
+    profile = BlockedProfile()
+    try:
+        manager.warm_profile(profile)
+        assert profile.started.wait(5)
+
+        job = manager.submit_ingestion(io.BytesIO(CSV), "rows.csv", len(CSV))
+        wait_finished(job, timeout=3)
+        assert job.status == "done"
+        assert not profile.release.is_set()
+    finally:
+        profile.release.set()
+        manager.shutdown()
+        with_settings(**saved)
+
+
+if __name__ == "__main__":
+    test_job_goes_from_queued_through_running_to_done()
+    test_failed_job_removes_its_session()
+    test_finished_jobs_beyond_the_limit_are_forgotten()
+    test_warming_does_not_delay_ingestion()
+    print("job manager tests passed")
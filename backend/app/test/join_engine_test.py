@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.join_engine import hash_join
+
+
+def frames():
+    rng = np.random.default_rng(3)
+    left = pd.DataFrame({
+        "key": rng.integers(0, 500, 20_000).astype(float),
+        "region": rng.choice(["north", "south", "east"], 20_000),
+        "amount": rng.random(20_000),
+        "unused": "x",
+    })
+    left.loc[::41, "key"] = np.nan
+    right = pd.DataFrame({
+        "key": np.repeat(np.arange(0, 800, dtype=float), 2),
+        "region": np.tile(["north", "south"], 800),
+        "rate": rng.random(1600),
+    })
+    return left, right
+
+
+def assert_same_rows(result: pd.DataFrame, expected: pd.DataFrame):
+    columns = list(expected.columns)
+    result = result[columns].sort_values(columns).reset_index(drop=True)
+    expected = expected.sort_values(columns).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_inner_and_left_joins_match_pandas():
+    left, right = frames()
+    for how in ("inner", "left"):
+        for keys in (["key"], ["key", "region"]):
+            result = hash_join(left, right, keys, how=how, left_columns=["amount"], right_columns=["rate"])
+            expected = left[["amount"] + keys].merge(right[keys + ["rate"]], on=keys, how=how)
+            assert result.build_side == "right"
+            assert "unused" not in result.frame.columns
+            assert_same_rows(result.frame, expected)
+
+
+def test_builds_from_the_smaller_side_and_keeps_left_order():
+    left, right = frames()
+    result = hash_join(right, left, ["key"], how="left", left_columns=["rate"], right_columns=["amount"])
+    expected = right[["rate", "key"]].merge(left[["key", "amount"]], on="key", how="left")
+    assert result.build_side == "left"
+    pd.testing.assert_frame_equal(result.frame[["rate", "key", "amount"]], expected, check_dtype=False)
+
+
+def test_rejects_incompatible_keys():
+    left, right = frames()
+    try:
+        hash_join(left, right, ["region"], ["key"])
+        raise AssertionError("expected a ValueError")
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_inner_and_left_joins_match_pandas()
+    test_builds_from_the_smaller_side_and_keeps_left_order()
+    test_rejects_incompatible_keys()
+    print("join engine tests passed")
@@ -0,0 +1,184 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+os.environ.setdefault("LLM_PROVIDER", "stub")
+
+from langchain_core.messages import HumanMessage
+
+from app.config import settings
+from app.agent.llm_client import create_provider_llm
+from app.agent.llm_gateway import LLMGateway
+
+
+class MockGroqServer:
+    """
+    Local OpenAI-compatible endpoint standing in for Groq.
+
+    `script` is consumed one entry per request: an int status code to fail
+    with, or a float delay in seconds before answering. When it runs out
+    every request succeeds immediately.
+    """
+
+    def __init__(self, answer: str, script=(), retry_after: str = "0"):
+        self.answer = answer
+        self.script = list(script)
+        self.retry_after = retry_after
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                server.requests += 1
+                step = server.script.pop(0) if server.script else None
+
+                if isinstance(step, int):
+                    body = json.dumps({"error": {"message": "rate limited", "type": "rate_limit"}}).encode()
+                    self.send_response(step)
+                    self.send_header("Retry-After", server.retry_after)
+                else:
+                    if step:
+                        time.sleep(step)
+                    body = json.dumps({
+                        "id": "chatcmpl-mock",
+                        "object": "chat.completion",
+                        "created": 0,
+                        "model": "mock",
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": server.answer},
+                            "finish_reason": "stop",
+                        }],
+                        "usage": {"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4},
+                    }).encode()
+                    self.send_response(200)
+
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def groq_client(server: MockGroqServer):
+    # The client reads these when it is built, so the globals go back right after
+    saved = (settings.GROQ_API_KEY, settings.GROQ_BASE_URL)
+    settings.GROQ_API_KEY = "test-key"
+    settings.GROQ_BASE_URL = server.url
+    try:
+        return create_provider_llm("groq")
+    finally:
+        settings.GROQ_API_KEY, settings.GROQ_BASE_URL = saved
+
+
+def ask(gateway: LLMGateway) -> str:
+    return gateway.invoke([HumanMessage(content="ping")]).content
+
+
+def test_retries_rate_limited_calls():
+    primary = MockGroqServer("primary", script=[429, 429])
+    try:
+        gateway = LLMGateway(primary=groq_client(primary), primary_name="groq", max_retries=3, retry_backoff_ms=1)
+        assert ask(gateway) == "primary"
+        assert primary.requests == 3
+    finally:
+        primary.close()
+
+
+def test_gives_up_after_max_retries():
+    primary = MockGroqServer("primary", script=[429, 429, 429])
+    try:
+        gateway = LLMGateway(primary=groq_client(primary), primary_name="groq", max_retries=1, retry_backoff_ms=1)
+        try:
+            ask(gateway)
+            raise AssertionError("expected the rate limit error")
+        except Exception as e:
+            assert getattr(e, "status_code", None) == 429
+        assert primary.requests == 2
+    finally:
+        primary.close()
+
+
+def test_caps_retry_after():
+    primary = MockGroqServer("primary", script=[429], retry_after="3600")
+    try:
+        gateway = LLMGateway(
+            primary=groq_client(primary), primary_name="groq",
+            max_retries=1, max_retry_delay_s=0.05,
+        )
+        started = time.perf_counter()
+        assert ask(gateway) == "primary"
+        assert time.perf_counter() - started < 1.5
+    finally:
+        primary.close()
+
+
+def test_hedges_slow_primary_to_fallback():
+    primary = MockGroqServer("primary", script=[2.0])
+    fallback = MockGroqServer("fallback")
+    try:
+        gateway = LLMGateway(
+            primary=groq_client(primary), primary_name="groq",
+            fallback=groq_client(fallback), fallback_name="groq-fallback",
+            hedge_after_ms=100,
+        )
+        started = time.perf_counter()
+        assert ask(gateway) == "fallback"
+        assert time.perf_counter() - started < 1.5
+        assert fallback.requests == 1
+    finally:
+        primary.close()
+        fallback.close()
+
+
+def test_fails_over_on_primary_error():
+    primary = MockGroqServer("primary", script=[500])
+    fallback = MockGroqServer("fallback")
+    try:
+        gateway = LLMGateway(
+            primary=groq_client(primary), primary_name="groq",
+            fallback=groq_client(fallback), fallback_name="groq-fallback",
+            hedge_after_ms=1000,
+        )
+        assert ask(gateway) == "fallback"
+    finally:
+        primary.close()
+        fallback.close()
+
+
+def test_building_a_client_leaves_settings_untouched():
+    server = MockGroqServer("primary")
+    before = (settings.GROQ_API_KEY, settings.GROQ_BASE_URL)
+    try:
+        gateway = LLMGateway(primary=groq_client(server), primary_name="groq")
+        assert ask(gateway) == "primary"
+        assert (settings.GROQ_API_KEY, settings.GROQ_BASE_URL) == before
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    test_retries_rate_limited_calls()
+    test_gives_up_after_max_retries()
+    test_caps_retry_after()
+    test_hedges_slow_primary_to_fallback()
+    test_fails_over_on_primary_error()
+    test_building_a_client_leaves_settings_untouched()
+    print("llm gateway tests passed")
@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.api.routes import router
+from app.core.metrics import METRIC_PREFIX, MetricsRegistry, metrics, span, start_request_timings
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    registry.counter("calls_total", "Calls.")
+    registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    registry.gauge("open_things", "Open things.", lambda: [({"kind": "a"}, 3), ({}, 1.5)])
+
+    registry.inc("calls_total", endpoint="/chat")
+    registry.inc("calls_total", 2, endpoint="/chat")
+    registry.inc("calls_total", endpoint='say "hi"\n')
+    for value in (0.05, 0.5, 5.0):
+        registry.observe("latency_seconds", value, stage="llm")
+
+    lines = registry.render().splitlines()
+    name = METRIC_PREFIX + "calls_total"
+    assert f"# HELP {name} Calls." in lines
+    assert f"# TYPE {name} counter" in lines
+    assert f'{name}{{endpoint="/chat"}} 3.0' in lines
+    assert f'{name}{{endpoint="say \\"hi\\"\\n"}} 1.0' in lines
+
+    # Buckets are cumulative and end with +Inf == count
+    latency = METRIC_PREFIX + "latency_seconds"
+    assert f"# TYPE {latency} histogram" in lines
+    assert f'{latency}_bucket{{stage="llm",le="0.1"}} 1' in lines
+    assert f'{latency}_bucket{{stage="llm",le="1.0"}} 2' in lines
+    assert f'{latency}_bucket{{stage="llm",le="+Inf"}} 3' in lines
+    assert f'{latency}_sum{{stage="llm"}} 5.55' in lines
+    assert f'{latency}_count{{stage="llm"}} 3' in lines
+
+    gauge = METRIC_PREFIX + "open_things"
+    assert f"# TYPE {gauge} gauge" in lines
+    assert f'{gauge}{{kind="a"}} 3' in lines
+    assert f"{gauge} 1.5" in lines
+
+
+def test_span_records_histogram_and_request_timings():
+    timings = start_request_timings()
+    with span("metrics_test.stage"):
+        pass
+    assert [t["stage"] for t in timings] == ["metrics_test.stage"]
+    assert timings[0]["ms"] >= 0
+    assert 'stage="metrics_test.stage"' in metrics.render()
+
+
+def test_metrics_endpoint():
+    app = FastAPI()
+    app.include_router(router)
+    metrics.inc("requests_total", endpoint="/metrics-test", outcome="ok")
+
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    for name in ("stage_duration_seconds", "requests_total", "llm_requests_total", "session_memory_bytes"):
+        assert f"# TYPE {METRIC_PREFIX}{name} " in body
+    assert f'{METRIC_PREFIX}requests_total{{endpoint="/metrics-test",outcome="ok"}} 1.0' in body
+
+
+if __name__ == "__main__":
+    test_render_prometheus_text()
+    test_span_records_histogram_and_request_timings()
+    test_metrics_endpoint()
+    print("metrics tests passed")
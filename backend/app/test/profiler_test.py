@@ -0,0 +1,71 @@
+import contextvars
+import marshal
+import sys
+import threading
+from pathlib import Path
+
+from fastapi import HTTPException
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.api.routes import _require_admin
+from app.config import settings
+from app.core.profiler import ProfileStore
+
+
+def tool_thread_work():
+    return sum(i * i for i in range(20_000))
+
+
+def test_admin_is_denied_without_a_configured_token():
+    token = settings.ADMIN_TOKEN
+    try:
+        settings.ADMIN_TOKEN = None
+        for supplied in (None, "", "anything"):
+            try:
+                _require_admin(supplied)
+                assert False, "admin access allowed without ADMIN_TOKEN"
+            except HTTPException as exc:
+                assert exc.status_code == 403
+
+        settings.ADMIN_TOKEN = "secret"
+        _require_admin("secret")
+        for supplied in (None, "wrong"):
+            try:
+                _require_admin(supplied)
+                assert False, "admin access allowed with a wrong token"
+            except HTTPException as exc:
+                assert exc.status_code == 403
+    finally:
+        settings.ADMIN_TOKEN = token
+
+
+def test_tool_threads_are_merged_into_the_request_profile():
+    store = ProfileStore()
+
+    def run_tool():
+        with store.profile_thread():
+            tool_thread_work()
+
+    with store.profile("/chat") as entry:
+        # Same hand-off the agent uses for concurrent tool calls
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(run_tool,))
+        thread.start()
+        thread.join()
+
+    stored = store.get(entry["id"])
+    assert "tool_thread_work" in stored["report"]
+    functions = {name for (_, _, name) in marshal.loads(stored["pstats"])}
+    assert "tool_thread_work" in functions
+
+    # Outside a profiled request it is a no-op
+    with store.profile_thread():
+        tool_thread_work()
+    assert len(store.list_profiles()) == 1
+
+
+if __name__ == "__main__":
+    test_admin_is_denied_without_a_configured_token()
+    test_tool_threads_are_merged_into_the_request_profile()
+    print("profiler tests passed")
@@ -0,0 +1,59 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+os.environ.setdefault("LLM_PROVIDER", "stub")
+
+from app.agent.result_summarizer import summarize_tool_result
+from app.config import settings
+from app.utils.tokens import estimate_tokens
+
+KEYS = 100_000
+
+
+def test_digest_of_100k_key_dict_fits_the_budget():
+    data = {f"category_with_a_long_name_{i:06d}": i for i in range(KEYS)}
+    result = {"text_response": "Value counts for category. " * 40, "chart": "{}", "data": data}
+    raw_tokens = estimate_tokens(json.dumps(result))
+
+    for budget in (settings.TOOL_SUMMARY_TOKEN_BUDGET, 150):
+        content = summarize_tool_result(result, budget=budget, top_k=1000)
+        assert estimate_tokens(content) <= budget, (budget, estimate_tokens(content))
+        assert estimate_tokens(content) < raw_tokens / 1000
+
+        digest = json.loads(content)
+        assert digest["has_chart"] is True
+        data_digest = digest["data"]
+        assert data_digest["size"] == KEYS
+        assert data_digest["total"] == sum(range(KEYS))
+        assert data_digest["numeric"]["max"] == KEYS - 1
+        # Largest values first
+        if data_digest["top"]:
+            assert data_digest["top"][0] == [f"category_with_a_long_name_{KEYS - 1:06d}", KEYS - 1]
+
+
+def test_large_lists_and_records_fit_the_budget():
+    budget = settings.TOOL_SUMMARY_TOKEN_BUDGET
+    rows = [{"pclass": i % 3, "sex": "male" if i % 2 else "female", "fare": i * 0.5} for i in range(KEYS)]
+    for data in (list(range(KEYS)), rows):
+        content = summarize_tool_result({"text_response": "ok", "data": data}, budget=budget)
+        assert estimate_tokens(content) <= budget
+
+    digest = json.loads(summarize_tool_result({"text_response": "ok", "data": rows}))["data"]
+    assert digest["rows"] == KEYS
+    assert digest["numeric"]["fare"]["max"] == (KEYS - 1) * 0.5
+
+
+def test_plain_text_results_are_clipped():
+    content = summarize_tool_result("x" * 10_000, budget=50)
+    assert len(content) == 200
+
+
+if __name__ == "__main__":
+    test_digest_of_100k_key_dict_fits_the_budget()
+    test_large_lists_and_records_fit_the_budget()
+    test_plain_text_results_are_clipped()
+    print("result summarizer tests passed")
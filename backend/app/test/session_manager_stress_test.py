@@ -0,0 +1,188 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.session_manager import SessionManager
+
+BATCH_ROWS = 50
+
+
+def make_batch(batch_id: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "Batch": [batch_id] * BATCH_ROWS,
+        "Value": range(BATCH_ROWS),
+    })
+
+
+def check_consistent(dataset_manager):
+    # A reader must only ever see a fully built dataset version
+    df = dataset_manager.get_dataframe()
+    assert dataset_manager.version is not None
+    assert dataset_manager.get_schema() is not None
+    assert dataset_manager.get_column_profile() is not None
+    assert len(df) == len(dataset_manager.raw_df)
+    assert len(df) % BATCH_ROWS == 0
+    assert dataset_manager.get_column_profile().cardinality("batch") == len(df) // BATCH_ROWS
+
+
+def test_readers_never_see_partial_versions_while_appending():
+    manager = SessionManager()
+    session_id = manager.create_session_from_dataframe(make_batch(0))
+
+    appends = 40
+    stop = threading.Event()
+    errors = []
+    reads = []
+
+    def reader():
+        count = 0
+        while not stop.is_set():
+            try:
+                with manager.read_session(session_id) as dm:
+                    check_consistent(dm)
+                check_consistent(manager.get_dataset_manager(session_id))
+                count += 1
+                time.sleep(0.0005)
+            except Exception as e:
+                errors.append(e)
+                return
+        reads.append(count)
+
+    def writer(batch_id):
+        manager.append_to_session(session_id, make_batch(batch_id))
+
+    readers = [threading.Thread(target=reader) for _ in range(8)]
+    for t in readers:
+        t.start()
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(writer, range(1, appends + 1)))
+
+    stop.set()
+    for t in readers:
+        t.join()
+
+    assert not errors, errors
+    assert sum(reads) > 0
+
+    # Concurrent appends are serialized, so none of them is lost
+    final = manager.get_dataset_manager(session_id).get_dataframe()
+    assert len(final) == (appends + 1) * BATCH_ROWS
+    assert sorted(final["batch"].unique()) == list(range(appends + 1))
+    print(f"reads={sum(reads)} final_rows={len(final)}")
+
+
+def test_concurrent_session_creation_and_deletion():
+    manager = SessionManager()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        session_ids = list(pool.map(lambda i: manager.create_session_from_dataframe(make_batch(i)), range(64)))
+
+    assert len(set(session_ids)) == 64
+    assert set(manager.list_sessions()) == set(session_ids)
+
+    to_delete = session_ids[::2]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(manager.delete_session, to_delete))
+
+    assert set(manager.list_sessions()) == set(session_ids[1::2])
+    print(f"created={len(session_ids)} remaining={len(manager.list_sessions())}")
+
+
+def test_identical_content_is_loaded_once_and_copied_on_write():
+    manager = SessionManager()
+    parses = []
+
+    def load():
+        parses.append(1)
+        return make_batch(0)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: manager.create_session_for_content("batch-0", load), range(16)))
+
+    session_ids = [sid for sid, _ in results]
+    assert len(parses) == 1
+    assert sum(1 for _, reused in results if not reused) == 1
+    shared = manager.get_dataset_manager(session_ids[0])
+    assert all(manager.get_dataset_manager(sid) is shared for sid in session_ids)
+
+    # Appending gives that session its own copy; the others keep the shared one
+    manager.append_to_session(session_ids[0], make_batch(1))
+    assert len(manager.get_dataset_manager(session_ids[0]).get_dataframe()) == 2 * BATCH_ROWS
+    assert manager.get_dataset_manager(session_ids[1]) is shared
+    assert len(shared.get_dataframe()) == BATCH_ROWS
+
+    for sid in session_ids[1:]:
+        manager.delete_session(sid)
+    assert "batch-0" not in manager._shared
+    print(f"sessions={len(session_ids)} parses={len(parses)}")
+
+
+def test_failed_parses_do_not_leak_content_locks():
+    manager = SessionManager()
+
+    def broken():
+        raise ValueError("not a CSV")
+
+    def attempt(i):
+        try:
+            manager.create_session_for_content(f"bad-{i}", broken)
+        except ValueError:
+            return True
+        return False
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert all(pool.map(attempt, range(32)))
+
+    assert manager._content_locks == {}
+    assert manager._shared == {}
+
+    # The same content can still be loaded once it parses
+    session_id, reused = manager.create_session_for_content("bad-0", lambda: make_batch(0))
+    assert not reused
+    manager.delete_session(session_id)
+    assert manager._content_locks == {}
+
+
+def test_queries_do_not_hold_the_session_lock():
+    from app.core.orchestrator import QueryOrchestrator
+    from app.core.session_manager import session_manager
+
+    session_id = session_manager.create_session_from_dataframe(make_batch(0))
+    orchestrator = QueryOrchestrator()
+    published = []
+
+    def refresh_mid_query(dataset_manager, intent):
+        # A refresh and a nested lookup while the query is still running
+        writer = threading.Thread(target=lambda: published.append(
+            session_manager.replace_session_data(session_id, make_batch(1))
+        ))
+        writer.start()
+        writer.join(5)
+        assert published, "refresh waited for the running query"
+        assert session_manager.current(session_id) is published[0]
+        # The query keeps its own, unchanged version
+        df = dataset_manager.get_dataframe()
+        return {"rows": len(df), "batch": int(df["batch"][0])}
+
+    orchestrator._handle_analytics = refresh_mid_query
+    try:
+        result = orchestrator.execute(session_id, {"intent": "analytics", "operation": "count", "columns": ["value"]})
+        assert result == {"rows": BATCH_ROWS, "batch": 0}
+    finally:
+        session_manager.delete_session(session_id)
+
+
+if __name__ == "__main__":
+    test_readers_never_see_partial_versions_while_appending()
+    test_concurrent_session_creation_and_deletion()
+    test_identical_content_is_loaded_once_and_copied_on_write()
+    test_failed_parses_do_not_leak_content_locks()
+    test_queries_do_not_hold_the_session_lock()
@@ -0,0 +1,65 @@
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.sql_engine import run_sql
+
+DATASET = Path(__file__).parent.parent / "data" / "titanic.csv"
+
+
+def test_select_with_window_function():
+    df = pd.read_csv(DATASET)
+    result = run_sql(
+        "SELECT Sex, count(*) AS n, rank() OVER (ORDER BY count(*) DESC) AS r FROM data GROUP BY Sex",
+        {"data": df},
+    )
+    rows = {row["Sex"]: row for row in result.to_records()}
+    assert rows["male"]["n"] == (df["Sex"] == "male").sum()
+    assert rows["male"]["r"] == 1
+    assert not result.truncated
+
+
+def test_row_limit_truncates():
+    df = pd.read_csv(DATASET)
+    result = run_sql("SELECT * FROM data", {"data": df}, max_rows=10)
+    assert result.table.num_rows == 10
+    assert result.truncated
+
+
+def test_only_single_select_statements_run():
+    df = pd.read_csv(DATASET)
+    for query in (
+        "DELETE FROM data",
+        "SELECT 1; SELECT 2",
+        "COPY (SELECT 1) TO 'out.csv'",
+        "SELECT * FROM read_csv('/etc/passwd')",
+    ):
+        try:
+            run_sql(query, {"data": df})
+            raise AssertionError(f"expected {query!r} to be rejected")
+        except ValueError:
+            pass
+
+
+def test_slow_queries_are_interrupted():
+    big = pd.DataFrame({"x": range(2_000_000)})
+    started = time.perf_counter()
+    try:
+        run_sql("SELECT count(*) FROM big a, big b WHERE a.x * b.x = 7", {"big": big}, timeout_s=0.3)
+        raise AssertionError("expected a TimeoutError")
+    except TimeoutError:
+        pass
+    assert time.perf_counter() - started < 5
+
+
+if __name__ == "__main__":
+    test_select_with_window_function()
+    test_row_limit_truncates()
+    test_only_single_select_statements_run()
+    test_slow_queries_are_interrupted()
+    print("sql engine tests passed")
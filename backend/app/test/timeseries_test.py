@@ -0,0 +1,86 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.dataset_manager import DatasetManager
+from app.core.time_index import TimeIndex
+
+
+def sales_frame(rows: int = 20_000) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    seconds = rng.integers(0, 2 * 365 * 86400, rows)
+    sales = rng.random(rows) * 100
+    sales[::25] = np.nan
+    return pd.DataFrame({
+        "Order Date": (pd.Timestamp("2023-01-01") + pd.to_timedelta(seconds, unit="s")).strftime("%Y-%m-%d %H:%M:%S"),
+        "Sales": sales,
+    })
+
+
+def test_date_columns_are_parsed_to_datetime64():
+    dm = DatasetManager()
+    dm.load_dataframe(sales_frame(100))
+    assert dm.get_schema()["datetime_columns"] == ["order_date"]
+    assert pd.api.types.is_datetime64_any_dtype(dm.get_dataframe()["order_date"])
+
+
+def test_columns_with_unparseable_values_stay_text():
+    frame = sales_frame(100)
+    frame.loc[3, "Order Date"] = "not recorded"
+    frame.loc[7, "Order Date"] = None
+    dm = DatasetManager()
+    dm.load_dataframe(frame)
+    assert dm.get_schema()["datetime_columns"] == []
+    # Nothing was coerced to NaT: the text value and the one real gap survive
+    df = dm.get_dataframe()
+    assert df["order_date"].isna().sum() == 1
+    assert df.loc[3, "order_date"] == "not recorded"
+
+
+def test_resample_matches_pandas():
+    dm = DatasetManager()
+    dm.load_dataframe(sales_frame())
+    df = dm.get_dataframe()
+    index = dm.get_time_index("order_date")
+    assert dm.get_time_index("order_date") is index
+
+    expected = df.set_index("order_date")["sales"].resample("MS")
+    for aggregation in ("sum", "mean", "count"):
+        result = index.resample("month", df["sales"].to_numpy(), aggregation)
+        assert np.allclose(result.to_numpy(), getattr(expected, aggregation)().to_numpy())
+
+    rows = index.resample("week")
+    assert rows.sum() == len(df)
+
+
+def test_range_filter_uses_inclusive_dates():
+    dm = DatasetManager()
+    dm.load_dataframe(sales_frame())
+    df = dm.get_dataframe()
+    index = dm.get_time_index("order_date")
+
+    positions = index.range_positions("2023-03-01", "2023-03-31")
+    expected = df.index[(df["order_date"] >= "2023-03-01") & (df["order_date"] < "2023-04-01")]
+    assert sorted(positions) == sorted(expected)
+
+
+def test_time_index_rejects_non_datetime_columns():
+    try:
+        TimeIndex(pd.Series([1, 2, 3], name="sales"))
+        raise AssertionError("expected a ValueError")
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_date_columns_are_parsed_to_datetime64()
+    test_columns_with_unparseable_values_stay_text()
+    test_resample_matches_pandas()
+    test_range_filter_uses_inclusive_dates()
+    test_time_index_rejects_non_datetime_columns()
+    print("timeseries tests passed")
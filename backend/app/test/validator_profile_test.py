@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.column_profile import ColumnProfile
+from app.core.column_resolver import ColumnResolver
+from app.core.tool_validator import validator
+
+ROWS = 200
+FRAME = pd.DataFrame({
+    "survived": np.arange(ROWS) % 2,
+    "fare": np.linspace(5, 500, ROWS),
+    "sex": np.where(np.arange(ROWS) % 3, "male", "female"),
+    "ticket": [f"T{i}" for i in range(ROWS)],
+    "boarded": pd.date_range("1912-04-01", periods=ROWS, freq="h"),
+})
+
+
+def checks(intent):
+    # df=None: every check has to come from the profile and resolver
+    profile = ColumnProfile(FRAME)
+    resolver = ColumnResolver(FRAME.columns)
+    return profile, lambda kind: getattr(validator, f"validate_{kind}")(None, dict(intent), resolver, profile)
+
+
+def chart(chart_type, column):
+    _, validate = checks({"intent": "visualization", "chart_type": chart_type, "columns": [column]})
+    return validate("chart").corrected_intent["chart_type"]
+
+
+def test_chart_checks_use_the_profile():
+    # Low-cardinality numeric columns may be pies; high-cardinality ones may not
+    assert chart("pie_chart", "survived") == "pie_chart"
+    assert chart("pie_chart", "fare") == "histogram"
+    assert chart("pie_chart", "sex") == "pie_chart"
+    assert chart("pie_chart", "ticket") == "bar_chart"
+    assert chart("histogram", "sex") == "bar_chart"
+    assert chart("area_chart", "ticket") == "bar_chart"
+    assert chart("histogram", "Fare") == "histogram"
+
+
+def test_analytics_and_timeseries_checks_use_the_profile():
+    _, validate = checks({"intent": "analytics", "operation": "mean", "columns": ["sex"]})
+    try:
+        validate("analytics")
+        assert False, "mean of a categorical column passed validation"
+    except ValueError as exc:
+        assert "numeric" in str(exc)
+
+    _, validate = checks({"intent": "analytics", "operation": "describe", "columns": ["fare", "sex"]})
+    result = validate("analytics")
+    assert result.corrected_intent["columns"] == ["fare"]
+
+    _, validate = checks({"intent": "timeseries", "columns": ["fare", "boarded"], "aggregation": "sum"})
+    result = validate("timeseries")
+    assert result.corrected_intent["columns"] == ["boarded", "fare"]
+
+
+def test_profile_stats_are_memoized():
+    profile, validate = checks({"intent": "visualization", "chart_type": "pie_chart", "columns": ["ticket"]})
+    validate("chart")
+    assert profile._cardinalities["ticket"] == (ROWS, True)
+    assert profile.get("fare").null_count == 0
+    assert profile.dtype_classes == {
+        "survived": "numeric", "fare": "numeric", "sex": "categorical",
+        "ticket": "categorical", "boarded": "datetime",
+    }
+
+
+if __name__ == "__main__":
+    test_chart_checks_use_the_profile()
+    test_analytics_and_timeseries_checks_use_the_profile()
+    test_profile_stats_are_memoized()
+    print("validator profile tests passed")
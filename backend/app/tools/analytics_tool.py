@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 def calculate_mean(df:pd.DataFrame, column:str) -> float:
@@ -47,3 +48,69 @@ def value_counts(df: pd.DataFrame, column: str):
         raise ValueError(f"Column '{column}' not found in DataFrame.")
 
     return df[column].value_counts().to_dict() # .value_counts() returns the frequency count and to_dict() converts it to a dictionary format. 
+
+
+def parse_quantiles(value) -> list:
+    """
+    Reads the quantiles asked for: "0.9", "90", "90%", "25,50,75" or a list.
+    Percent-style numbers above 1 are scaled down. Defaults to the quartiles.
+    """
+    if value in (None, "", " ", []):
+        return [0.25, 0.5, 0.75]
+    parts = value if isinstance(value, list) else str(value).replace("%", "").replace(";", ",").split(",")
+    quantiles = []
+    for part in parts:
+        try:
+            q = float(str(part).strip().lower().lstrip("p"))
+        except ValueError:
+            raise ValueError(f"Invalid quantile '{part}'.")
+        q = q / 100 if q > 1 else q
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile '{part}' must be between 0 and 100%.")
+        quantiles.append(round(q, 6))
+    return quantiles
+
+
+def describe(profile, columns=None) -> pd.DataFrame:
+    """
+    count/mean/std/var/min/quartiles/max for numeric columns (all of them
+    when none are given), read from the session's cached numeric summary.
+    """
+    return profile.numeric_summary(columns or None)
+
+
+def calculate_quantiles(profile, columns, quantiles) -> pd.DataFrame:
+    """Requested quantiles per column, from the session's stats cache."""
+    return profile.quantiles(quantiles, columns)
+
+
+def calculate_spread(profile, column: str, measure: str) -> float:
+    """Sample standard deviation ("std") or variance ("var") of a numeric column."""
+    if measure not in ("std", "var"):
+        raise ValueError(f"Unsupported spread measure '{measure}'.")
+    var = profile.variance(column)
+    return float(np.sqrt(var)) if measure == "std" else var
+
+
+def correlation_matrix(profile, columns=None) -> pd.DataFrame:
+    """Pearson correlations across numeric columns (all of them when none are given)."""
+    matrix = profile.correlation(columns or None)
+    if len(matrix) < 2:
+        raise ValueError("Correlation needs at least two numeric columns.")
+    return matrix
+
+
+def crosstab(df: pd.DataFrame, row: str, column: str) -> pd.DataFrame:
+    """Row counts for every combination of two columns' values."""
+    if row not in df.columns or column not in df.columns:
+        raise ValueError("Invalid column name")
+    return pd.crosstab(df[row], df[column])
+
+
+def frame_to_dict(frame: pd.DataFrame) -> dict:
+    """Nested {row: {column: value}} with NaN as None, for JSON responses."""
+    return {
+        str(index): {str(col): (None if pd.isna(value) else value.item() if hasattr(value, "item") else value)
+                     for col, value in row.items()}
+        for index, row in frame.iterrows()
+    }
@@ -0,0 +1,167 @@
+import threading
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+# Plotly's own typed-array encoder, so arrays come out exactly as in fig.to_json()
+from _plotly_utils.utils import to_typed_array_spec
+
+# Stand-in names used when compiling templates; replaced with the real
+# column names and title when a chart is rendered
+PLACEHOLDERS = {"x": "__x__", "y": "__y__", "z": "__z__", "title": "__title__"}
+
+# Plotly Express switches scatter-type traces to WebGL above this many rows
+WEBGL_ROWS = 1000
+
+# chart kind → (Plotly Express builder, trace fields holding data, WebGL-capable).
+# Builders take the frame, the column name per role and the title.
+CHARTS = {
+    "bar": (lambda df, n, title: px.bar(df, x=n["x"], y=n["y"], title=title), {"x": "x", "y": "y"}, False),
+    "histogram": (lambda df, n, title: px.histogram(df, x=n["x"], title=title), {"x": "x"}, False),
+    "pie": (lambda df, n, title: px.pie(df, names=n["x"], values=n["y"], title=title), {"labels": "x", "values": "y"}, False),
+    "area": (lambda df, n, title: px.area(df, x=n["x"], y=n["y"], title=title), {"x": "x", "y": "y"}, True),
+    "scatter": (lambda df, n, title: px.scatter(df, x=n["x"], y=n["y"], title=title), {"x": "x", "y": "y"}, True),
+    "scatter_3d": (
+        lambda df, n, title: px.scatter_3d(df, x=n["x"], y=n["y"], z=n["z"], title=title),
+        {"x": "x", "y": "y", "z": "z"},
+        False,
+    ),
+}
+
+# Role value kinds a template can be compiled for. Plotly Express picks
+# some trace attributes from them (a numeric x against a categorical y
+# gives a horizontal orientation), so templates are compiled per kind.
+# Other data (datetimes, booleans, categoricals, nullable extension types)
+# is encoded in ways the template does not reproduce and goes through
+# Plotly Express instead.
+ROLE_KINDS = ("numeric", "string")
+
+
+class ChartTemplate:
+    """
+    The figure JSON Plotly Express produces for one chart kind, compiled once
+    with placeholder data. Rendering copies the small trace and layout dicts,
+    swaps in the real names and data arrays and serializes without Plotly's
+    property validation. The theme (layout.template) is shared, not copied.
+    """
+
+    def __init__(self, figure: Dict[str, Any], fields: Dict[str, str]):
+        self.trace = figure["data"][0]
+        self.layout = figure["layout"]
+        self.fields = fields
+        for field in fields:
+            self.trace.pop(field, None)
+
+    def render(self, arrays: Dict[str, Any], names: Dict[str, str], title: str) -> str:
+        replacements = {PLACEHOLDERS[role]: str(name) for role, name in names.items()}
+        replacements[PLACEHOLDERS["title"]] = title
+
+        trace = _substitute(self.trace, replacements)
+        for field, role in self.fields.items():
+            trace[field] = _encode(arrays[role])
+
+        layout = {
+            key: value if key == "template" else _substitute(value, replacements)
+            for key, value in self.layout.items()
+        }
+        return pio.to_json({"data": [trace], "layout": layout}, validate=False)
+
+
+class TemplateFigure:
+    """Stands in for a plotly Figure where only to_json() is needed."""
+
+    def __init__(self, template: ChartTemplate, arrays: Dict[str, Any], names: Dict[str, str], title: str):
+        self._template = template
+        self._arrays = arrays
+        self._names = names
+        self._title = title
+
+    def to_json(self) -> str:
+        return self._template.render(self._arrays, self._names, self._title)
+
+
+_templates: Dict[Tuple[str, bool, Tuple[str, ...]], ChartTemplate] = {}
+_lock = threading.Lock()
+
+
+def get_template(kind: str, webgl: bool = False, role_kinds: Optional[Dict[str, str]] = None) -> ChartTemplate:
+    builder, fields, webgl_capable = CHARTS[kind]
+    roles = sorted(set(fields.values()))
+    role_kinds = role_kinds or {}
+    kinds = tuple(role_kinds.get(role, "numeric") for role in roles)
+    key = (kind, webgl and webgl_capable, kinds)
+    template = _templates.get(key)
+    if template is None:
+        rows = WEBGL_ROWS + 1 if key[1] else 2
+        sample = pd.DataFrame({
+            PLACEHOLDERS[role]: _sample_values(role_kind, rows) for role, role_kind in zip(roles, kinds)
+        })
+        template = ChartTemplate(builder(sample, PLACEHOLDERS, PLACEHOLDERS["title"]).to_plotly_json(), fields)
+        with _lock:
+            template = _templates.setdefault(key, template)
+    return template
+
+
+def template_figure(kind: str, arrays: Dict[str, Any], names: Dict[str, str], title: str):
+    """
+    A figure of the given kind, equivalent to the Plotly Express call it
+    replaces. `arrays` and `names` are keyed by role (x, y, z). Data the
+    templates don't cover is charted with Plotly Express directly.
+    """
+    role_kinds = {role: _role_kind(values) for role, values in arrays.items()}
+    if None in role_kinds.values():
+        frame = pd.DataFrame({names[role]: _as_series(values) for role, values in arrays.items()})
+        return CHARTS[kind][0](frame, names, title)
+    rows = len(next(iter(arrays.values())))
+    return TemplateFigure(get_template(kind, rows > WEBGL_ROWS, role_kinds), arrays, names, title)
+
+
+def _role_kind(values) -> Optional[str]:
+    dtype = values.dtype if hasattr(values, "dtype") else np.asarray(values).dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iuf":
+        return "numeric"
+    if (isinstance(dtype, np.dtype) and dtype.kind == "O") or isinstance(dtype, pd.StringDtype):
+        array = values.to_numpy() if isinstance(values, (pd.Series, pd.Index)) else np.asarray(values, dtype=object)
+        # Object columns holding anything but strings and missing values
+        # (numbers, timestamps) are left to Plotly Express
+        if all(isinstance(v, str) for v in pd.unique(array[pd.notna(array)])):
+            return "string"
+    return None
+
+
+def _sample_values(role_kind: str, rows: int) -> np.ndarray:
+    if role_kind == "string":
+        return np.array([f"v{i}" for i in range(rows)], dtype=object)
+    return np.arange(rows)
+
+
+def _as_series(values) -> pd.Series:
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    return series.reset_index(drop=True)
+
+
+def _substitute(value, replacements: Dict[str, str]):
+    if isinstance(value, str):
+        for placeholder, text in replacements.items():
+            if placeholder in value:
+                value = value.replace(placeholder, text)
+        return value
+    if isinstance(value, dict):
+        return {k: _substitute(v, replacements) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_substitute(v, replacements) for v in value]
+    return value
+
+
+def _encode(values: Sequence) -> Any:
+    # Numeric arrays become plotly.js typed arrays (base64), like Plotly does;
+    # strings are sent as a plain list, with missing values as null
+    array = values.to_numpy() if isinstance(values, (pd.Series, pd.Index)) else np.asarray(values)
+    if array.dtype.kind in "iuf":
+        return to_typed_array_spec(array)
+    missing = pd.isna(array)
+    if missing.any():
+        array = np.where(missing, None, array)
+    return array.tolist()
@@ -0,0 +1,38 @@
+from typing import Optional
+
+import pandas as pd
+
+from app.core.time_index import TimeIndex
+
+
+def resample_series(df: pd.DataFrame, index: TimeIndex, value_col: Optional[str], period: str,
+                    aggregation: str, start=None, end=None) -> pd.DataFrame:
+    """
+    Aggregates value_col (or row counts when it is None) per period of the
+    indexed time column, limited to [start, end].
+    """
+    values = df[value_col].to_numpy(dtype="float64", na_value=float("nan")) if value_col else None
+    series = index.resample(period, values, aggregation, start, end)
+    return series.rename_axis(index.column).reset_index(name=_value_name(value_col, aggregation))
+
+
+def rolling_series(points: pd.DataFrame, window: int) -> pd.DataFrame:
+    """Rolling mean over the last `window` periods of a resampled series."""
+    if window < 1:
+        raise ValueError("Rolling window must be at least 1 period.")
+    time_col, value_col = points.columns
+    result = points[[time_col]].copy()
+    result[f"rolling_{value_col}"] = points[value_col].rolling(window, min_periods=1).mean()
+    return result
+
+
+def period_change(points: pd.DataFrame) -> pd.DataFrame:
+    """Percentage change of a resampled series from one period to the next."""
+    time_col, value_col = points.columns
+    result = points[[time_col]].copy()
+    result[f"{value_col}_pct_change"] = points[value_col].pct_change(fill_method=None) * 100
+    return result
+
+
+def _value_name(value_col: Optional[str], aggregation: str) -> str:
+    return f"{aggregation}_{value_col}" if value_col else "count"
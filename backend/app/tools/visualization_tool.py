@@ -1,7 +1,13 @@
 import pandas as pd
 import plotly.express as px
 
+from app.config import settings
+from app.tools.chart_templates import template_figure
+
+
 def create_histogram(df:pd.DataFrame, column:str):
+    if settings.CHART_TEMPLATES:
+        return template_figure("histogram", {"x": df[column]}, {"x": column}, f'Distribution of {column}')
     fig =  px.histogram(
         df,
         x= column,
@@ -12,7 +18,12 @@ def create_histogram(df:pd.DataFrame, column:str):
 def create_bar_chart(df:pd.DataFrame, column:str):
     counts = df[column].value_counts().reset_index()
     counts.columns = [column, 'count']
-    
+
+    if settings.CHART_TEMPLATES:
+        return template_figure(
+            "bar", {"x": counts[column], "y": counts['count']}, {"x": column, "y": 'count'},
+            f'Value Counts of {column}',
+        )
     fig =  px.bar(
         counts,
         x=column,
@@ -22,6 +33,8 @@ def create_bar_chart(df:pd.DataFrame, column:str):
     return fig
 
 def create_scatter(df:pd.DataFrame, x:str, y:str):
+    if settings.CHART_TEMPLATES:
+        return template_figure("scatter", {"x": df[x], "y": df[y]}, {"x": x, "y": y}, f'Scatter Plot of {y} vs {x}')
     fig = px.scatter(
         df,
         x=x,
@@ -31,6 +44,11 @@ def create_scatter(df:pd.DataFrame, x:str, y:str):
     return fig
 
 def create_3d_scatter(df:pd.DataFrame, x:str, y:str, z:str):
+    if settings.CHART_TEMPLATES:
+        return template_figure(
+            "scatter_3d", {"x": df[x], "y": df[y], "z": df[z]}, {"x": x, "y": y, "z": z},
+            f'3D Scatter Plot of {z} vs {x} and {y}',
+        )
     fig = px.scatter_3d(
         df,
         x=x,
@@ -48,6 +66,11 @@ def create_pie_chart(df: pd.DataFrame, column: str):
     if len(counts) > 8:
         raise ValueError("Too many categories for pie chart")
 
+    if settings.CHART_TEMPLATES:
+        return template_figure(
+            "pie", {"x": counts[column], "y": counts["count"]}, {"x": column, "y": "count"},
+            f"Proportion of {column}",
+        )
     fig = px.pie(
         counts,
         names=column,
@@ -61,19 +84,53 @@ def create_area_chart(df: pd.DataFrame, column: str):
         raise ValueError("Area chart requires numeric column")
 
     counts = (
-        df[column]
-        .dropna()
-        .value_counts()
+        df[column].value_counts()
         .sort_index()
         .reset_index()
     )
 
     counts.columns = [column, "count"]
 
+    if settings.CHART_TEMPLATES:
+        return template_figure(
+            "area", {"x": counts[column], "y": counts["count"]}, {"x": column, "y": "count"},
+            f"Area Distribution of {column}",
+        )
     fig = px.area(
         counts,
         x=column,
         y="count",
         title=f"Area Distribution of {column}"
     )
-    return fig
\ No newline at end of file
+    return fig
+def create_timeseries_chart(points: pd.DataFrame, x: str, y: str, kind: str = "line_chart"):
+    # Points are already aggregated per period server-side, so the figure
+    # carries one value per period rather than the raw rows
+    if kind == "area_chart":
+        plot = px.area
+    elif kind == "line_chart":
+        plot = px.line
+    else:
+        raise ValueError("Time series charts are line_chart or area_chart")
+
+    fig = plot(
+        points,
+        x=x,
+        y=y,
+        title=f"{y} over {x}",
+    )
+    return fig
+
+def create_heatmap(matrix: pd.DataFrame, title: str):
+    # Correlation matrices are pinned to [-1, 1] so colors mean the same on every chart
+    is_correlation = matrix.index.equals(matrix.columns) and matrix.abs().max().max() <= 1
+    fig = px.imshow(
+        matrix,
+        text_auto=".2f" if is_correlation else True,
+        color_continuous_scale="RdBu_r" if is_correlation else "Blues",
+        zmin=-1 if is_correlation else None,
+        zmax=1 if is_correlation else None,
+        aspect="auto",
+        title=title,
+    )
+    return fig
@@ -1,5 +1,18 @@
+import re
+import warnings
 import pandas as pd 
 
+# ISO dates (2024-01-31, 2024/01/31 12:00), day-first or month-first
+# (31/01/2024, 1-31-24) and "31 Jan 2024" / "Jan 31, 2024" style values
+DATE_PATTERN = re.compile(
+    r"^\s*(\d{4}[-/.]\d{1,2}[-/.]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4}"
+    r"|\d{1,2}\s+[A-Za-z]{3,9}\.?\s+\d{4}|[A-Za-z]{3,9}\.?\s+\d{1,2},?\s+\d{4})"
+    r"([ T]\d{1,2}:\d{2}(:\d{2}(\.\d+)?)?\s*(Z|[+-]\d{2}:?\d{2}|[AaPp][Mm])?)?\s*$"
+)
+# Share of sampled values that must look like dates before a column is parsed
+DATE_MATCH_RATIO = 0.9
+DATE_SAMPLE_SIZE = 200
+
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
     Normalize the column names of a DataFrame by converting them to lowercase and replacing spaces with underscores.
@@ -51,10 +64,56 @@ def enforce_types (df:pd.DataFrame) -> pd.DataFrame:
                 pass  # If conversion fails, leave the column as is
     return df
 
-def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
+def parse_datetimes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert text columns that hold dates into native datetime64 columns.
+
+    Only a sample of each text column is pattern-checked, so columns that are
+    clearly not dates (names, tickets, categories) are skipped without
+    parsing them in full. A column is converted only when every non-missing
+    value parses; otherwise it stays text, so no value is lost to NaT.
+
+    Args:
+        df (pd.DataFrame): The input DataFrame.
+
+    Returns:
+        pd.DataFrame: The DataFrame with date columns as datetime64.
+    """
+    for col in df.columns:
+        if df[col].dtype != 'object':
+            continue
+
+        sample = df[col].dropna().head(DATE_SAMPLE_SIZE)
+        if sample.empty:
+            continue
+        matches = sample.map(lambda v: isinstance(v, str) and bool(DATE_PATTERN.match(v)))
+        if matches.mean() < DATE_MATCH_RATIO:
+            continue
+
+        with warnings.catch_warnings():
+            # Mixed UTC offsets are left as text rather than forced to UTC
+            warnings.simplefilter('ignore')
+            try:
+                parsed = pd.to_datetime(df[col], errors='coerce', format='mixed')
+            except (ValueError, TypeError):
+                continue
+        if not pd.api.types.is_datetime64_any_dtype(parsed):
+            continue
+        if parsed.notna().sum() == df[col].notna().sum():
+            df[col] = parsed
+    return df
+
+def preprocess_data(df: pd.DataFrame, enforce: bool = True) -> pd.DataFrame:
+    """
+    Normalize column names and missing values. `enforce` runs the
+    string-to-number pass; typed sources (Parquet, Feather, JSON) skip it.
+    Date-like text columns become datetime64 either way.
+    """
 
     df =  normalize_columns(df)
     df =  standardize_missing_values(df)
-    df = enforce_types(df)
+    if enforce:
+        df = enforce_types(df)
+    df = parse_datetimes(df)
 
     return df
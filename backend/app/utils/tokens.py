@@ -0,0 +1,20 @@
+import math
+
+# Average characters per token for English prose and identifiers across the
+# tokenizers we use (Llama / Gemini); close enough for budgeting and metrics
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for a prompt without loading a tokenizer.
+
+    Args:
+        text (str): The prompt text.
+
+    Returns:
+        int: Estimated number of tokens.
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
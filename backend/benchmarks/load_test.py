@@ -0,0 +1,134 @@
+"""
+Offline load generator for the /chat path.
+
+Runs the agent loop (tool-calling LLM → dataset_analyst tool → intent parser
+→ orchestrator → final LLM call) against the deterministic stub LLM, so the
+numbers reflect this service's own overhead plus the simulated LLM latency.
+
+Usage (from backend/):
+    python benchmarks/load_test.py --requests 200 --concurrency 8
+    python benchmarks/load_test.py --mode http --latency-ms 300 --jitter-ms 100
+
+--mode agent calls run_agent() in-process; --mode http goes through the
+FastAPI app (routing + serialization) with TestClient.
+"""
+
+import argparse
+import os
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+QUESTIONS = [
+    "What is the average age?",
+    "What percentage of passengers survived?",
+    "Show age distribution as histogram",
+    "Show survived as pie chart",
+    "How many passengers by pclass?",
+    "Average fare by pclass",
+    "Show fare as area chart",
+    "Scatter of age and fare",
+    "How many missing values in cabin?",
+    "Show embarked as bar chart",
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated LLM latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform ± jitter on the latency")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mode", choices=["agent", "http"], default="agent")
+    parser.add_argument("--session-id", default="titanic_default")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="track peak allocations with tracemalloc (adds overhead)")
+    args = parser.parse_args()
+
+    # Must be set before app modules read the settings
+    os.environ["LLM_PROVIDER"] = "stub"
+    os.environ["STUB_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["STUB_LLM_JITTER_MS"] = str(args.jitter_ms)
+    os.environ["STUB_LLM_SEED"] = str(args.seed)
+
+    from app.core.dataset_manager import dataset_manager
+    from app.core.session_manager import session_manager
+    from app.agent.agent_executor import run_agent
+
+    dataset_manager.load_titanic_dataset()
+    session_manager.initialize_default_session(dataset_manager)
+
+    if args.mode == "http":
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        client = TestClient(app)
+
+        def send(query):
+            response = client.post("/chat", json={"query": query, "session_id": args.session_id})
+            response.raise_for_status()
+    else:
+        def send(query):
+            run_agent(query, args.session_id)
+
+    def timed(i):
+        query = QUESTIONS[i % len(QUESTIONS)]
+        start = time.perf_counter()
+        try:
+            send(query)
+            return time.perf_counter() - start, None
+        except Exception as e:
+            return time.perf_counter() - start, f"{query!r}: {e}"
+
+    # Warm-up outside the measurement (imports, Plotly templates, first LLM binding)
+    send(QUESTIONS[0])
+
+    if args.trace_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        outcomes = list(pool.map(timed, range(args.requests)))
+    wall = time.perf_counter() - start
+
+    peak_mb = None
+    if args.trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = peak / (1024 * 1024)
+
+    latencies = [seconds * 1000 for seconds, _ in outcomes]
+    errors = [error for _, error in outcomes if error]
+    # ru_maxrss is reported in KB on Linux
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"mode={args.mode} requests={args.requests} concurrency={args.concurrency} "
+          f"llm_latency={args.latency_ms}±{args.jitter_ms}ms")
+    print(f"throughput   {args.requests / wall:10.1f} req/s")
+    print(f"p50 latency  {statistics.median(latencies):10.1f} ms")
+    print(f"p99 latency  {percentile(latencies, 99):10.1f} ms")
+    print(f"max latency  {max(latencies):10.1f} ms")
+    print(f"max RSS      {max_rss_mb:10.1f} MB")
+    if peak_mb is not None:
+        print(f"peak traced  {peak_mb:10.1f} MB")
+    print(f"errors       {len(errors):10d}")
+    for error in errors[:5]:
+        print(f"  {error}")
+
+
+if __name__ == "__main__":
+    main()
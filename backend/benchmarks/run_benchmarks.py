@@ -0,0 +1,287 @@
+"""
+Offline benchmark suite for ingestion, preprocessing, tools and charting.
+
+Usage (from backend/):
+    python benchmarks/run_benchmarks.py --preset quick
+    python benchmarks/run_benchmarks.py --rows 1000000 --cols 100 --save-baseline
+    python benchmarks/run_benchmarks.py --preset full --max-cells 20000000000
+
+Every step is timed with perf_counter and run under tracemalloc to record the
+peak Python/NumPy allocation. Results are compared against a JSON baseline
+file; a step that got slower or hungrier than the tolerance allows is
+reported as a regression and the script exits with status 1.
+No LLM or network access is needed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Nothing here talks to an LLM; the stub provider keeps app imports offline
+os.environ.setdefault("LLM_PROVIDER", "stub")
+
+import pandas as pd
+
+from synthetic_data import TIME_COLUMN, columns_by_kind, ensure_csv
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+DEFAULT_DATA_DIR = BENCH_DIR / ".data"
+
+PRESETS = {
+    "quick": ([10_000], [10, 100]),
+    "full": ([10_000, 1_000_000, 10_000_000], [10, 100, 1000]),
+}
+
+# Differences below this are timer noise rather than regressions
+MIN_SECONDS_DELTA = 0.005
+MIN_PEAK_MB_DELTA = 1.0
+
+
+def measure(fn, repeat: int):
+    """Run fn `repeat` times; return (result, best seconds, peak MB of the first run)."""
+    best = None
+    peak_mb = None
+    result = None
+    for i in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        best = elapsed if best is None else min(best, elapsed)
+        if i == 0:
+            peak_mb = peak / (1024 * 1024)
+    return result, best, peak_mb
+
+
+def tool_steps(df: pd.DataFrame):
+    """
+    (name, callable) pairs covering the analytics, aggregation, time-series,
+    join, SQL and chart tools. Columns are picked by kind from the generated
+    schema; steps whose kinds are missing (small --cols) are left out.
+    """
+    from app.core.column_profile import ColumnProfile
+    from app.core.join_engine import hash_join
+    from app.core.sql_engine import DEFAULT_TABLE, run_sql
+    from app.core.time_index import TimeIndex
+    from app.tools.analytics_tool import (
+        calculate_mean,
+        calculate_percentage,
+        value_counts,
+        describe,
+        calculate_quantiles,
+        calculate_spread,
+        correlation_matrix,
+        crosstab,
+    )
+    from app.tools.aggregation_tool import groupby_count, groupby_mean
+    from app.tools.timeseries_tool import resample_series, rolling_series, period_change
+    from app.tools.visualization_tool import (
+        create_histogram,
+        create_bar_chart,
+        create_pie_chart,
+        create_area_chart,
+        create_scatter,
+        create_3d_scatter,
+    )
+
+    kinds = columns_by_kind(df.columns)
+    num, integer, cat, flag, ts = (kinds.get(kind, [None])[0] for kind in ("num", "int", "cat", "flag", TIME_COLUMN))
+    numeric = [c for c in (num, integer, flag) if c]
+
+    # A fresh profile per call, so the stats cache is measured cold
+    profile = lambda: ColumnProfile(df)
+
+    analytics = [
+        ("calculate_mean", (num,), lambda: calculate_mean(df, num)),
+        ("calculate_percentage", (cat,), lambda: calculate_percentage(df, cat, "alpha")),
+        ("value_counts", (cat,), lambda: value_counts(df, cat)),
+        ("describe", (num,), lambda: describe(profile())),
+        ("calculate_quantiles", (num,), lambda: calculate_quantiles(profile(), [num], [0.25, 0.5, 0.75])),
+        ("calculate_spread", (num,), lambda: calculate_spread(profile(), num, "std")),
+        ("correlation_matrix", (num, integer), lambda: correlation_matrix(profile(), numeric)),
+        ("crosstab", (cat, flag), lambda: crosstab(df, cat, flag)),
+        ("groupby_count", (cat,), lambda: groupby_count(df, cat)),
+        ("groupby_mean", (cat, num), lambda: groupby_mean(df, cat, num)),
+        ("time_index.build", (ts,), lambda: TimeIndex(df[ts])),
+        ("resample_series", (ts, num), lambda: resample_series(df, TimeIndex(df[ts]), num, "day", "mean")),
+        ("rolling_series", (ts, num),
+         lambda: rolling_series(resample_series(df, TimeIndex(df[ts]), num, "day", "mean"), 7)),
+        ("period_change", (ts, num),
+         lambda: period_change(resample_series(df, TimeIndex(df[ts]), num, "day", "mean"))),
+        ("hash_join", (cat, num),
+         lambda: hash_join(df, dimension_table(df, cat), [cat], left_columns=[num])),
+        ("run_sql", (cat, num), lambda: run_sql(
+            f'SELECT "{cat}", AVG("{num}") AS mean, COUNT(*) AS n FROM {DEFAULT_TABLE} GROUP BY 1',
+            {DEFAULT_TABLE: df},
+        )),
+    ]
+    charts = [
+        ("create_histogram", (num,), lambda: create_histogram(df, num)),
+        ("create_bar_chart", (cat,), lambda: create_bar_chart(df, cat)),
+        ("create_pie_chart", (flag,), lambda: create_pie_chart(df, flag)),
+        ("create_area_chart", (integer,), lambda: create_area_chart(df, integer)),
+        ("create_scatter", (num, integer), lambda: create_scatter(df, num, integer)),
+        ("create_3d_scatter", (num, integer, flag), lambda: create_3d_scatter(df, num, integer, flag)),
+    ]
+
+    def available(steps):
+        return [(name, fn) for name, needs, fn in steps if all(needs)]
+
+    return available(analytics), available(charts)
+
+
+def dimension_table(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """One row per distinct key with a label column: the small side of a star join."""
+    keys = df[key].dropna().unique()
+    return pd.DataFrame({key: keys, "label": [f"{key}={k}" for k in keys]})
+
+
+def query_intents(df: pd.DataFrame):
+    kinds = columns_by_kind(df.columns)
+    num = kinds.get("num", [None])[0]
+    cat = kinds.get("cat", [None])[0]
+    intents = [
+        ("mean", (num,), {"intent": "analytics", "operation": "mean", "columns": [num]}),
+        ("count", (cat,), {"intent": "analytics", "operation": "count", "columns": [cat]}),
+        ("groupby_mean", (num, cat), {"intent": "aggregation", "operation": "mean",
+                                      "columns": [num], "group_by": cat}),
+        ("histogram", (num,), {"intent": "visualization", "chart_type": "histogram",
+                               "columns": [num]}),
+    ]
+    return [(name, intent) for name, needs, intent in intents if all(needs)]
+
+
+def run_case(rows: int, cols: int, args, results: dict):
+    from app.core.dataset_manager import DatasetManager
+    from app.core.column_profile import ColumnProfile
+    from app.utils.preprocessing import preprocess_data
+
+    case = f"{rows}x{cols}"
+    csv_path = ensure_csv(rows, cols, args.data_dir)
+
+    def record(step, fn):
+        result, seconds, peak_mb = measure(fn, args.repeat)
+        results[f"{case}/{step}"] = {"seconds": round(seconds, 6), "peak_mb": round(peak_mb, 3)}
+        print(f"  {step:<32} {seconds * 1000:>10.1f} ms {peak_mb:>10.1f} MB")
+        return result
+
+    print(f"\n== {case} ({csv_path.stat().st_size / 1e6:.1f} MB csv)")
+
+    raw_df = record("read_csv", lambda: pd.read_csv(csv_path))
+    df = record("preprocess_data", lambda: preprocess_data(raw_df.copy()))
+    record("_generate_schema", lambda: DatasetManager()._generate_schema(df))
+    record("column_profile.warm", lambda: ColumnProfile(df).warm())
+
+    analytics, charts = tool_steps(df)
+    for name, fn in analytics:
+        record(name, fn)
+    for name, fn in charts:
+        fig = record(name, fn)
+        record(f"{name}.to_json", fig.to_json)
+
+    if not args.skip_query:
+        from fastapi.testclient import TestClient
+        from app.main import app
+        from app.core.session_manager import session_manager
+        from app.core.result_cache import result_cache
+
+        client = TestClient(app)
+        session_id = session_manager.create_session_from_dataframe(raw_df)
+        for name, intent in query_intents(raw_df):
+            def post(intent=intent):
+                # Measure the computation, not the result cache
+                result_cache.clear()
+                response = client.post("/query", json={"session_id": session_id, "intent": intent})
+                response.raise_for_status()
+                return response
+            record(f"/query {name}", post)
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        slower = current["seconds"] - previous["seconds"]
+        if slower > MIN_SECONDS_DELTA and current["seconds"] > previous["seconds"] * (1 + tolerance):
+            regressions.append(f"{key}: {previous['seconds']:.4f}s -> {current['seconds']:.4f}s")
+        heavier = current["peak_mb"] - previous["peak_mb"]
+        if heavier > MIN_PEAK_MB_DELTA and current["peak_mb"] > previous["peak_mb"] * (1 + tolerance):
+            regressions.append(f"{key}: {previous['peak_mb']:.1f}MB -> {current['peak_mb']:.1f}MB")
+    return regressions
+
+
+def parse_sizes(value: str):
+    return [int(v) for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--rows", type=parse_sizes, help="comma-separated row counts (overrides preset)")
+    parser.add_argument("--cols", type=parse_sizes, help="comma-separated column counts (overrides preset)")
+    parser.add_argument("--max-cells", type=int, default=100_000_000,
+                        help="skip row/column combinations larger than this many cells")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per step; the fastest is kept")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown (0.2 = 20%%)")
+    parser.add_argument("--skip-query", action="store_true", help="skip the end-to-end /query steps")
+    args = parser.parse_args()
+
+    preset_rows, preset_cols = PRESETS[args.preset]
+    row_sizes = args.rows or preset_rows
+    col_sizes = args.cols or preset_cols
+
+    results = {}
+    for rows in row_sizes:
+        for cols in col_sizes:
+            if rows * cols > args.max_cells:
+                print(f"\n== {rows}x{cols} skipped (over --max-cells)")
+                continue
+            run_case(rows, cols, args, results)
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text()).get("results", {})
+
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        merged = {**baseline, **results}
+        args.baseline.write_text(json.dumps({
+            "meta": {
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "machine": platform.machine(),
+                "cpu_count": os.cpu_count(),
+            },
+            "results": merged,
+        }, indent=2, sort_keys=True))
+        print(f"\nBaseline written to {args.baseline}")
+
+    if regressions:
+        print("\nREGRESSIONS:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    elif baseline:
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Synthetic CSV generation for the benchmark suite.
+
+Columns cycle through four kinds so every tool has something to run on:
+  num_<i>   float with ~5% missing values
+  int_<i>   small non-negative integers (area charts, low-cardinality numerics)
+  cat_<i>   low-cardinality strings with occasional "NA" placeholders
+  flag_<i>  binary 0/1 indicator
+plus a leading `ts` column of one-minute timestamps for the time-series
+steps. Generation is seeded, so a (rows, cols) pair always produces the same
+file. Benchmarks look columns up by kind with `columns_by_kind`, so they work
+with any column count.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+COLUMN_KINDS = ("num", "int", "cat", "flag")
+CATEGORIES = np.array(["alpha", "beta", "gamma", "delta", "epsilon", "NA"])
+TIME_COLUMN = "ts"
+TIME_START = pd.Timestamp("2020-01-01")
+CHUNK_ROWS = 500_000
+# Bumped whenever the generated layout changes, so cached files are rebuilt
+FORMAT_VERSION = 2
+
+
+def column_names(cols: int):
+    return [f"{COLUMN_KINDS[i % len(COLUMN_KINDS)]}_{i}" for i in range(cols)]
+
+
+def columns_by_kind(names: Iterable[str]) -> Dict[str, List[str]]:
+    """Generated column names grouped by kind ("num", "int", "cat", "flag", "ts")."""
+    kinds: Dict[str, List[str]] = {}
+    for name in names:
+        kind = TIME_COLUMN if name == TIME_COLUMN else name.split("_")[0]
+        kinds.setdefault(kind, []).append(name)
+    return kinds
+
+
+def generate_frame(rows: int, cols: int, seed: int = 0, first_row: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = {TIME_COLUMN: pd.date_range(TIME_START + pd.Timedelta(minutes=first_row), periods=rows, freq="min")}
+
+    for name in column_names(cols):
+        kind = name.split("_")[0]
+        if kind == "num":
+            values = rng.normal(50, 15, rows)
+            values[rng.random(rows) < 0.05] = np.nan
+        elif kind == "int":
+            values = rng.integers(0, 40, rows)
+        elif kind == "cat":
+            values = CATEGORIES[rng.integers(0, len(CATEGORIES), rows)]
+        else:
+            values = rng.integers(0, 2, rows)
+        data[name] = values
+
+    return pd.DataFrame(data)
+
+
+def ensure_csv(rows: int, cols: int, data_dir: Path) -> Path:
+    """Write the (rows, cols) dataset once and reuse it on later runs."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    path = data_dir / f"synthetic_v{FORMAT_VERSION}_{rows}x{cols}.csv"
+    if path.exists():
+        return path
+
+    tmp_path = path.with_suffix(".tmp")
+    # Written in chunks so the 10M-row files never need to fit in memory at once
+    for chunk_index, start in enumerate(range(0, rows, CHUNK_ROWS)):
+        chunk_rows = min(CHUNK_ROWS, rows - start)
+        chunk = generate_frame(chunk_rows, cols, seed=chunk_index, first_row=start)
+        chunk.to_csv(tmp_path, mode="w" if chunk_index == 0 else "a",
+                     header=chunk_index == 0, index=False)
+
+    tmp_path.rename(path)
+    return path
@@ -6,6 +6,7 @@ This app provides an interactive chat interface to analyze CSV datasets using na
 import streamlit as st
 import requests
 import json
+import uuid
 import plotly.io as pio
 
 
@@ -44,6 +45,10 @@ def initialize_session_state():
     if "dataset_uploaded" not in st.session_state:
         st.session_state.dataset_uploaded = False
 
+    # Lets the backend treat follow-ups ("now as a pie chart") as one conversation
+    if "conversation_id" not in st.session_state:
+        st.session_state.conversation_id = str(uuid.uuid4())
+
 
 initialize_session_state()
 
@@ -78,13 +83,14 @@ def upload_dataset(uploaded_file):
         return False, f"Error: {str(e)}", None
 
 
-def send_chat_query(query, session_id):
+def send_chat_query(query, session_id, conversation_id=None):
     """
     Send a chat query to the backend.
     
     Args:
         query: User query string
         session_id: Current session ID
+        conversation_id: Conversation the query belongs to
         
     Returns:
         tuple: (success: bool, response_data: dict or None, error_msg: str or None)
@@ -94,7 +100,8 @@ def send_chat_query(query, session_id):
             f"{BACKEND_URL}/chat",
             json={
                 "query": query,
-                "session_id": session_id
+                "session_id": session_id,
+                "conversation_id": conversation_id
             }
         )
         
@@ -151,9 +158,9 @@ def render_sidebar():
     if mode == "Upload CSV":
         st.sidebar.markdown("---")
         uploaded_file = st.sidebar.file_uploader(
-            "Upload CSV file",
-            type=["csv"],
-            help="Upload a CSV file to analyze"
+            "Upload dataset",
+            type=["csv", "gz", "zst", "parquet", "pq", "feather", "arrow", "jsonl", "ndjson"],
+            help="Upload a CSV (optionally .csv.gz / .csv.zst), Parquet, Feather or JSON-lines file to analyze"
         )
         
         if uploaded_file is not None:
@@ -182,6 +189,7 @@ def render_sidebar():
     # Clear chat button
     if st.sidebar.button("🗑️ Clear Chat History", use_container_width=True):
         st.session_state.messages = []
+        st.session_state.conversation_id = str(uuid.uuid4())
         st.rerun()
 
 
@@ -210,7 +218,8 @@ def handle_user_input():
         with st.spinner("🤔 Analyzing dataset..."):
             success, data, error = send_chat_query(
                 user_input, 
-                st.session_state.session_id
+                st.session_state.session_id,
+                st.session_state.conversation_id
             )
         
         if success: